@@ -0,0 +1,170 @@
+/*
+Benchmark: per-row check_note_access() vs set-based notes_select policy.
+
+Seeds 1M notes, then EXPLAIN ANALYZEs the two hot list queries
+(GET /notes and GET /tenants/{tenant_id}/notes) as an `authenticated`
+member under both policies. Everything runs in one transaction and is
+rolled back; nothing is left behind.
+
+Usage (local stack, after `supabase start` and `supabase db reset`):
+
+    psql "$(supabase status -o env | grep DB_URL | cut -d= -f2- | tr -d '"')" \
+        -f infra/supabase/benchmarks/notes_select_rls.sql
+
+Dataset:
+- 1,000 users, 200 tenants, every user a member of 5 tenants
+  (admin of 1 tenant, plain member of 4)
+- 1,000,000 notes spread evenly over tenants and owners
+- 50,000 read shares
+
+Expected shape:
+- per-row policy: Seq Scan / Index Scan on notes with
+  "Filter: check_note_access(...)" evaluated for every visited row
+- set-based policy: hashed SubPlans evaluated once, Index Scan on
+  idx_notes_*_keyset stopping after LIMIT rows
+*/
+
+\timing on
+
+begin;
+
+set local statement_timeout = 0;
+
+/*
+Seed
+*/
+insert into public.users (id, email)
+select
+    ('00000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid,
+    'bench' || g || '@example.com'
+from generate_series(1, 1000) g;
+
+insert into public.tenants (id, name)
+select
+    ('10000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid,
+    'bench tenant ' || g
+from generate_series(1, 200) g;
+
+create temporary table bench_members on commit drop as
+select
+    ('10000000-0000-0000-0000-' || lpad((((u + k * 40) % 200) + 1)::text, 12, '0'))::uuid as tenant_id,
+    ('00000000-0000-0000-0000-' || lpad(u::text, 12, '0'))::uuid as user_id,
+    case when k = 0 then 'admin' else 'member' end as role
+from generate_series(1, 1000) u
+cross join generate_series(0, 4) k;
+
+insert into public.tenant_members (tenant_id, user_id, role)
+select tenant_id, user_id, role from bench_members;
+
+/*
+Number memberships globally (note owners) and per tenant (sharees) so
+both can be picked with a hash join instead of a per-row lookup.
+*/
+create temporary table bench_slots on commit drop as
+select
+    tenant_id,
+    user_id,
+    (row_number() over (order by tenant_id, user_id) - 1)::int as slot,
+    (row_number() over (partition by tenant_id order by user_id) - 1)::int as tenant_slot
+from bench_members;
+
+insert into public.notes (tenant_id, owner_id, content, created_at)
+select
+    s.tenant_id,
+    s.user_id,
+    'bench note ' || g,
+    now() - (g || ' seconds')::interval
+from generate_series(1, 1000000) g
+join bench_slots s on s.slot = g % 5000;
+
+insert into public.note_shares (note_id, user_id, permission)
+select n.id, s.user_id, 'read'
+from (
+    select id, tenant_id, owner_id, (row_number() over (order by id))::int as rn
+    from public.notes
+    where content like 'bench note %'
+    limit 50000
+) n
+join bench_slots s
+  on s.tenant_id = n.tenant_id
+ and s.tenant_slot = n.rn % 25
+where s.user_id <> n.owner_id
+on conflict do nothing;
+
+analyze public.users;
+analyze public.tenants;
+analyze public.tenant_members;
+analyze public.notes;
+analyze public.note_shares;
+
+/*
+Impersonate a plain member (user 1) through PostgREST-style JWT claims.
+*/
+select set_config(
+    'request.jwt.claims',
+    '{"sub":"00000000-0000-0000-0000-000000000001","role":"authenticated"}',
+    true
+);
+
+/*
+1. Set-based policy (migration 023)
+*/
+set local role authenticated;
+
+\echo '=== set-based policy: GET /notes ==='
+explain (analyze, buffers, costs off)
+select * from public.notes
+where deleted_at is null
+order by created_at desc, id desc
+limit 21;
+
+\echo '=== set-based policy: GET /tenants/{tenant_id}/notes ==='
+explain (analyze, buffers, costs off)
+select * from public.notes
+where tenant_id = '10000000-0000-0000-0000-000000000042'
+  and deleted_at is null
+order by created_at desc, id desc
+limit 21;
+
+\echo '=== set-based policy: count=exact ==='
+explain (analyze, buffers, costs off)
+select count(*) from public.notes
+where deleted_at is null;
+
+/*
+2. Previous per-row policy (migration 003), swapped in for comparison
+*/
+reset role;
+
+drop policy "notes_select" on public.notes;
+create policy "notes_select"
+on public.notes
+for select
+using (
+    deleted_at is null
+    and check_note_access(tenant_id, owner_id, id)
+);
+
+set local role authenticated;
+
+\echo '=== per-row policy: GET /notes ==='
+explain (analyze, buffers, costs off)
+select * from public.notes
+where deleted_at is null
+order by created_at desc, id desc
+limit 21;
+
+\echo '=== per-row policy: GET /tenants/{tenant_id}/notes ==='
+explain (analyze, buffers, costs off)
+select * from public.notes
+where tenant_id = '10000000-0000-0000-0000-000000000042'
+  and deleted_at is null
+order by created_at desc, id desc
+limit 21;
+
+\echo '=== per-row policy: count=exact ==='
+explain (analyze, buffers, costs off)
+select count(*) from public.notes
+where deleted_at is null;
+
+rollback;
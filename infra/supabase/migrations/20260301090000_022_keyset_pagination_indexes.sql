@@ -0,0 +1,51 @@
+/*
+Composite indexes for keyset (cursor) pagination.
+
+List endpoints order by (created_at desc, <tiebreaker> desc) and page with
+    created_at < :ts or (created_at = :ts and <tiebreaker> < :key)
+Each index below matches one list query's equality filters followed by the
+sort key, so every page is an index range scan of `limit` rows regardless
+of how deep the page is.
+*/
+
+-- GET /tenants/{tenant_id}/notes
+create index if not exists idx_notes_tenant_keyset
+on public.notes (tenant_id, created_at desc, id desc)
+where deleted_at is null;
+
+-- Superseded by idx_notes_tenant_keyset (same leading column, same predicate)
+drop index if exists public.idx_notes_tenant_active;
+
+-- GET /notes
+create index if not exists idx_notes_active_keyset
+on public.notes (created_at desc, id desc)
+where deleted_at is null;
+
+-- GET /notes/{note_id}/shares
+create index if not exists idx_note_shares_note_keyset
+on public.note_shares (note_id, created_at desc, user_id desc);
+
+-- GET /me/notes/shared
+create index if not exists idx_note_shares_user_keyset
+on public.note_shares (user_id, created_at desc, note_id desc);
+
+-- GET /tenants/{tenant_id}/requests/join, GET /tenants/{tenant_id}/invites
+create index if not exists idx_tenant_join_requests_tenant_keyset
+on public.tenant_join_requests (tenant_id, direction, created_at desc, id desc);
+
+-- GET /me/requests, GET /me/invites/pending
+create index if not exists idx_tenant_join_requests_user_keyset
+on public.tenant_join_requests (user_id, direction, created_at desc, id desc);
+
+-- GET /tenants/{tenant_id}/members
+create index if not exists idx_tenant_members_tenant_keyset
+on public.tenant_members (tenant_id, created_at desc, user_id desc);
+
+-- GET /me/tenants
+create index if not exists idx_tenant_members_user_keyset
+on public.tenant_members (user_id, created_at desc, tenant_id desc);
+
+-- GET /tenants
+create index if not exists idx_tenants_active_keyset
+on public.tenants (created_at desc, id desc)
+where deleted_at is null;
@@ -0,0 +1,92 @@
+/*
+Set-based read policy for notes.
+
+The previous notes_select policy called check_note_access(tenant_id,
+owner_id, id) for every candidate row. Being SECURITY DEFINER and
+parameterised by the row, the function is opaque to the planner and runs up
+to three correlated EXISTS probes per note, so list queries degrade to
+"scan everything, call a function per row".
+
+The caller's memberships and shares do not depend on the row. They are now
+exposed as uncorrelated set-returning functions, evaluated once per query
+(hashed SubPlan / InitPlan), and the policy becomes plain set membership:
+
+    tenant_id in <my tenants>
+    and (owner_id = me or tenant_id in <my admin tenants> or id in <my shares>)
+
+which the planner can combine with idx_notes_tenant_keyset /
+idx_notes_active_keyset.
+
+Access rules are unchanged (see check_note_access). check_note_access is
+kept for callers outside RLS but no longer used by the policy.
+
+Benchmark: infra/supabase/benchmarks/notes_select_rls.sql
+*/
+
+/*
+Tenants the current user belongs to, with their role.
+Unlike auth_user_tenant_ids() this does NOT filter deleted tenants:
+notes visibility has never depended on tenant deletion state.
+*/
+create or replace function public.auth_user_tenant_roles()
+returns table (ret_tenant_id uuid, ret_role text)
+language sql
+security definer
+set search_path = public
+stable
+as $$
+    select tm.tenant_id, tm.role
+    from public.tenant_members tm
+    where tm.user_id = (select auth.uid());
+$$;
+
+/*
+Notes explicitly shared with the current user (any permission).
+*/
+create or replace function public.auth_user_shared_note_ids()
+returns table (ret_note_id uuid)
+language sql
+security definer
+set search_path = public
+stable
+as $$
+    select ns.note_id
+    from public.note_shares ns
+    where ns.user_id = (select auth.uid());
+$$;
+
+drop policy if exists "notes_select" on public.notes;
+
+create policy "notes_select"
+on public.notes
+for select
+using (
+    deleted_at is null
+    /*
+        Precondition: must be tenant member
+    */
+    and tenant_id in (
+        select ret_tenant_id from public.auth_user_tenant_roles()
+    )
+    and (
+        /*
+            Note owner
+        */
+        owner_id = (select auth.uid())
+        or
+        /*
+            Tenant owner/admin
+        */
+        tenant_id in (
+            select ret_tenant_id from public.auth_user_tenant_roles()
+            where ret_role in ('owner', 'admin')
+        )
+        or
+        /*
+            Explicitly shared user
+        */
+        id in (
+            select ret_note_id from public.auth_user_shared_note_ids()
+        )
+    )
+);
@@ -0,0 +1,104 @@
+/*
+Full-text search over notes (FR-004).
+
+- notes.search_vector: generated tsvector over the first 100,000
+  characters of content, kept in sync by Postgres on every insert/update
+  (no trigger, no backfill job)
+- GIN index on active notes only
+- search_notes(): ranked search with highlighted snippets
+
+The 'simple' configuration is used on purpose: notes are multilingual,
+and a language-specific stemmer would mangle non-English words. Matching
+is case-insensitive and whole-word only: websearch_to_tsquery() has no
+prefix syntax ("word:*" is searched as the plain word).
+
+Why only a prefix of content is indexed: a tsvector cannot exceed 1 MB,
+and notes can be up to 1 MB of text, whose tsvector (lexemes plus
+positions and per-lexeme headers) can be several times larger. Over the
+cap, the insert or update itself fails. 100,000 characters keep the
+worst case well below it; text beyond that is not searchable.
+*/
+
+alter table public.notes
+add column if not exists search_vector tsvector
+generated always as (to_tsvector('simple', left(coalesce(content, ''), 100000))) stored;
+
+create index if not exists idx_notes_search_vector
+on public.notes using gin (search_vector)
+where deleted_at is null;
+
+/*
+Ranked full-text search.
+
+Rules:
+1. SECURITY INVOKER: runs under the caller's RLS (notes_select), so only
+   readable notes are ever matched.
+2. p_query uses websearch syntax: words, "quoted phrases", OR, -exclude.
+   It never raises on malformed input.
+3. p_tenant_id narrows the search to one tenant; null searches every
+   readable note.
+4. Ordered by ts_rank_cd (cover density), newest first on ties.
+5. Snippets are computed only for the returned page: ts_headline re-parses
+   the document and is the most expensive step.
+6. Matches in snippets are delimited by chr(2) / chr(3), not HTML: content
+   is raw user text, so the API escapes it before adding <mark> tags.
+*/
+create or replace function public.search_notes(
+    p_query text,
+    p_tenant_id uuid default null,
+    p_limit integer default 20,
+    p_offset integer default 0
+)
+returns table (
+    id uuid,
+    tenant_id uuid,
+    owner_id uuid,
+    created_at timestamptz,
+    updated_at timestamptz,
+    rank real,
+    snippet text
+)
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+    with q as (
+        select websearch_to_tsquery('simple', coalesce(p_query, '')) as tsq
+    ),
+    hits as (
+        select
+            n.id,
+            n.tenant_id,
+            n.owner_id,
+            n.content,
+            n.created_at,
+            n.updated_at,
+            ts_rank_cd(n.search_vector, q.tsq) as rank,
+            q.tsq
+        from notes n
+        cross join q
+        where n.search_vector @@ q.tsq
+          and n.deleted_at is null
+          and (p_tenant_id is null or n.tenant_id = p_tenant_id)
+        order by rank desc, n.created_at desc, n.id desc
+        limit greatest(p_limit, 0)
+        offset greatest(p_offset, 0)
+    )
+    select
+        h.id,
+        h.tenant_id,
+        h.owner_id,
+        h.created_at,
+        h.updated_at,
+        h.rank,
+        ts_headline(
+            'simple',
+            h.content,
+            h.tsq,
+            'StartSel=' || chr(2) || ', StopSel=' || chr(3)
+                || ', MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+        ) as snippet
+    from hits h
+    order by h.rank desc, h.created_at desc, h.id desc;
+$$;
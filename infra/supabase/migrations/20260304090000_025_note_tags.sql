@@ -0,0 +1,359 @@
+/*
+Note tags (FR-004).
+
+- notes.tags: normalized text[] (lower-case, trimmed, distinct, sorted)
+- GIN (tenant_id, tags) on active notes: tag filters inside a tenant are
+  answered from the index ("tags @> ..." for AND, "tags && ..." for OR)
+- tenant_tag_counts: per-tenant tag facet, maintained incrementally by a
+  trigger on notes (never recomputed by scanning)
+- add_note_tags() / remove_note_tag() RPCs
+- tenant_tag_facets() RPC for GET /tenants/{tenant_id}/tags
+*/
+
+create extension if not exists btree_gin with schema extensions;
+
+alter table public.notes
+add column if not exists tags text[] not null default '{}';
+
+alter table public.notes
+add constraint notes_tags_limit_check check (cardinality(tags) <= 32);
+
+create index if not exists idx_notes_tenant_tags
+on public.notes using gin (tenant_id, tags)
+where deleted_at is null;
+
+/*
+Normalize a tag list.
+
+Rules:
+- trim + lower-case, drop empty entries, de-duplicate, sort
+- each tag: 1..64 chars, no commas, braces, quotes, backslashes or
+  control characters (keeps PostgREST array filters unambiguous)
+*/
+create or replace function public.normalize_tags(p_tags text[])
+returns text[]
+language plpgsql
+immutable
+set search_path = public
+as $$
+declare
+    v_tags text[];
+begin
+    select coalesce(array_agg(distinct t order by t), '{}')
+    into v_tags
+    from (
+        select lower(btrim(raw)) as t
+        from unnest(coalesce(p_tags, '{}')) as raw
+    ) s
+    where t <> '';
+
+    if exists (
+        select 1
+        from unnest(v_tags) t
+        where char_length(t) > 64
+           or t ~ '[,{}"\\[:cntrl:]]'
+    ) then
+        raise exception using
+            message = 'Tag is too long or contains invalid characters',
+            detail = 'DB0601';
+    end if;
+
+    return v_tags;
+end;
+$$;
+
+/*
+Per-tenant tag facet.
+Counts active notes per tag. Rows reaching zero are removed.
+*/
+create table if not exists public.tenant_tag_counts (
+    tenant_id uuid not null references public.tenants(id) on delete cascade,
+    tag text not null,
+    note_count integer not null default 0 check (note_count >= 0),
+    primary key (tenant_id, tag)
+);
+
+create index if not exists idx_tenant_tag_counts_top
+on public.tenant_tag_counts (tenant_id, note_count desc, tag);
+
+alter table public.tenant_tag_counts enable row level security;
+
+/*
+Facet totals cover every note in the tenant, including notes the caller
+cannot read, so only owners/admins (who can read them all) see the table.
+*/
+create policy "tenant_tag_counts_select_owner_admin"
+on public.tenant_tag_counts
+for select
+using (
+    tenant_id in (
+        select ret_tenant_id from public.auth_user_tenant_roles()
+        where ret_role in ('owner', 'admin')
+    )
+);
+
+/*
+Keep tenant_tag_counts in sync with active notes.
+
+Only the tags that actually changed are touched, so a content edit
+(tags unchanged) costs nothing and a retag costs one row per changed tag.
+*/
+create or replace function public.sync_tenant_tag_counts()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_old_tenant uuid;
+    v_new_tenant uuid;
+    v_old_tags text[] := '{}';
+    v_new_tags text[] := '{}';
+    v_removed text[];
+    v_added text[];
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        v_old_tenant := old.tenant_id;
+        if old.deleted_at is null then
+            v_old_tags := old.tags;
+        end if;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        v_new_tenant := new.tenant_id;
+        if new.deleted_at is null then
+            v_new_tags := new.tags;
+        end if;
+    end if;
+
+    if v_old_tenant is not distinct from v_new_tenant then
+        v_removed := array(select unnest(v_old_tags) except select unnest(v_new_tags));
+        v_added := array(select unnest(v_new_tags) except select unnest(v_old_tags));
+    else
+        v_removed := v_old_tags;
+        v_added := v_new_tags;
+    end if;
+
+    if cardinality(v_removed) > 0 then
+        update tenant_tag_counts
+        set note_count = note_count - 1
+        where tenant_id = v_old_tenant
+          and tag = any(v_removed);
+
+        delete from tenant_tag_counts
+        where tenant_id = v_old_tenant
+          and tag = any(v_removed)
+          and note_count <= 0;
+    end if;
+
+    if cardinality(v_added) > 0 then
+        insert into tenant_tag_counts (tenant_id, tag, note_count)
+        select v_new_tenant, t, 1
+        from unnest(v_added) t
+        on conflict (tenant_id, tag)
+        do update set note_count = tenant_tag_counts.note_count + 1;
+    end if;
+
+    return null;
+end;
+$$;
+
+create trigger notes_sync_tenant_tag_counts
+after insert or delete or update of tags, deleted_at, tenant_id
+on public.notes
+for each row
+execute function public.sync_tenant_tag_counts();
+
+/*
+Add tags to a note.
+
+Rules:
+1. Caller must be authenticated.
+2. Note must exist, be active, and its tenant active.
+3. Caller must be a tenant member with write access
+   (note owner or 'write' share), same as notes_update_logic.
+4. Tags are normalized and merged with existing tags.
+5. A note holds at most 32 tags.
+6. Row-level lock to prevent lost updates.
+*/
+create or replace function public.add_note_tags(
+    p_note_id uuid,
+    p_tags text[]
+)
+returns table (
+    note_id uuid,
+    tags text[]
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_tenant_id uuid;
+    v_owner_id uuid;
+    v_current text[];
+    v_merged text[];
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    select n.tenant_id, n.owner_id, n.tags
+    into v_tenant_id, v_owner_id, v_current
+    from notes n
+    join tenants t
+      on t.id = n.tenant_id
+    where n.id = p_note_id
+      and n.deleted_at is null
+      and t.deleted_at is null
+    for update of n;
+
+    if not found then
+        raise exception using
+            message = 'Note not found, already deleted, or tenant inactive',
+            detail = 'DB0401';
+    end if;
+
+    if not check_note_write_access(p_note_id, v_tenant_id, v_owner_id) then
+        raise exception using
+            message = 'Write access to the note is required to change tags',
+            detail = 'DB0602';
+    end if;
+
+    v_merged := normalize_tags(v_current || p_tags);
+
+    if cardinality(v_merged) > 32 then
+        raise exception using
+            message = 'A note can have at most 32 tags',
+            detail = 'DB0603';
+    end if;
+
+    update notes n
+    set tags = v_merged
+    where n.id = p_note_id;
+
+    note_id := p_note_id;
+    tags := v_merged;
+    return next;
+    return;
+end;
+$$;
+
+/*
+Remove a single tag from a note.
+
+Rules: same access rules as add_note_tags().
+Removing a tag the note does not have is a no-op.
+*/
+create or replace function public.remove_note_tag(
+    p_note_id uuid,
+    p_tag text
+)
+returns table (
+    note_id uuid,
+    tags text[]
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_tenant_id uuid;
+    v_owner_id uuid;
+    v_current text[];
+    v_remaining text[];
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    select n.tenant_id, n.owner_id, n.tags
+    into v_tenant_id, v_owner_id, v_current
+    from notes n
+    join tenants t
+      on t.id = n.tenant_id
+    where n.id = p_note_id
+      and n.deleted_at is null
+      and t.deleted_at is null
+    for update of n;
+
+    if not found then
+        raise exception using
+            message = 'Note not found, already deleted, or tenant inactive',
+            detail = 'DB0401';
+    end if;
+
+    if not check_note_write_access(p_note_id, v_tenant_id, v_owner_id) then
+        raise exception using
+            message = 'Write access to the note is required to change tags',
+            detail = 'DB0602';
+    end if;
+
+    v_remaining := array_remove(v_current, lower(btrim(p_tag)));
+
+    if v_remaining is distinct from v_current then
+        update notes n
+        set tags = v_remaining
+        where n.id = p_note_id;
+    end if;
+
+    note_id := p_note_id;
+    tags := v_remaining;
+    return next;
+    return;
+end;
+$$;
+
+/*
+Tag facets for a tenant, most used first.
+
+Rules:
+1. SECURITY INVOKER: visibility follows RLS.
+2. Owners/admins read the incrementally maintained tenant_tag_counts.
+3. Plain members can only read their own and shared notes, so their
+   facet is aggregated from those notes (bounded by what they can see).
+4. Non-members get an empty result.
+*/
+create or replace function public.tenant_tag_facets(
+    p_tenant_id uuid,
+    p_limit integer default 100
+)
+returns table (
+    tag text,
+    note_count integer
+)
+language plpgsql
+stable
+security invoker
+set search_path = public
+as $$
+begin
+    if exists (
+        select 1
+        from auth_user_tenant_roles() r
+        where r.ret_tenant_id = p_tenant_id
+          and r.ret_role in ('owner', 'admin')
+    ) then
+        return query
+        select c.tag, c.note_count
+        from tenant_tag_counts c
+        where c.tenant_id = p_tenant_id
+        order by c.note_count desc, c.tag
+        limit greatest(p_limit, 0);
+    else
+        return query
+        select t.tag, count(*)::integer
+        from notes n
+        cross join lateral unnest(n.tags) as t(tag)
+        where n.tenant_id = p_tenant_id
+          and n.deleted_at is null
+        group by t.tag
+        order by 2 desc, 1
+        limit greatest(p_limit, 0);
+    end if;
+end;
+$$;
@@ -0,0 +1,81 @@
+/*
+Batch note writes.
+
+- POST /tenants/{tenant_id}/notes:batch is a single multi-row INSERT
+  through PostgREST (RLS insert policy applies to every row).
+- PATCH /notes:batch calls update_notes_batch(): one UPDATE ... FROM
+  jsonb_to_recordset, so N edits cost one statement instead of N round
+  trips.
+
+Tags written directly (multi-row insert) are normalized by a BEFORE
+trigger, so tenant_tag_counts never sees unnormalized tags.
+*/
+
+create or replace function public.normalize_note_tags()
+returns trigger
+language plpgsql
+set search_path = public
+as $$
+begin
+    new.tags := normalize_tags(new.tags);
+    return new;
+end;
+$$;
+
+create trigger notes_normalize_tags
+before insert or update of tags
+on public.notes
+for each row
+execute function public.normalize_note_tags();
+
+/*
+Update many notes in one statement.
+
+Rules:
+1. SECURITY INVOKER: notes_update_logic RLS decides, per row, whether the
+   caller may update (owner or write share, active note).
+2. p_items is a JSON array of {"id": uuid, "content": text}.
+3. Returns only the rows actually updated; callers report the missing
+   IDs as not found / access denied.
+4. Duplicate IDs: the last occurrence wins.
+*/
+create or replace function public.update_notes_batch(
+    p_items jsonb
+)
+returns table (
+    id uuid,
+    tenant_id uuid,
+    owner_id uuid,
+    content text,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    return query
+    with items as (
+        select distinct on (i.id) i.id, i.content
+        from rows from (
+            jsonb_to_recordset(p_items) as (id uuid, content text)
+        ) with ordinality as i(id, content, ord)
+        where i.id is not null
+          and i.content is not null
+        order by i.id, i.ord desc
+    )
+    update notes n
+    set content = items.content
+    from items
+    where n.id = items.id
+      and n.deleted_at is null
+    returning n.id, n.tenant_id, n.owner_id, n.content, n.created_at, n.updated_at;
+end;
+$$;
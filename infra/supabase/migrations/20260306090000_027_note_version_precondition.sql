@@ -0,0 +1,155 @@
+/*
+Optimistic concurrency for note updates.
+
+- notes.version starts at 1 and is incremented by a BEFORE UPDATE trigger
+  on every row change (content, tags, soft delete), so it identifies one
+  exact state of a note. The API exposes it as the note's ETag.
+- update_note_if_match() compares and updates in a single statement:
+  a stale client gets DB0404 (HTTP 412) without a separate read.
+*/
+
+alter table public.notes
+    add column version bigint not null default 1;
+
+create or replace function public.bump_note_version()
+returns trigger
+language plpgsql
+set search_path = public
+as $$
+begin
+    new.version := old.version + 1;
+    return new;
+end;
+$$;
+
+create trigger trg_notes_bump_version
+before update on public.notes
+for each row
+execute function public.bump_note_version();
+
+/*
+Update note content only if it is still at p_expected_version.
+
+Rules:
+1. SECURITY INVOKER: notes_update_logic RLS decides whether the caller
+   may write (owner or write share, active note, active tenant).
+2. The version check and the write are one UPDATE, so two concurrent
+   writers with the same base version cannot both succeed.
+3. When nothing was updated, the reason is resolved in the same call:
+   - note not visible / deleted      -> DB0401
+   - version moved on                -> DB0404
+   - visible at that version, but no write access -> DB0405
+*/
+create or replace function public.update_note_if_match(
+    p_note_id uuid,
+    p_content text,
+    p_expected_version bigint
+)
+returns table (
+    id uuid,
+    tenant_id uuid,
+    owner_id uuid,
+    content text,
+    tags text[],
+    version bigint,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_current_version bigint;
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    return query
+    update notes n
+    set content = p_content
+    where n.id = p_note_id
+      and n.version = p_expected_version
+      and n.deleted_at is null
+    returning n.id, n.tenant_id, n.owner_id, n.content, n.tags, n.version, n.created_at, n.updated_at;
+
+    if found then
+        return;
+    end if;
+
+    select n.version
+    into v_current_version
+    from notes n
+    where n.id = p_note_id
+      and n.deleted_at is null;
+
+    if v_current_version is null then
+        raise exception using
+            message = 'Note not found or access denied',
+            detail = 'DB0401';
+    end if;
+
+    if v_current_version <> p_expected_version then
+        raise exception using
+            message = 'Note was modified since the given version',
+            detail = 'DB0404',
+            hint = v_current_version::text;
+    end if;
+
+    raise exception using
+        message = 'Write access to the note is required',
+        detail = 'DB0405';
+end;
+$$;
+
+/*
+update_notes_batch() (migration 026) also returns the new version, so
+batch callers can chain conditional updates. The return type changes,
+hence drop + create.
+*/
+drop function if exists public.update_notes_batch(jsonb);
+
+create or replace function public.update_notes_batch(
+    p_items jsonb
+)
+returns table (
+    id uuid,
+    tenant_id uuid,
+    owner_id uuid,
+    content text,
+    version bigint,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    return query
+    with items as (
+        select distinct on (i.id) i.id, i.content
+        from rows from (
+            jsonb_to_recordset(p_items) as (id uuid, content text)
+        ) with ordinality as i(id, content, ord)
+        where i.id is not null
+          and i.content is not null
+        order by i.id, i.ord desc
+    )
+    update notes n
+    set content = items.content
+    from items
+    where n.id = items.id
+      and n.deleted_at is null
+    returning n.id, n.tenant_id, n.owner_id, n.content, n.version, n.created_at, n.updated_at;
+end;
+$$;
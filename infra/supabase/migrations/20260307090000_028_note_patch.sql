@@ -0,0 +1,156 @@
+/*
+Patch-based note updates.
+
+Clients send splice operations against the version they edited instead of
+the whole content, so a small edit on a large note uploads a few bytes.
+apply_note_patch() rebuilds the new content inside the database and
+writes it with the same version check as update_note_if_match().
+
+Operation format (p_ops, JSON array):
+    {"start": int, "delete": int, "insert": text}
+- offsets are Unicode code points in the BASE content (0-based)
+- operations are sorted by start and do not overlap
+- "delete" defaults to 0, "insert" to ''
+*/
+
+/*
+Apply splice operations to a note at p_base_version.
+
+Rules:
+1. SECURITY INVOKER: RLS decides visibility (select) and write access (update).
+2. Base mismatch -> DB0404 (the client must rebase on the current version).
+3. Malformed, unsorted, overlapping or out-of-range operations -> DB0406.
+4. The write is conditional on the version, so a concurrent writer between
+   the read and the update also yields DB0404; nothing is locked.
+5. Errors otherwise follow update_note_if_match(): DB0401 / DB0405.
+*/
+create or replace function public.apply_note_patch(
+    p_note_id uuid,
+    p_base_version bigint,
+    p_ops jsonb
+)
+returns table (
+    id uuid,
+    tenant_id uuid,
+    owner_id uuid,
+    content text,
+    tags text[],
+    version bigint,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_base text;
+    v_current_version bigint;
+    v_length integer;
+    v_op jsonb;
+    v_start integer;
+    v_delete integer;
+    v_pos integer := 0;
+    v_parts text[] := '{}';
+begin
+    if (select auth.uid()) is null then
+        raise exception using
+            message = 'Unauthenticated',
+            detail = 'DB0001';
+    end if;
+
+    select n.content, n.version
+    into v_base, v_current_version
+    from notes n
+    where n.id = p_note_id
+      and n.deleted_at is null;
+
+    if not found then
+        raise exception using
+            message = 'Note not found or access denied',
+            detail = 'DB0401';
+    end if;
+
+    if v_current_version <> p_base_version then
+        raise exception using
+            message = 'Note was modified since the given version',
+            detail = 'DB0404',
+            hint = v_current_version::text;
+    end if;
+
+    if jsonb_typeof(p_ops) is distinct from 'array' or jsonb_array_length(p_ops) = 0 then
+        raise exception using
+            message = 'Patch must be a non-empty array of operations',
+            detail = 'DB0406';
+    end if;
+
+    v_length := char_length(v_base);
+
+    /*
+    Single forward pass: copy the untouched base segment before each
+    operation, then its insert. Parts are joined once at the end.
+    */
+    for v_op in
+        select o.value
+        from jsonb_array_elements(p_ops) with ordinality as o(value, ord)
+        order by o.ord
+    loop
+        if jsonb_typeof(v_op->'start') is distinct from 'number'
+           or (v_op ? 'delete' and jsonb_typeof(v_op->'delete') <> 'number')
+           or (v_op ? 'insert' and jsonb_typeof(v_op->'insert') <> 'string') then
+            raise exception using
+                message = 'Invalid patch operation',
+                detail = 'DB0406';
+        end if;
+
+        v_start := (v_op->>'start')::integer;
+        v_delete := coalesce((v_op->>'delete')::integer, 0);
+
+        if v_start < v_pos or v_delete < 0 or v_start + v_delete > v_length then
+            raise exception using
+                message = 'Patch operations are out of range, unsorted or overlapping',
+                detail = 'DB0406';
+        end if;
+
+        v_parts := v_parts || substr(v_base, v_pos + 1, v_start - v_pos) || coalesce(v_op->>'insert', '');
+        v_pos := v_start + v_delete;
+    end loop;
+
+    v_parts := v_parts || substr(v_base, v_pos + 1);
+
+    return query
+    update notes n
+    set content = array_to_string(v_parts, '')
+    where n.id = p_note_id
+      and n.version = p_base_version
+      and n.deleted_at is null
+    returning n.id, n.tenant_id, n.owner_id, n.content, n.tags, n.version, n.created_at, n.updated_at;
+
+    if found then
+        return;
+    end if;
+
+    select n.version
+    into v_current_version
+    from notes n
+    where n.id = p_note_id
+      and n.deleted_at is null;
+
+    if v_current_version is null then
+        raise exception using
+            message = 'Note not found or access denied',
+            detail = 'DB0401';
+    end if;
+
+    if v_current_version <> p_base_version then
+        raise exception using
+            message = 'Note was modified since the given version',
+            detail = 'DB0404',
+            hint = v_current_version::text;
+    end if;
+
+    raise exception using
+        message = 'Write access to the note is required',
+        detail = 'DB0405';
+end;
+$$;
@@ -0,0 +1,160 @@
+/*
+Note revision history.
+
+Every content change of a note is recorded in note_revisions by a trigger.
+Rows are keyed by (note_id, revision) where revision is notes.version
+right after the change (migration 027), so version N of a note is the
+latest revision <= N.
+
+Storage layout (delta chains):
+- snapshot: full content
+- delta: one splice against the previous revision's content
+    delta_start / delta_delete (code points) + delta_insert
+  computed from OLD/NEW as common prefix + common suffix, so an edit in
+  the middle of a 200 KB note stores only the changed span.
+- A snapshot is written for the first recorded change of a note, after
+  31 consecutive deltas, and whenever a delta would be more than half the
+  size of the new content. Rebuilding any revision therefore reads one
+  snapshot plus at most 31 deltas.
+
+Large snapshots are compressed by TOAST. Revisions start when this
+migration runs: earlier history does not exist.
+*/
+
+create table public.note_revisions (
+    note_id uuid not null references public.notes(id) on delete cascade,
+    revision bigint not null,
+    kind text not null check (kind in ('snapshot', 'delta')),
+    chain_length integer not null,
+    content text,
+    delta_start integer,
+    delta_delete integer,
+    delta_insert text,
+    content_length integer not null,
+    changed_by uuid references public.users(id) on delete set null,
+    created_at timestamptz not null default now(),
+    primary key (note_id, revision),
+    check (
+        (kind = 'snapshot' and content is not null and chain_length = 0)
+        or (kind = 'delta' and delta_start is not null and delta_delete is not null and delta_insert is not null)
+    )
+);
+
+/* Keyset pagination of a note's history (created_at desc, revision desc) */
+create index idx_note_revisions_note_time
+on public.note_revisions (note_id, created_at desc, revision desc);
+
+alter table public.note_revisions enable row level security;
+
+/*
+Revisions are visible to whoever can read the note (notes_select RLS
+applies inside the subquery). Rows are written only by the trigger.
+*/
+create policy "note_revisions_select"
+on public.note_revisions
+for select
+using (
+    note_id in (select n.id from public.notes n)
+);
+
+/*
+Record a revision after a note is created or its content changes.
+
+SECURITY DEFINER: inserts bypass RLS (no insert policy exists for users).
+*/
+create or replace function public.record_note_revision()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_prev_chain integer;
+    v_old_length integer;
+    v_new_length integer;
+    v_prefix integer;
+    v_suffix integer;
+    v_low integer;
+    v_high integer;
+    v_mid integer;
+    v_insert text;
+begin
+    v_new_length := char_length(new.content);
+
+    if tg_op = 'UPDATE' then
+        if new.content is not distinct from old.content then
+            return null;
+        end if;
+
+        select r.chain_length
+        into v_prev_chain
+        from note_revisions r
+        where r.note_id = new.id
+        order by r.revision desc
+        limit 1;
+    end if;
+
+    if tg_op = 'INSERT' or v_prev_chain is null or v_prev_chain >= 31 then
+        insert into note_revisions (note_id, revision, kind, chain_length, content, content_length, changed_by)
+        values (new.id, new.version, 'snapshot', 0, new.content, v_new_length, auth.uid());
+        return null;
+    end if;
+
+    v_old_length := char_length(old.content);
+
+    /*
+    Longest common prefix, then longest common suffix of the remainder.
+    Binary search over left()/right() equality: O(log n) comparisons
+    done in C instead of a per-character PL/pgSQL loop.
+    */
+    v_low := 0;
+    v_high := least(v_old_length, v_new_length);
+    while v_low < v_high loop
+        v_mid := (v_low + v_high + 1) / 2;
+        if left(old.content, v_mid) = left(new.content, v_mid) then
+            v_low := v_mid;
+        else
+            v_high := v_mid - 1;
+        end if;
+    end loop;
+    v_prefix := v_low;
+
+    v_low := 0;
+    v_high := least(v_old_length, v_new_length) - v_prefix;
+    while v_low < v_high loop
+        v_mid := (v_low + v_high + 1) / 2;
+        if right(old.content, v_mid) = right(new.content, v_mid) then
+            v_low := v_mid;
+        else
+            v_high := v_mid - 1;
+        end if;
+    end loop;
+    v_suffix := v_low;
+
+    v_insert := substr(new.content, v_prefix + 1, v_new_length - v_prefix - v_suffix);
+
+    if char_length(v_insert) * 2 > v_new_length then
+        insert into note_revisions (note_id, revision, kind, chain_length, content, content_length, changed_by)
+        values (new.id, new.version, 'snapshot', 0, new.content, v_new_length, auth.uid());
+        return null;
+    end if;
+
+    insert into note_revisions (
+        note_id, revision, kind, chain_length,
+        delta_start, delta_delete, delta_insert,
+        content_length, changed_by
+    )
+    values (
+        new.id, new.version, 'delta', v_prev_chain + 1,
+        v_prefix, v_old_length - v_prefix - v_suffix, v_insert,
+        v_new_length, auth.uid()
+    );
+    return null;
+end;
+$$;
+
+create trigger trg_notes_record_revision
+after insert or update of content
+on public.notes
+for each row
+execute function public.record_note_revision();
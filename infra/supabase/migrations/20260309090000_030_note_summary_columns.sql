@@ -0,0 +1,29 @@
+/*
+Note summaries for lightweight list views (?view=summary).
+
+title and preview are STORED generated columns: computed once per write,
+so a summary list page reads a few hundred bytes per note and never
+detoasts content, however long the notes are.
+
+- title: text of the first Markdown ATX heading (# ... ######), falling
+  back to the first non-blank line; at most 200 characters
+- preview: start of the content with whitespace collapsed; at most 280
+  characters (only the first 2000 characters are looked at)
+
+Adding stored columns rewrites the notes table once.
+*/
+
+alter table public.notes
+    add column title text generated always as (
+        left(
+            coalesce(
+                (regexp_match(content, '^[ ]{0,3}#{1,6}[ \t]+(.*?)[ \t#]*$', 'n'))[1],
+                (regexp_match(content, '^\s*(\S[^\n]*)'))[1],
+                ''
+            ),
+            200
+        )
+    ) stored,
+    add column preview text generated always as (
+        left(btrim(regexp_replace(left(content, 2000), '\s+', ' ', 'g')), 280)
+    ) stored;
@@ -0,0 +1,19 @@
+/*
+Shares granted to the current user, for GET /me/notes/shared.
+
+note_shares_select lets note owners and tenant admins see every share of
+their notes, so selecting note_shares directly also returned shares the
+caller granted to others. The view pins user_id = auth.uid().
+
+security_invoker: note_shares / notes RLS still apply to the caller.
+PostgREST infers the view's relationships from note_shares' foreign keys,
+so notes (and through them tenants / users) can be embedded in one request.
+Served by idx_note_shares_user_keyset (user_id, created_at desc, note_id desc).
+*/
+
+create or replace view public.my_note_shares
+with (security_invoker = true)
+as
+select ns.note_id, ns.user_id, ns.permission, ns.created_at
+from public.note_shares ns
+where ns.user_id = (select auth.uid());
@@ -0,0 +1,153 @@
+/*
+Per-tenant counters for GET /tenants/{tenant_id}.
+
+tenant_stats holds one row per tenant, maintained incrementally by
+triggers (never recomputed by scanning), so tenant details read member and
+note counts with a primary-key lookup instead of COUNT(*) under RLS:
+
+- member_count: rows in tenant_members
+- active_note_count: notes with deleted_at is null
+- last_activity_at: last membership change, note creation, deletion or
+  content edit. Content edits refresh it at most once per minute, so
+  bursts of saves do not rewrite the row on every keystroke.
+
+Counts are tenant-wide totals (they include notes the caller cannot
+read); they reveal no note content, so every member may read them.
+*/
+
+create table if not exists public.tenant_stats (
+    tenant_id uuid primary key references public.tenants(id) on delete cascade,
+    member_count integer not null default 0 check (member_count >= 0),
+    active_note_count integer not null default 0 check (active_note_count >= 0),
+    last_activity_at timestamptz
+);
+
+alter table public.tenant_stats enable row level security;
+
+create policy "tenant_stats_select_member"
+on public.tenant_stats
+for select
+using (
+    tenant_id in (
+        select ret_tenant_id from public.auth_user_tenant_roles()
+    )
+);
+
+/*
+Keep member_count in sync with tenant_members.
+
+Deletes use a plain UPDATE: when a tenant is hard-deleted its stats row
+is already gone (cascade) and there is nothing to adjust.
+*/
+create or replace function public.sync_tenant_member_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into tenant_stats (tenant_id, member_count, last_activity_at)
+        values (new.tenant_id, 1, now())
+        on conflict (tenant_id)
+        do update set
+            member_count = tenant_stats.member_count + 1,
+            last_activity_at = excluded.last_activity_at;
+    else
+        update tenant_stats
+        set member_count = member_count - 1,
+            last_activity_at = now()
+        where tenant_id = old.tenant_id;
+    end if;
+
+    return null;
+end;
+$$;
+
+create trigger tenant_members_sync_tenant_stats
+after insert or delete
+on public.tenant_members
+for each row
+execute function public.sync_tenant_member_stats();
+
+/*
+Keep active_note_count / last_activity_at in sync with notes.
+
+- insert / delete / soft delete / restore adjust the count of the
+  affected tenant(s) by the change in "active" state
+- content-only edits touch last_activity_at, throttled to once a minute
+*/
+create or replace function public.sync_tenant_note_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_old_active integer := 0;
+    v_new_active integer := 0;
+begin
+    if tg_op in ('UPDATE', 'DELETE') and old.deleted_at is null then
+        v_old_active := 1;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') and new.deleted_at is null then
+        v_new_active := 1;
+    end if;
+
+    if tg_op = 'UPDATE' and old.tenant_id = new.tenant_id and v_old_active = v_new_active then
+        update tenant_stats
+        set last_activity_at = now()
+        where tenant_id = new.tenant_id
+          and (last_activity_at is null or last_activity_at < now() - interval '1 minute');
+        return null;
+    end if;
+
+    if tg_op in ('UPDATE', 'DELETE') then
+        update tenant_stats
+        set active_note_count = active_note_count - v_old_active,
+            last_activity_at = now()
+        where tenant_id = old.tenant_id;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        insert into tenant_stats (tenant_id, active_note_count, last_activity_at)
+        values (new.tenant_id, v_new_active, now())
+        on conflict (tenant_id)
+        do update set
+            active_note_count = tenant_stats.active_note_count + excluded.active_note_count,
+            last_activity_at = excluded.last_activity_at;
+    end if;
+
+    return null;
+end;
+$$;
+
+create trigger notes_sync_tenant_stats
+after insert or delete or update of content, deleted_at, tenant_id
+on public.notes
+for each row
+execute function public.sync_tenant_note_stats();
+
+/*
+Backfill existing tenants.
+
+Runs after the triggers are created: creating them locks tenant_members
+and notes against writes until this migration commits, so no change can
+fall between the backfill snapshot and the triggers.
+*/
+insert into public.tenant_stats (tenant_id, member_count, active_note_count, last_activity_at)
+select
+    t.id,
+    (select count(*) from public.tenant_members tm where tm.tenant_id = t.id),
+    (select count(*) from public.notes n where n.tenant_id = t.id and n.deleted_at is null),
+    greatest(
+        (select max(tm.created_at) from public.tenant_members tm where tm.tenant_id = t.id),
+        (select max(n.updated_at) from public.notes n where n.tenant_id = t.id)
+    )
+from public.tenants t
+on conflict (tenant_id)
+do update set
+    member_count = excluded.member_count,
+    active_note_count = excluded.active_note_count,
+    last_activity_at = excluded.last_activity_at;
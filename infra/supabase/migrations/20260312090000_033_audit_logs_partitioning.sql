@@ -0,0 +1,212 @@
+/*
+Monthly range partitioning of audit_logs, and a read path.
+
+- audit_logs becomes a table partitioned by range (created_at), one
+  partition per calendar month (UTC), named audit_logs_pYYYY_MM.
+  Inserts and scans touch only the current / requested months, and each
+  partition carries its own small (tenant_id, created_at desc, id desc)
+  index instead of one ever-growing B-tree.
+- ensure_audit_log_partitions() creates partitions ahead of time. It runs
+  here, daily through pg_cron when the extension is installed, and from
+  the backend at startup. audit_logs_default catches rows outside any
+  monthly partition, so an insert never fails for lack of one.
+- drop_audit_log_partitions() implements retention by detaching and
+  dropping whole months: no row deletes (still blocked by trigger), no
+  vacuum debt.
+- audit_logs_select_owner_admin: tenant owners / admins read their tenant's log
+  (GET /tenants/{tenant_id}/audit). Writes still come only from
+  SECURITY DEFINER RPCs.
+
+The primary key becomes (id, created_at): a partitioned table's unique
+constraints must include the partition key. Nothing references
+audit_logs.id.
+
+Existing rows are copied into the new table; the statement locks
+audit_logs until the migration commits.
+*/
+
+alter table public.audit_logs rename to audit_logs_legacy;
+
+create table public.audit_logs (
+    id uuid not null default gen_random_uuid(),
+    tenant_id uuid not null,
+    actor_id uuid references public.users(id) on delete set null,
+    action text not null,
+    target_type text not null,
+    target_id uuid,
+    metadata jsonb not null default '{}',
+    created_at timestamptz not null default now(),
+    primary key (id, created_at)
+) partition by range (created_at);
+
+create table public.audit_logs_default
+partition of public.audit_logs default;
+
+/*
+Partitions are tables of their own in the exposed schema and do not
+inherit the parent's RLS: enable it (without policies) on each of them so
+they can only be read through audit_logs.
+*/
+alter table public.audit_logs_default enable row level security;
+
+/*
+Create the monthly partitions covering [p_from, p_to] (UTC months).
+
+Rules:
+1. Existing partitions are left alone; returns the number created.
+2. A month whose rows already landed in audit_logs_default cannot get its
+   own partition (Postgres refuses overlapping bounds): it is skipped with
+   a warning and those rows stay in the default partition.
+3. New partitions get RLS enabled (see audit_logs_default).
+4. SECURITY DEFINER, executable by the service role only.
+*/
+create or replace function public.ensure_audit_log_partitions(
+    p_from timestamptz default now(),
+    p_to timestamptz default now() + interval '3 months'
+)
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_month timestamp := date_trunc('month', p_from at time zone 'UTC');
+    v_last timestamp := date_trunc('month', p_to at time zone 'UTC');
+    v_name text;
+    v_created integer := 0;
+begin
+    while v_month <= v_last loop
+        v_name := 'audit_logs_p' || to_char(v_month, 'YYYY_MM');
+
+        if to_regclass('public.' || v_name) is null then
+            begin
+                execute format(
+                    'create table public.%I partition of public.audit_logs for values from (%L) to (%L)',
+                    v_name,
+                    v_month at time zone 'UTC',
+                    (v_month + interval '1 month') at time zone 'UTC'
+                );
+                execute format('alter table public.%I enable row level security', v_name);
+                v_created := v_created + 1;
+            exception when check_violation then
+                raise warning 'audit_logs_default holds rows for %, partition % not created', to_char(v_month, 'YYYY-MM'), v_name;
+            end;
+        end if;
+
+        v_month := v_month + interval '1 month';
+    end loop;
+
+    return v_created;
+end;
+$$;
+
+/*
+Retention: drop every monthly partition that ends on or before p_before.
+
+Whole partitions only; returns the number dropped. Rows in
+audit_logs_default are never dropped here.
+*/
+create or replace function public.drop_audit_log_partitions(
+    p_before timestamptz
+)
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_partition record;
+    v_dropped integer := 0;
+begin
+    for v_partition in
+        select c.relname,
+               to_date(substr(c.relname, 13), 'YYYY_MM')::timestamp as month_start
+        from pg_inherits i
+        join pg_class c
+          on c.oid = i.inhrelid
+        where i.inhparent = 'public.audit_logs'::regclass
+          and c.relname ~ '^audit_logs_p[0-9]{4}_[0-9]{2}$'
+        order by c.relname
+    loop
+        if ((v_partition.month_start + interval '1 month') at time zone 'UTC') <= p_before then
+            execute format('alter table public.audit_logs detach partition public.%I', v_partition.relname);
+            execute format('drop table public.%I', v_partition.relname);
+            v_dropped := v_dropped + 1;
+        end if;
+    end loop;
+
+    return v_dropped;
+end;
+$$;
+
+revoke execute on function public.ensure_audit_log_partitions(timestamptz, timestamptz) from public, anon, authenticated;
+revoke execute on function public.drop_audit_log_partitions(timestamptz) from public, anon, authenticated;
+
+/*
+Partitions for existing rows and the next months, then copy.
+*/
+select public.ensure_audit_log_partitions(
+    coalesce((select min(created_at) from public.audit_logs_legacy), now()),
+    now() + interval '3 months'
+);
+
+insert into public.audit_logs (id, tenant_id, actor_id, action, target_type, target_id, metadata, created_at)
+select id, tenant_id, actor_id, action, target_type, target_id, metadata, created_at
+from public.audit_logs_legacy;
+
+drop table public.audit_logs_legacy;
+
+/*
+Indexes (created on every partition, present and future), built after
+the copy.
+- tenant_time: keyset pages of GET /tenants/{tenant_id}/audit
+- tenant_action: ?action= filter inside a tenant
+- actor_id: ?actor_id= filter, and users ON DELETE SET NULL
+*/
+create index idx_audit_logs_tenant_time
+on public.audit_logs (tenant_id, created_at desc, id desc);
+
+create index idx_audit_logs_tenant_action
+on public.audit_logs (tenant_id, action, created_at desc);
+
+create index idx_audit_logs_actor_id
+on public.audit_logs (actor_id);
+
+/* Append-only, as before (row triggers are cloned to every partition) */
+create trigger audit_logs_no_update
+before update on public.audit_logs
+for each row
+execute function prevent_audit_log_mutation();
+
+create trigger audit_logs_no_delete
+before delete on public.audit_logs
+for each row
+execute function prevent_audit_log_mutation();
+
+alter table public.audit_logs enable row level security;
+
+create policy "audit_logs_select_owner_admin"
+on public.audit_logs
+for select
+using (
+    tenant_id in (
+        select ret_tenant_id from public.auth_user_tenant_roles()
+        where ret_role in ('owner', 'admin')
+    )
+);
+
+/*
+Keep partitions three months ahead. pg_cron is optional: without it the
+backend creates them at startup (and the default partition covers gaps).
+*/
+do $$
+begin
+    if exists (select 1 from pg_extension where extname = 'pg_cron') then
+        perform cron.schedule(
+            'audit-log-partitions',
+            '17 3 * * *',
+            'select public.ensure_audit_log_partitions()'
+        );
+    end if;
+end;
+$$;
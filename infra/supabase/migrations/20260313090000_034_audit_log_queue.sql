@@ -0,0 +1,154 @@
+/*
+Asynchronous audit log writes.
+
+Every mutating RPC inserts into audit_logs inside its own transaction,
+paying WAL plus three index updates on the user-facing path. With async
+writes on, a BEFORE INSERT trigger on audit_logs diverts the row into
+audit_log_queue instead:
+- UNLOGGED (no WAL) and without indexes: an enqueue is one heap insert
+- the RPCs themselves are unchanged (they still "insert into audit_logs")
+- the backend worker (app/workers/audit_drain.py) moves queued rows into
+  audit_logs in batches with drain_audit_log_queue(): one set-based
+  INSERT ... SELECT per batch
+
+Durability trade-off: an unlogged table is emptied after a database
+crash, so events not drained yet are lost. Hence the switches:
+- audit_log_settings.async_writes: global mode, off by default (every
+  write stays synchronous until an operator turns it on)
+- tenant_audit_settings.durable: compliance tenants always write to
+  audit_logs synchronously, whatever the global mode
+
+Both settings tables and the queue are service-role only (RLS without
+policies). Queued events show up in GET /tenants/{tenant_id}/audit once
+drained. id and created_at are assigned at enqueue time, so ordering is
+unaffected by the drain delay.
+*/
+
+create table public.audit_log_settings (
+    id boolean primary key default true check (id),
+    async_writes boolean not null default false
+);
+
+insert into public.audit_log_settings (id, async_writes)
+values (true, false);
+
+alter table public.audit_log_settings enable row level security;
+
+create table public.tenant_audit_settings (
+    tenant_id uuid primary key references public.tenants(id) on delete cascade,
+    durable boolean not null default true
+);
+
+alter table public.tenant_audit_settings enable row level security;
+
+create unlogged table public.audit_log_queue (
+    id uuid not null,
+    tenant_id uuid not null,
+    actor_id uuid,
+    action text not null,
+    target_type text not null,
+    target_id uuid,
+    metadata jsonb not null,
+    created_at timestamptz not null
+);
+
+alter table public.audit_log_queue enable row level security;
+
+/*
+Route an audit row: keep it (synchronous) or enqueue it and skip the insert.
+
+Rules:
+1. Rows inserted by drain_audit_log_queue() always go through.
+2. Synchronous unless audit_log_settings.async_writes is on.
+3. Tenants marked durable in tenant_audit_settings stay synchronous.
+*/
+create or replace function public.route_audit_log()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if current_setting('app.audit_drain', true) = 'on' then
+        return new;
+    end if;
+
+    if not coalesce((select s.async_writes from audit_log_settings s where s.id), false) then
+        return new;
+    end if;
+
+    if exists (
+        select 1
+        from tenant_audit_settings t
+        where t.tenant_id = new.tenant_id
+          and t.durable
+    ) then
+        return new;
+    end if;
+
+    insert into audit_log_queue (id, tenant_id, actor_id, action, target_type, target_id, metadata, created_at)
+    values (new.id, new.tenant_id, new.actor_id, new.action, new.target_type, new.target_id, new.metadata, new.created_at);
+
+    return null;
+end;
+$$;
+
+create trigger audit_logs_route
+before insert on public.audit_logs
+for each row
+execute function public.route_audit_log();
+
+/*
+Move up to p_limit queued rows into audit_logs.
+
+Rules:
+1. One statement: the batch is deleted from the queue and inserted into
+   audit_logs atomically, so a row is never lost or written twice.
+2. FOR UPDATE SKIP LOCKED: several drain workers can run at once.
+3. The queue has no index; rows are picked by ctid (order does not
+   matter, created_at was fixed at enqueue time).
+4. Rows whose actor was deleted meanwhile get a null actor_id, as
+   ON DELETE SET NULL would have done.
+5. Returns the number of rows moved. Service role only.
+*/
+create or replace function public.drain_audit_log_queue(
+    p_limit integer default 1000
+)
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_moved integer;
+begin
+    perform set_config('app.audit_drain', 'on', true);
+
+    with batch as (
+        delete from audit_log_queue q
+        where q.ctid = any (array(
+            select c.ctid
+            from audit_log_queue c
+            limit greatest(p_limit, 0)
+            for update skip locked
+        ))
+        returning q.*
+    )
+    insert into audit_logs (id, tenant_id, actor_id, action, target_type, target_id, metadata, created_at)
+    select b.id, b.tenant_id, u.id, b.action, b.target_type, b.target_id, b.metadata, b.created_at
+    from batch b
+    left join users u
+      on u.id = b.actor_id;
+
+    get diagnostics v_moved = row_count;
+
+    perform set_config('app.audit_drain', 'off', true);
+
+    return v_moved;
+end;
+$$;
+
+revoke execute on function public.drain_audit_log_queue(integer) from public, anon, authenticated;
+revoke all on table public.audit_log_queue from anon, authenticated;
+revoke all on table public.audit_log_settings from anon, authenticated;
+revoke all on table public.tenant_audit_settings from anon, authenticated;
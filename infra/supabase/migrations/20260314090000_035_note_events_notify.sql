@@ -0,0 +1,202 @@
+/*
+Change notifications for GET /tenants/{tenant_id}/events (SSE).
+
+Triggers publish small JSON events on the note_events channel with
+pg_notify(); each API worker holds one LISTEN connection and fans events
+out to its SSE subscribers. Payloads carry IDs and versions only, never
+content (NOTIFY payloads are limited to 8000 bytes and are visible to
+every listener), and are delivered on commit.
+
+Event types:
+- note.created / note.updated / note.deleted
+  {tenant_id, note_id, owner_id, version, actor_id}
+  (a restored note is reported as note.created)
+- share.granted / share.changed / share.revoked
+  {tenant_id, note_id, owner_id, user_id, permission, actor_id}
+- member.role_changed / member.removed
+  {tenant_id, user_id, role, actor_id}
+  (the API uses these to update or close subscriptions)
+
+tenant_event_scope() gives a subscriber what the API needs to filter
+events by visibility (same rules as notes_select).
+*/
+
+create or replace function public.notify_note_event()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_type text;
+    v_row record;
+begin
+    if tg_op = 'INSERT' then
+        v_type := 'note.created';
+        v_row := new;
+    elsif tg_op = 'DELETE' then
+        if old.deleted_at is not null then
+            return null;
+        end if;
+        v_type := 'note.deleted';
+        v_row := old;
+    elsif old.deleted_at is null and new.deleted_at is not null then
+        v_type := 'note.deleted';
+        v_row := new;
+    elsif old.deleted_at is not null and new.deleted_at is null then
+        v_type := 'note.created';
+        v_row := new;
+    elsif new.deleted_at is null then
+        v_type := 'note.updated';
+        v_row := new;
+    else
+        return null;
+    end if;
+
+    perform pg_notify(
+        'note_events',
+        json_build_object(
+            'type', v_type,
+            'tenant_id', v_row.tenant_id,
+            'note_id', v_row.id,
+            'owner_id', v_row.owner_id,
+            'version', v_row.version,
+            'actor_id', auth.uid()
+        )::text
+    );
+
+    return null;
+end;
+$$;
+
+create trigger notes_notify_event
+after insert or delete or update of content, tags, deleted_at
+on public.notes
+for each row
+execute function public.notify_note_event();
+
+create or replace function public.notify_note_share_event()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_row record;
+    v_tenant_id uuid;
+    v_owner_id uuid;
+begin
+    if tg_op = 'DELETE' then
+        v_row := old;
+    else
+        v_row := new;
+    end if;
+
+    select n.tenant_id, n.owner_id
+    into v_tenant_id, v_owner_id
+    from notes n
+    where n.id = v_row.note_id;
+
+    /* Share removed by the cascade of a hard-deleted note */
+    if v_tenant_id is null then
+        return null;
+    end if;
+
+    perform pg_notify(
+        'note_events',
+        json_build_object(
+            'type', case tg_op
+                when 'INSERT' then 'share.granted'
+                when 'UPDATE' then 'share.changed'
+                else 'share.revoked'
+            end,
+            'tenant_id', v_tenant_id,
+            'note_id', v_row.note_id,
+            'owner_id', v_owner_id,
+            'user_id', v_row.user_id,
+            'permission', v_row.permission,
+            'actor_id', auth.uid()
+        )::text
+    );
+
+    return null;
+end;
+$$;
+
+create trigger note_shares_notify_event
+after insert or delete or update of permission
+on public.note_shares
+for each row
+execute function public.notify_note_share_event();
+
+create or replace function public.notify_tenant_member_event()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_row record;
+begin
+    if tg_op = 'DELETE' then
+        v_row := old;
+    else
+        v_row := new;
+    end if;
+
+    perform pg_notify(
+        'note_events',
+        json_build_object(
+            'type', case tg_op when 'DELETE' then 'member.removed' else 'member.role_changed' end,
+            'tenant_id', v_row.tenant_id,
+            'user_id', v_row.user_id,
+            'role', v_row.role,
+            'actor_id', auth.uid()
+        )::text
+    );
+
+    return null;
+end;
+$$;
+
+create trigger tenant_members_notify_event
+after delete or update of role
+on public.tenant_members
+for each row
+execute function public.notify_tenant_member_event();
+
+/*
+What the caller may see of a tenant's events.
+
+Rules:
+1. SECURITY INVOKER: RLS applies to the share lookup.
+2. No row when the caller is not a member of the tenant.
+3. shared_note_ids: notes of the tenant explicitly shared with the caller.
+*/
+create or replace function public.tenant_event_scope(
+    p_tenant_id uuid
+)
+returns table (
+    user_id uuid,
+    role text,
+    shared_note_ids uuid[]
+)
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+    select
+        (select auth.uid()),
+        r.ret_role,
+        array(
+            select ns.note_id
+            from note_shares ns
+            join notes n
+              on n.id = ns.note_id
+            where ns.user_id = (select auth.uid())
+              and n.tenant_id = p_tenant_id
+        )
+    from auth_user_tenant_roles() r
+    where r.ret_tenant_id = p_tenant_id;
+$$;
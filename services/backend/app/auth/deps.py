@@ -1,7 +1,12 @@
-from fastapi import Header, HTTPException, status
+from typing import Any
+from uuid import UUID
 
+from fastapi import Depends, Header, HTTPException, status
 
-def get_current_access_token(
+from app.auth.verifier import TokenVerificationError, get_jwt_verifier
+
+
+async def get_current_access_token(
     authorization: str | None = Header(default=None),
 ) -> str:
     """
@@ -11,9 +16,10 @@ def get_current_access_token(
         Authorization: Bearer <access_token>
 
     This function:
-    - Does NOT decode or verify JWT
-    - Does NOT inspect claims
-    - Only ensures token presence and basic format
+    - Ensures token presence and basic format
+    - If JWT_VERIFICATION_ENABLED, verifies signature and exp locally
+      so bad tokens never cost a database round trip
+    - Does NOT inspect claims for authorization
 
     The database (RLS + auth.uid()) is the single source of truth
     for authentication and authorization.
@@ -51,4 +57,56 @@ def get_current_access_token(
             detail="Empty access token",
         )
 
+    """
+    Optional local verification (cached per token).
+    """
+    verifier = get_jwt_verifier()
+    if verifier is not None:
+        try:
+            await verifier.verify(access_token)
+        except TokenVerificationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(exc),
+            )
+
     return access_token
+
+
+async def get_current_claims(
+    access_token: str = Depends(get_current_access_token),
+) -> dict[str, Any] | None:
+    """
+    Decoded claims of the verified access token.
+
+    Returns None when local verification is disabled: unverified claims
+    are never exposed to routers.
+    """
+    verifier = get_jwt_verifier()
+    if verifier is None:
+        return None
+
+    """
+    Token was verified by get_current_access_token; this is a cache hit.
+    """
+    return await verifier.verify(access_token)
+
+
+async def get_current_user_id(
+    claims: dict[str, Any] | None = Depends(get_current_claims),
+) -> UUID | None:
+    """
+    Authenticated user's ID (the verified `sub` claim).
+
+    Returns None when local verification is disabled.
+    """
+    if claims is None:
+        return None
+
+    try:
+        return UUID(claims["sub"])
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Access token has no valid subject",
+        )
@@ -0,0 +1,221 @@
+"""
+Local JWT verification for Supabase access tokens.
+
+Responsibilities:
+- Verify signature and exp before any request reaches PostgREST
+- Support the legacy shared secret (HS256) and asymmetric keys from JWKS
+- Cache the key set and recently verified tokens in-process
+
+The database (RLS + auth.uid()) remains the source of truth for
+authorization. This layer only rejects tokens PostgREST would reject
+anyway, without paying a network round trip for them.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+import jwt
+
+from app.cache.lru import TTLCache
+from app.config import settings
+
+
+class TokenVerificationError(Exception):
+    """
+    Raised when an access token is malformed, expired or badly signed.
+    """
+
+
+class JwtVerifier:
+    """
+    Verifies access tokens locally.
+
+    Verified claims are kept in a small LRU until the token expires,
+    so repeated requests with the same token cost a dict lookup.
+    """
+
+    def __init__(
+        self,
+        *,
+        secret: Optional[str],
+        jwks_url: Optional[str],
+        audience: Optional[str],
+        leeway: float = 0,
+        cache_size: int = 10_000,
+        jwks_ttl: float = 600,
+    ):
+        self.secret = secret
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.leeway = leeway
+        self.jwks_ttl = jwks_ttl
+
+        self._verified: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=cache_size)
+        self._jwks: Optional[jwt.PyJWKSet] = None
+        self._jwks_fetched_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """
+        Return decoded claims for a valid token.
+
+        Raises TokenVerificationError if the token is invalid or expired.
+        """
+        claims = self._verified.get(token)
+        if claims is not None:
+            return claims
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as exc:
+            raise TokenVerificationError("Malformed access token") from exc
+
+        algorithm = header.get("alg")
+        key = await self._resolve_key(algorithm, header.get("kid"))
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                leeway=self.leeway,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.ExpiredSignatureError as exc:
+            raise TokenVerificationError("Access token has expired") from exc
+        except jwt.InvalidTokenError as exc:
+            raise TokenVerificationError("Invalid access token") from exc
+
+        """
+        Cache until the token itself expires.
+        """
+        ttl = claims["exp"] - time.time()
+        if ttl > 0:
+            self._verified.set(token, claims, ttl=ttl)
+
+        return claims
+
+    async def _resolve_key(self, algorithm: Optional[str], kid: Optional[str]) -> Any:
+        """
+        Pick the verification key for the token header.
+        """
+        if algorithm == "HS256":
+            if not self.secret:
+                raise TokenVerificationError("HS256 tokens are not accepted")
+            return self.secret
+
+        if algorithm not in ("RS256", "ES256"):
+            raise TokenVerificationError("Unsupported token algorithm")
+
+        if not self.jwks_url:
+            raise TokenVerificationError("Asymmetric tokens are not accepted")
+
+        jwk_set = await self._get_jwks()
+        key = self._find_key(jwk_set, kid)
+
+        if key is None:
+            """
+            Unknown kid: keys may have rotated. Refresh once.
+            """
+            jwk_set = await self._get_jwks(force=True)
+            key = self._find_key(jwk_set, kid)
+
+        if key is None:
+            raise TokenVerificationError("Unknown signing key")
+
+        return key.key
+
+    @staticmethod
+    def _find_key(jwk_set: Optional[jwt.PyJWKSet], kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        if jwk_set is None:
+            return None
+        for key in jwk_set.keys:
+            if key.key_id == kid:
+                return key
+        return None
+
+    def peek(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Claims of a token verified recently, without verifying it again.
+        Returns None if the token is not in the verified cache.
+        """
+        return self._verified.get(token)
+
+    async def _get_jwks(self, *, force: bool = False) -> Optional[jwt.PyJWKSet]:
+        """
+        Return cached key set, fetching it when stale.
+        A single fetch is shared by concurrent callers.
+        """
+        if not force and self._jwks is not None and time.monotonic() - self._jwks_fetched_at < self.jwks_ttl:
+            return self._jwks
+
+        async with self._jwks_lock:
+            fetched_recently = time.monotonic() - self._jwks_fetched_at < 1
+            if self._jwks is not None and fetched_recently:
+                return self._jwks
+
+            try:
+                async with httpx.AsyncClient(timeout=5) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                self._jwks = jwt.PyJWKSet.from_dict(response.json())
+            except (httpx.HTTPError, jwt.PyJWKSetError, ValueError):
+                """
+                Keep serving the previous key set if refresh fails.
+                """
+                if self._jwks is None:
+                    raise TokenVerificationError("Signing keys are unavailable")
+
+            self._jwks_fetched_at = time.monotonic()
+            return self._jwks
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    The exp claim of a token (epoch seconds), read WITHOUT verification.
+
+    Only for tokens the database has already accepted, e.g. to end a
+    long-lived stream when its token expires. Returns None if the token
+    has no readable exp.
+    """
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return None
+    exp = claims.get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+"""
+Internal singleton verifier. None when local verification is disabled.
+"""
+_verifier: Optional[JwtVerifier] = None
+
+
+def get_jwt_verifier() -> Optional[JwtVerifier]:
+    """
+    Get the process-wide verifier, or None if JWT_VERIFICATION_ENABLED is off.
+    """
+    global _verifier
+    if _verifier is None and settings.JWT_VERIFICATION_ENABLED:
+        _verifier = JwtVerifier(
+            secret=settings.SUPABASE_JWT_SECRET,
+            jwks_url=settings.JWT_JWKS_URL or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+            audience=settings.JWT_AUDIENCE,
+            leeway=settings.JWT_LEEWAY_SECONDS,
+            cache_size=settings.JWT_CACHE_SIZE,
+            jwks_ttl=settings.JWT_JWKS_CACHE_TTL,
+        )
+    return _verifier
+
+
+def override_jwt_verifier(verifier: Optional[JwtVerifier]) -> None:
+    """
+    Override the verifier instance.
+    This function is intended ONLY for testing purposes.
+    """
+    global _verifier
+    _verifier = verifier
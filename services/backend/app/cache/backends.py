@@ -0,0 +1,108 @@
+"""
+Pluggable key/value backends for shared response caching.
+
+- MemoryCacheBackend: process-local TTLCache (default, single worker)
+- RedisCacheBackend: any Redis-compatible server, shared by all workers
+
+Values are strings (callers serialize). Backends are async so a network
+store can be swapped in without touching callers.
+
+This module MUST NOT contain any business logic.
+"""
+
+from typing import Optional, Protocol
+
+from app.cache.lru import TTLCache
+from app.config import settings
+
+
+class CacheBackend(Protocol):
+    """
+    Minimal string key/value store with per-entry TTL.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """
+    CacheBackend over an in-process TTLCache.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._cache: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class RedisCacheBackend:
+    """
+    CacheBackend over a Redis-compatible server (redis, valkey, ...).
+
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, ttl: Optional[float] = None, prefix: str = "app:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self._ttl = ttl
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        lifetime = self._ttl if ttl is None else ttl
+        px = int(lifetime * 1000) if lifetime is not None else None
+        await self._client.set(self._prefix + key, value, px=px)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+
+"""
+Internal singleton backend.
+"""
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Get the process-wide backend selected by CACHE_BACKEND.
+    """
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == "redis":
+            if not settings.CACHE_REDIS_URL:
+                raise RuntimeError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+            _backend = RedisCacheBackend(settings.CACHE_REDIS_URL)
+        else:
+            _backend = MemoryCacheBackend(maxsize=settings.CACHE_MEMORY_SIZE)
+    return _backend
+
+
+def override_cache_backend(backend: Optional[CacheBackend]) -> None:
+    """
+    Override the backend instance.
+    This function is intended ONLY for testing purposes.
+    """
+    global _backend
+    _backend = backend
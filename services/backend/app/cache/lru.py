@@ -0,0 +1,111 @@
+"""
+Bounded in-process cache with LRU eviction and optional per-entry TTL.
+
+Used for hot, small, process-local state (verified tokens, rendered
+content, counters). Values are NOT shared across workers.
+
+This module MUST NOT contain any business logic.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe LRU cache whose entries may also expire after a TTL.
+
+    - maxsize bounds the number of entries (least recently used evicted first)
+    - ttl is the default lifetime in seconds; None means no expiry
+    - expired entries are dropped lazily on access
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, tuple[Optional[float], V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: Any = None) -> Any:
+        """
+        Return cached value and mark it as recently used.
+        Returns default when missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store value. ttl overrides the cache default for this entry.
+        """
+        lifetime = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + lifetime if lifetime is not None else None
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        """
+        Drop a single entry if present.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def values(self) -> list[V]:
+        """
+        Snapshot of the live (unexpired) values, least recently used first.
+        Does not change recency.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                value
+                for expires_at, value in self._data.values()
+                if expires_at is None or expires_at > now
+            ]
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Snapshot of the live (unexpired) entries, least recently used first.
+        Does not change recency.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value)
+                for key, (expires_at, value) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
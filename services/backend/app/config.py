@@ -18,6 +18,136 @@ class Settings(BaseSettings):
     
     CORS_ORIGINS: list[str] = []
 
+    """
+    PostgREST connection pool.
+    One keep-alive pool is shared by all requests; auth is per request.
+    """
+    POSTGREST_MAX_CONNECTIONS: int = 100
+    POSTGREST_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    POSTGREST_KEEPALIVE_EXPIRY: float = 30.0
+    POSTGREST_TIMEOUT: float = 120.0
+
+    """
+    Local JWT verification (optional).
+    When enabled, bad or expired tokens are rejected before any DB call.
+    SUPABASE_JWT_SECRET verifies legacy HS256 tokens; asymmetric tokens are
+    checked against the project JWKS (defaults to the Supabase auth endpoint).
+    """
+    JWT_VERIFICATION_ENABLED: bool = False
+    SUPABASE_JWT_SECRET: str | None = None
+    JWT_JWKS_URL: str | None = None
+    JWT_AUDIENCE: str = "authenticated"
+    JWT_LEEWAY_SECONDS: float = 0
+    JWT_CACHE_SIZE: int = 10_000
+    JWT_JWKS_CACHE_TTL: float = 600
+
+    """
+    Threadpool size for remaining sync work (file parsing, CPU-bound helpers).
+    """
+    THREADPOOL_MAX_WORKERS: int = 40
+
+    """
+    In-process semantic note index (GET /tenants/{tenant_id}/notes/semantic).
+    One float32 matrix of EMBEDDING_DIM columns per tenant (about 1 KB per
+    note at 256 dimensions, up to twice that while capacity doubles); at
+    most INDEX_MAX_TENANTS are kept and together they hold at most
+    INDEX_MAX_BYTES, least recently used dropped first. A tenant that
+    alone exceeds INDEX_MAX_BYTES cannot be searched. An index older than
+    INDEX_TTL seconds is rebuilt in the background while it keeps serving.
+    Hits are ranked within the caller's visibility scope; at most
+    MAX_CANDIDATES of them are re-checked under RLS per query.
+    Patched notes are re-embedded at most once per REINDEX_DELAY seconds.
+    """
+    SEMANTIC_EMBEDDING_DIM: int = 256
+    SEMANTIC_INDEX_MAX_TENANTS: int = 32
+    SEMANTIC_INDEX_MAX_BYTES: int = 512 * 1024 * 1024
+    SEMANTIC_INDEX_TTL: float = 600
+    SEMANTIC_MAX_CANDIDATES: int = 200
+    SEMANTIC_REINDEX_DELAY: float = 5.0
+
+    """
+    Maximum number of items accepted by batch note endpoints.
+    """
+    NOTES_BATCH_MAX_ITEMS: int = 500
+
+    """
+    Rendered Markdown cache (?render=html), keyed by content hash.
+    Notes longer than RENDER_CACHE_MAX_CHARS are rendered but not cached.
+    """
+    RENDER_CACHE_SIZE: int = 512
+    RENDER_CACHE_MAX_CHARS: int = 256 * 1024
+
+    """
+    Maximum number of splice operations in one note patch.
+    """
+    NOTE_PATCH_MAX_OPS: int = 256
+
+    """
+    Streaming export: at most CHUNK_SIZE notes fetched per keyset page;
+    pages shrink and output chunks are split so that one chunk holds about
+    CHUNK_MAX_BYTES of note content.
+    """
+    EXPORT_CHUNK_SIZE: int = 500
+    EXPORT_CHUNK_MAX_BYTES: int = 4 * 1024 * 1024
+
+    """
+    Bulk import: upload size limit, bytes kept in memory before spooling
+    to disk, rows per multi-row insert, per-note size limit, and how long
+    a finished job's status stays available (seconds).
+    """
+    IMPORT_MAX_BYTES: int = 200 * 1024 * 1024
+    IMPORT_SPOOL_MAX_MEMORY: int = 8 * 1024 * 1024
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_NOTE_BYTES: int = 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+    IMPORT_JOB_TTL: float = 24 * 3600
+
+    """
+    Shared cache backend: "memory" (per process) or "redis" (shared by
+    workers, needs the redis package and CACHE_REDIS_URL).
+    """
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str | None = None
+    CACHE_MEMORY_SIZE: int = 50_000
+
+    """
+    Per-user cache of /me list responses. Requires JWT_VERIFICATION_ENABLED
+    (entries are keyed by user ID). Writes invalidate the affected users;
+    TTL bounds staleness for anything not invalidated explicitly.
+    """
+    ME_CACHE_ENABLED: bool = True
+    ME_CACHE_TTL: float = 30
+
+    """
+    GET /me/bootstrap: seconds each section may take before it is
+    reported as timed out (the other sections are still returned).
+    """
+    BOOTSTRAP_SECTION_TIMEOUT: float = 10.0
+
+    """
+    Create upcoming monthly audit_logs partitions when the app starts.
+    Disable where pg_cron already runs ensure_audit_log_partitions().
+    """
+    AUDIT_PARTITIONS_ON_STARTUP: bool = True
+
+    """
+    Audit drain worker (python -m app.workers.audit_drain): events moved
+    per batch, and seconds to wait once the queue is empty.
+    """
+    AUDIT_DRAIN_BATCH_SIZE: int = 1000
+    AUDIT_DRAIN_IDLE_INTERVAL: float = 1.0
+
+    """
+    Tenant event streams (GET /tenants/{tenant_id}/events).
+    DATABASE_URL is a direct Postgres connection (session mode: LISTEN does
+    not work through a transaction pooler); one per worker, needs asyncpg.
+    Streams are unavailable while it is unset.
+    """
+    DATABASE_URL: str | None = None
+    EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_RECONNECT_DELAY: float = 2.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,31 @@
+"""
+Request/Response contracts for the tenant audit log.
+"""
+
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class AuditLogItem(BaseModel):
+    """
+    A single audit entry, written by the database RPC that performed the action.
+    """
+    id: UUID
+    tenant_id: UUID
+    actor_id: Optional[UUID] = None
+    action: str
+    target_type: str
+    target_id: Optional[UUID] = None
+    metadata: Dict[str, Any] = {}
+    created_at: datetime
+
+
+class ListAuditLogsResponse(BaseModel):
+    """
+    Response for listing a tenant's audit log, newest first.
+    """
+    entries: List[AuditLogItem]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
@@ -0,0 +1,27 @@
+"""
+Request/Response contracts for the authenticated user's composite views.
+"""
+
+from pydantic import BaseModel
+from typing import Dict, Optional
+from app.http.response import ErrorPayload
+from app.contracts.note import ListTenantNotesResponse
+from app.contracts.request import ListMyInvitesResponse, ListMyJoinRequestsResponse
+from app.contracts.tenant import ListTenantMembersResponse, ListTenantsResponse, TenantDetailsResponse
+
+
+class BootstrapResponse(BaseModel):
+    """
+    Everything the dashboard / workspace needs on first paint.
+
+    Each section is the first page of its own endpoint. A section that
+    failed is null and its error is listed in errors under the same name.
+    tenant, members and notes are present only when tenant_id was given.
+    """
+    tenants: Optional[ListTenantsResponse] = None
+    invites: Optional[ListMyInvitesResponse] = None
+    requests: Optional[ListMyJoinRequestsResponse] = None
+    tenant: Optional[TenantDetailsResponse] = None
+    members: Optional[ListTenantMembersResponse] = None
+    notes: Optional[ListTenantNotesResponse] = None
+    errors: Dict[str, ErrorPayload] = {}
@@ -2,10 +2,30 @@
 Request/Response contracts for note management operations.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Union
+from app.http.response import ApiResponse
+
+
+"""
+Server-side rendering of note content (?render=html).
+"""
+RenderMode = Literal["html"]
+
+"""
+Projection of note list items (?view=...).
+"""
+NoteView = Literal["full", "summary"]
+
+"""
+Parse-time bounds of a note patch. Positions must fit the integer casts
+in apply_note_patch; NOTE_PATCH_MAX_OPS may lower the operation limit.
+"""
+PATCH_MAX_POSITION = 2**31 - 1
+PATCH_MAX_OPS = 1024
+PATCH_MAX_INSERT_CHARS = 1024 * 1024
 
 
 
@@ -32,22 +52,40 @@ class CreateNoteResponse(BaseModel):
 class GetNoteResponse(BaseModel):
     """
     Response when retrieving a single note.
+    html is set only with ?render=html.
     """
     id: UUID
     tenant_id: UUID
     owner_id: UUID
     content: str
+    tags: List[str] = []
+    html: Optional[str] = None
+    version: int
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
 
 
+class NoteSpliceOp(BaseModel):
+    """
+    One splice operation of a note patch.
+    start / delete count Unicode code points in the base content.
+    """
+    start: int = Field(ge=0, le=PATCH_MAX_POSITION)
+    delete: int = Field(default=0, ge=0, le=PATCH_MAX_POSITION)
+    insert: str = Field(default="", max_length=PATCH_MAX_INSERT_CHARS)
+
+
 class UpdateNotePayload(BaseModel):
     """
     Payload for updating note content.
+    Either content (full replacement) or ops (splice operations, sorted and
+    non-overlapping, against base_version or the If-Match version).
     """
-    content: str
+    content: Optional[str] = None
+    base_version: Optional[int] = None
+    ops: Optional[List[NoteSpliceOp]] = Field(default=None, max_length=PATCH_MAX_OPS)
 
 
 class UpdateNoteResponse(BaseModel):
@@ -58,6 +96,22 @@ class UpdateNoteResponse(BaseModel):
     tenant_id: UUID
     owner_id: UUID
     content: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class PatchNoteResponse(BaseModel):
+    """
+    Response when a note patch is applied.
+    Content is omitted: the client already has it. length is the new
+    content length in code points, to check the local copy against.
+    """
+    id: UUID
+    tenant_id: UUID
+    owner_id: UUID
+    version: int
+    length: int
     created_at: datetime
     updated_at: datetime
 
@@ -73,11 +127,30 @@ class DeleteNoteResponse(BaseModel):
 class NoteItem(BaseModel):
     """
     Represents a single note in list responses.
+    html is set only with ?render=html.
     """
     id: UUID
     tenant_id: UUID
     owner_id: UUID
     content: str
+    tags: List[str] = []
+    html: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteSummaryItem(BaseModel):
+    """
+    Compact list item returned with ?view=summary.
+    title / preview are computed by the database from content, which is
+    not sent.
+    """
+    id: UUID
+    tenant_id: UUID
+    owner_id: UUID
+    title: str
+    preview: str
+    tags: List[str] = []
     created_at: datetime
     updated_at: datetime
 
@@ -86,16 +159,18 @@ class ListMyNotesResponse(BaseModel):
     """
     Response for listing notes the authenticated user owns or has access to.
     """
-    notes: List[NoteItem]
-    total: int
+    notes: List[Union[NoteItem, NoteSummaryItem]]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ListTenantNotesResponse(BaseModel):
     """
     Response for listing notes in a specific tenant.
     """
-    notes: List[NoteItem]
-    total: int
+    notes: List[Union[NoteItem, NoteSummaryItem]]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class ShareNotePayload(BaseModel):
     """
@@ -151,12 +226,220 @@ class ListNoteSharesResponse(BaseModel):
     Response for listing all users who have access to a note.
     """
     shares: List[NoteShareItem]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class NoteRevisionItem(BaseModel):
+    """
+    One recorded revision of a note (metadata only).
+    revision is the note version right after the change.
+    """
+    revision: int
+    kind: Literal["snapshot", "delta"]
+    content_length: int
+    changed_by: Optional[UUID] = None
+    created_at: datetime
+
+
+class ListNoteRevisionsResponse(BaseModel):
+    """
+    Response for listing a note's revisions, newest first.
+    """
+    revisions: List[NoteRevisionItem]
+    next_cursor: Optional[str] = None
+
+
+class NoteRevisionResponse(BaseModel):
+    """
+    Content of a note as of a given version.
+    revision is the recorded revision that version resolves to.
+    """
+    note_id: UUID
+    revision: int
+    content: str
+    changed_by: Optional[UUID] = None
+    created_at: datetime
+
+
+class SharedNoteItem(BaseModel):
+    """
+    A note shared with the authenticated user.
+    created_at is when the share was granted; the rest describes the note.
+    """
+    note_id: UUID
+    user_id: UUID
+    permission: Literal['read', 'write']
+    created_at: datetime
+    tenant_id: UUID
+    tenant_name: Optional[str] = None
+    owner_id: Optional[UUID] = None
+    owner_email: Optional[str] = None
+    title: str
+    preview: str
+    updated_at: datetime
 
 
 class ListSharedWithMeResponse(BaseModel):
     """
     Response for listing note shares granted to the authenticated user.
     """
-    shares: List[NoteShareItem]
-    total: int
\ No newline at end of file
+    shares: List[SharedNoteItem]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class NoteSearchItem(BaseModel):
+    """
+    A single full-text search hit.
+    snippet is HTML-escaped content with matches wrapped in <mark>.
+    """
+    id: UUID
+    tenant_id: UUID
+    owner_id: UUID
+    rank: float
+    snippet: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class SearchNotesResponse(BaseModel):
+    """
+    Response for full-text note search, ordered by relevance.
+    next_offset is None when there are no more results.
+    """
+    results: List[NoteSearchItem]
+    next_offset: Optional[int] = None
+
+
+class AddNoteTagsPayload(BaseModel):
+    """
+    Payload for adding tags to a note.
+    Tags are normalized by the database (trimmed, lower-cased, de-duplicated).
+    """
+    tags: List[str]
+
+
+class NoteTagsResponse(BaseModel):
+    """
+    Response when note tags change. tags is the full, normalized tag list.
+    """
+    note_id: UUID
+    tags: List[str]
+
+
+class TagFacetItem(BaseModel):
+    """
+    A tag and the number of notes carrying it.
+    """
+    tag: str
+    note_count: int
+
+
+class ListTenantTagsResponse(BaseModel):
+    """
+    Response for tag facets of a tenant, most used first.
+    """
+    tags: List[TagFacetItem]
+
+
+class SemanticNoteItem(BaseModel):
+    """
+    A semantic search hit: the note plus its cosine similarity to the query.
+    """
+    id: UUID
+    tenant_id: UUID
+    owner_id: UUID
+    content: str
+    tags: List[str] = []
+    score: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class SemanticSearchResponse(BaseModel):
+    """
+    Response for semantic note search, most similar first.
+    """
+    results: List[SemanticNoteItem]
+
+
+class BatchCreateNoteItem(BaseModel):
+    """
+    One note to create in a batch.
+    """
+    content: str
+    tags: List[str] = []
+
+
+class BatchCreateNotesPayload(BaseModel):
+    """
+    Payload for creating many notes in one tenant.
+    """
+    items: List[BatchCreateNoteItem]
+
+
+class BatchUpdateNoteItem(BaseModel):
+    """
+    One note content update in a batch.
+    """
+    id: UUID
+    content: str
+
+
+class BatchUpdateNotesPayload(BaseModel):
+    """
+    Payload for updating many notes at once.
+    """
+    items: List[BatchUpdateNoteItem]
+
+
+class BatchNoteItem(BaseModel):
+    """
+    A note created or updated by a batch operation.
+    Content is omitted: the client sent it.
+    """
+    id: UUID
+    tenant_id: UUID
+    owner_id: UUID
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class BatchNotesResponse(BaseModel):
+    """
+    Per-item outcome of a batch operation.
+    results[i] is the ApiResponse for items[i]: data is a BatchNoteItem on
+    success, error otherwise.
+    """
+    results: List[ApiResponse]
+    succeeded: int
+    failed: int
+
+
+class ImportErrorItem(BaseModel):
+    """
+    One record (or the whole job) that could not be imported.
+    source is "line N" for NDJSON, the file path for zip archives.
+    """
+    source: str
+    message: str
+
+
+class ImportJobResponse(BaseModel):
+    """
+    Status and progress of a bulk import job.
+    status: queued | running | succeeded | failed
+    errors holds at most IMPORT_MAX_REPORTED_ERRORS entries; failed counts all.
+    """
+    job_id: str
+    tenant_id: UUID
+    format: str
+    status: str
+    processed: int
+    imported: int
+    failed: int
+    errors: List[ImportErrorItem] = []
+    created_at: datetime
+    finished_at: Optional[datetime] = None
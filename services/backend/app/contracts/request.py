@@ -101,6 +101,7 @@ class ListJoinRequestsResponse(BaseModel):
     Response list of join requests for a tenant.
     """
     requests: List[JoinRequestItem]
+    next_cursor: Optional[str] = None
 
 
 class InviteItem(BaseModel):
@@ -123,6 +124,7 @@ class ListInvitesResponse(BaseModel):
     Response list of invites for a tenant.
     """
     invites: List[InviteItem]
+    next_cursor: Optional[str] = None
 
 
 class MyInviteItem(BaseModel):
@@ -142,6 +144,7 @@ class ListMyInvitesResponse(BaseModel):
     Response list of pending invites for authenticated user.
     """
     invites: List[MyInviteItem]
+    next_cursor: Optional[str] = None
 
 
 class MyJoinRequestItem(BaseModel):
@@ -161,4 +164,5 @@ class ListMyJoinRequestsResponse(BaseModel):
     """
     Response list of join requests by authenticated user.
     """
-    requests: List[MyJoinRequestItem]
\ No newline at end of file
+    requests: List[MyJoinRequestItem]
+    next_cursor: Optional[str] = None
\ No newline at end of file
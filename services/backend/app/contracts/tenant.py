@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 
 class CreateTenantPayload(BaseModel):
@@ -50,16 +50,21 @@ class ListTenantsResponse(BaseModel):
     Response when listing all tenants user belongs to.
     """
     tenants: List[TenantItem]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class TenantDetailsResponse(BaseModel):
     """
     Response when getting tenant details.
+    Counts are tenant-wide and maintained by the database (tenant_stats).
     """
     id: UUID
     name: str
     created_at: datetime
+    member_count: int = 0
+    active_note_count: int = 0
+    last_activity_at: Optional[datetime] = None
 
 
 class TenantMemberItem(BaseModel):
@@ -77,4 +82,5 @@ class ListTenantMembersResponse(BaseModel):
     Response when listing members of a tenant.
     """
     members: List[TenantMemberItem]
-    total: int
\ No newline at end of file
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
\ No newline at end of file
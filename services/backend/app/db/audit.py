@@ -0,0 +1,114 @@
+"""
+Database adapters for the tenant audit log.
+
+Operations:
+- list_tenant_audit_logs() - Keyset-paginated, filtered audit entries of a tenant
+- ensure_audit_log_partitions() - Create upcoming monthly partitions (service role)
+- drain_audit_log_queue() - Move queued async audit events into audit_logs (service role)
+
+audit_logs is partitioned by month on created_at (migration 033).
+Partitions are pruned only when since / until bound created_at; the
+keyset cursor is an OR over (created_at, id) and does not prune. An
+unbounded listing opens every partition's (tenant_id, created_at desc,
+id desc) index, though the LIMIT stops it after the newest rows.
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from app.db.client import get_service_client, get_user_client
+from app.db.counts import CountMode, count_method
+from app.db.pagination import apply_keyset
+from app.errors.db import map_db_error
+
+
+AUDIT_LOG_COLUMNS = "id, tenant_id, actor_id, action, target_type, target_id, metadata, created_at"
+
+
+async def list_tenant_audit_logs(
+    access_token: str,
+    tenant_id: UUID,
+    limit: int = 50,
+    cursor: str = None,
+    count: CountMode = "none",
+    action: Optional[str] = None,
+    actor_id: Optional[UUID] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[UUID] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    List audit entries of a tenant, newest first.
+    RLS enforces: only tenant owners / admins see entries.
+
+    Filters:
+    - action: exact action, or a prefix ending in ".*" (e.g. "tenant.member.*")
+    - actor_id, target_type, target_id: exact match
+    - since / until: created_at window (since inclusive, until exclusive);
+      the only filters that prune partitions
+
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        query = client.table("audit_logs").select(AUDIT_LOG_COLUMNS, count=count_method(count)) \
+            .eq("tenant_id", str(tenant_id))
+
+        if action:
+            if action.endswith(".*"):
+                """
+                "_" is a LIKE wildcard and occurs in action names.
+                """
+                query = query.like("action", action[:-1].replace("_", "\\_") + "%")
+            else:
+                query = query.eq("action", action)
+        if actor_id:
+            query = query.eq("actor_id", str(actor_id))
+        if target_type:
+            query = query.eq("target_type", target_type)
+        if target_id:
+            query = query.eq("target_id", str(target_id))
+        if since:
+            query = query.gte("created_at", since.isoformat())
+        if until:
+            query = query.lt("created_at", until.isoformat())
+
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def ensure_audit_log_partitions():
+    """
+    Create audit_logs partitions for the current and next three months.
+    Idempotent; returns the number of partitions created.
+    Uses the service role (the RPC is not executable by users).
+    """
+    try:
+        client = get_service_client()
+
+        result = await client.rpc("ensure_audit_log_partitions", {}).execute()
+
+        return result.data
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def drain_audit_log_queue(limit: int):
+    """
+    Move up to limit queued audit events into audit_logs (migration 034).
+    Returns the number of events moved; 0 when the queue is empty.
+    Safe to call from several workers at once.
+    """
+    try:
+        client = get_service_client()
+
+        result = await client.rpc("drain_audit_log_queue", {"p_limit": limit}).execute()
+
+        return result.data or 0
+    except Exception as e:
+        raise map_db_error(e)
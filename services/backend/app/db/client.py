@@ -5,11 +5,16 @@ Responsibilities:
 - Initialize Supabase client
 - Centralize database configuration
 - Provide injectable database client for adapters and services
+- Provide token-scoped PostgREST clients sharing one connection pool
+- Provide an async service-role client for background/system reads
 
 This module MUST NOT contain any business logic.
 """
 
 from typing import Optional
+
+import httpx
+from postgrest import AsyncPostgrestClient
 from supabase import Client, create_client, ClientOptions
 from app.config import settings
 
@@ -21,6 +26,14 @@ across the application lifecycle.
 """
 _supabase_client: Optional[Client] = None
 
+"""
+Internal shared HTTP transport for PostgREST requests.
+Holds the keep-alive connection pool reused by every token-scoped client.
+It carries NO auth headers: credentials are attached per request.
+"""
+_http_client: Optional[httpx.AsyncClient] = None
+
+
 def get_supabase_client() -> Client:
     """
     Get a singleton instance of Supabase client.
@@ -51,18 +64,85 @@ def override_supabase_client(client: Client) -> None:
     """
     global _supabase_client
     _supabase_client = client
-    
-# def get_user_supabase_client(access_token: str):
-#     """
-#     Create a Supabase client bound to a specific user JWT using the PUBLISHABLE key.
-    
-#     This is the CORRECT way to enforce RLS 'TO authenticated' policies.
-#     The role will be switched to 'authenticated' by PostgREST.
-#     """
-#     client = create_client(
-#         settings.SUPABASE_URL,
-#         settings.SUPABASE_PUBLISHABLE_KEY,
-#     )
-#     client.postgrest.auth(access_token)
-#     return client
 
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared keep-alive HTTP transport, creating it on first use.
+
+    A single httpx.AsyncClient is shared by every in-flight request on the
+    event loop. Only connections are pooled; headers are not.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.POSTGREST_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.POSTGREST_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.POSTGREST_KEEPALIVE_EXPIRY,
+            ),
+            timeout=settings.POSTGREST_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+        )
+    return _http_client
+
+
+def override_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """
+    Override the shared HTTP transport.
+    This function is intended ONLY for testing purposes,
+    e.g. injecting an httpx.AsyncClient backed by a MockTransport.
+    Args:
+        client (httpx.AsyncClient | None): Transport to use, or None to reset
+    """
+    global _http_client
+    _http_client = client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP transport and release pooled connections.
+    Called on application shutdown.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_user_client(access_token: str) -> AsyncPostgrestClient:
+    """
+    Get an async PostgREST client bound to a specific user JWT.
+
+    Each call returns a new lightweight client whose headers (and therefore
+    auth context) belong to this request only, while the underlying
+    connections come from the shared keep-alive pool.
+
+    Adapters await its requests, so a slow PostgREST call parks a coroutine
+    instead of holding a threadpool thread.
+
+    Args:
+        access_token (str): User JWT forwarded from the Authorization header
+    Returns:
+        AsyncPostgrestClient: Client that enables auth.uid() for this user
+    """
+    client = AsyncPostgrestClient(
+        f"{settings.SUPABASE_URL}/rest/v1",
+        headers={
+            "apiKey": settings.SUPABASE_SERVICE_ROLE_KEY,
+        },
+        http_client=_get_http_client(),
+    )
+    return client.auth(access_token)
+
+
+def get_service_client() -> AsyncPostgrestClient:
+    """
+    Get an async PostgREST client authenticated as the service role.
+
+    Bypasses RLS. Use ONLY for system work that is not performed on behalf
+    of a user (e.g. building in-process indexes); anything returned to a
+    user must be re-checked under that user's token.
+    """
+    return get_user_client(settings.SUPABASE_SERVICE_ROLE_KEY)
@@ -0,0 +1,31 @@
+"""
+Row-count strategies for list queries.
+
+Counting is the most expensive part of a list query under RLS: an exact
+count evaluates the access policy for every visible row, on every page.
+Clients pick how much accuracy they need per request:
+
+- exact      COUNT(*) under RLS (default, backward compatible)
+- planned    planner estimate (pg_class / EXPLAIN), cheap but approximate
+- estimated  PostgREST estimate (exact up to max-rows, planner above);
+             a tenant's note list serves owners / admins the counter
+             maintained by triggers in tenant_stats instead
+- none       no count at all (infinite scroll)
+
+This module MUST NOT contain any business logic.
+"""
+
+from typing import Literal, Optional
+
+
+CountMode = Literal["exact", "planned", "estimated", "none"]
+
+
+def count_method(mode: CountMode) -> Optional[str]:
+    """
+    Translate a CountMode into the PostgREST Prefer: count=... value.
+    Returns None when no count should be requested.
+    """
+    if mode == "none":
+        return None
+    return mode
@@ -0,0 +1,25 @@
+"""
+Database adapters for tenant change events.
+
+Operations:
+- get_tenant_event_scope() - Caller's user ID, role and shared notes in a tenant (via RPC)
+"""
+
+from uuid import UUID
+from app.db.client import get_user_client
+from app.errors.db import map_db_error
+
+
+async def get_tenant_event_scope(access_token: str, tenant_id: UUID):
+    """
+    What the caller may see of a tenant's events (migration 035).
+    Empty result means the caller is not a member of the tenant.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc("tenant_event_scope", {"p_tenant_id": str(tenant_id)}).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
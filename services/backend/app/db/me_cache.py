@@ -0,0 +1,121 @@
+"""
+Per-user cache for the /me list endpoints.
+
+Responsibilities:
+- Cache serialized responses keyed by user ID, section and query params
+- Invalidation hooks called by write adapters for every user they touch
+
+Invalidation uses a generation token per (user, section): every cache key
+embeds the current token, and invalidating replaces it with a fresh
+random one. Old entries become unreachable and expire on their own, so
+invalidation is a single write whatever the number of cached pages, and
+works the same on a shared Redis-compatible backend.
+
+Caching is active only when local JWT verification is enabled, since the
+verified `sub` claim is the only trusted user ID available here.
+"""
+
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.auth.verifier import get_jwt_verifier
+from app.cache.backends import get_cache_backend
+from app.config import settings
+
+
+MeSection = Literal["tenants", "invites", "requests", "shared"]
+
+logger = logging.getLogger(__name__)
+
+
+def me_cache_active() -> bool:
+    """
+    Whether responses are cached (and invalidation has any effect).
+    Adapters check this before paying for extra lookups of affected users.
+    """
+    return settings.ME_CACHE_ENABLED and settings.ME_CACHE_TTL > 0 and get_jwt_verifier() is not None
+
+
+def _generation_key(user_id: str, section: MeSection) -> str:
+    return f"me-gen:{user_id}:{section}"
+
+
+async def cached_me_view(
+    user_id: Optional[UUID],
+    section: MeSection,
+    params: dict[str, Any],
+    loader: Callable[[], Awaitable[BaseModel]],
+) -> Any:
+    """
+    Return the cached response for (user, section, params) or build it.
+
+    loader() is awaited on a miss; its result is returned as is and stored
+    serialized. Hits return the equivalent JSON-compatible dict.
+    Without a user ID (verification disabled) the cache is bypassed.
+    Backend failures fall back to loader().
+    """
+    if user_id is None or not me_cache_active():
+        return await loader()
+
+    backend = get_cache_backend()
+    user_key = str(user_id)
+
+    try:
+        generation = await backend.get(_generation_key(user_key, section))
+        if generation is None:
+            generation = uuid.uuid4().hex
+            await backend.set(_generation_key(user_key, section), generation, settings.ME_CACHE_TTL * 10)
+
+        key = f"me:{user_key}:{section}:{generation}:" + json.dumps(params, sort_keys=True, default=str)
+        cached = await backend.get(key)
+    except Exception:
+        logger.warning("me cache read failed", exc_info=True)
+        return await loader()
+
+    if cached is not None:
+        return json.loads(cached)
+
+    data = await loader()
+
+    try:
+        await backend.set(key, data.model_dump_json(), settings.ME_CACHE_TTL)
+    except Exception:
+        logger.warning("me cache write failed", exc_info=True)
+
+    return data
+
+
+async def invalidate_me_views(user_id: Optional[UUID | str], *sections: MeSection) -> None:
+    """
+    Drop cached /me responses of a user for the given sections.
+
+    Never raises: the write that triggered it has already committed, and
+    ME_CACHE_TTL bounds staleness if the backend is unreachable.
+    """
+    if user_id is None or not me_cache_active():
+        return
+
+    backend = get_cache_backend()
+    for section in sections:
+        try:
+            await backend.set(_generation_key(str(user_id), section), uuid.uuid4().hex, settings.ME_CACHE_TTL * 10)
+        except Exception:
+            logger.warning("me cache invalidation failed", exc_info=True)
+
+
+async def invalidate_caller_me_views(access_token: str, *sections: MeSection) -> None:
+    """
+    Same as invalidate_me_views() for the user owning access_token.
+    """
+    verifier = get_jwt_verifier()
+    if verifier is None:
+        return
+
+    claims = verifier.peek(access_token)
+    if claims is not None:
+        await invalidate_me_views(claims.get("sub"), *sections)
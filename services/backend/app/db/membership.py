@@ -10,10 +10,11 @@ This module must not contain any business logic.
 """
 
 from uuid import UUID
-from app.db.client import get_supabase_client
+from app.db.client import get_user_client
+from app.db.me_cache import invalidate_me_views
 
 
-def change_tenant_member_role(
+async def change_tenant_member_role(
     *,
     access_token: str,
     tenant_id: UUID,
@@ -35,21 +36,16 @@ def change_tenant_member_role(
     from app.errors.db import map_db_error
 
     """
-    Obtain singleton Supabase client initialized with service role key.
-    """
-    client = get_supabase_client()
-
-    """
-    Attach user JWT to PostgREST request context.
+    Obtain PostgREST client scoped to the user JWT.
     This enables auth.uid() inside the RPC.
     """
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     """
     Execute RPC with raw parameters.
     """
     try:
-        result = (
+        result = await (
             client.rpc(
                 "change_tenant_member_role",
                 {
@@ -71,7 +67,7 @@ def change_tenant_member_role(
         raise domain_error
 
 
-def leave_tenant(
+async def leave_tenant(
     *,
     access_token: str,
     tenant_id: UUID,
@@ -92,21 +88,16 @@ def leave_tenant(
     from app.errors.db import map_db_error
 
     """
-    Obtain singleton Supabase client initialized with service role key.
-    """
-    client = get_supabase_client()
-
-    """
-    Attach user JWT to PostgREST request context.
+    Obtain PostgREST client scoped to the user JWT.
     This enables auth.uid() inside the RPC.
     """
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     """
     Execute RPC with raw parameters.
     """
     try:
-        result = (
+        result = await (
             client.rpc(
                 "leave_tenant",
                 {
@@ -115,6 +106,14 @@ def leave_tenant(
             )
             .execute()
         )
+
+        """
+        The user who lost the membership no longer sees the tenant, nor
+        the notes shared with them inside it.
+        """
+        for row in result.data or []:
+            await invalidate_me_views(row["user_id"], "tenants", "shared")
+
         return result
     
     except Exception as exc:
@@ -126,7 +125,7 @@ def leave_tenant(
         raise domain_error
 
 
-def remove_tenant_member(
+async def remove_tenant_member(
     *,
     access_token: str,
     tenant_id: UUID,
@@ -149,21 +148,16 @@ def remove_tenant_member(
     from app.errors.db import map_db_error
 
     """
-    Obtain singleton Supabase client initialized with service role key.
-    """
-    client = get_supabase_client()
-
-    """
-    Attach user JWT to PostgREST request context.
+    Obtain PostgREST client scoped to the user JWT.
     This enables auth.uid() inside the RPC.
     """
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     """
     Execute RPC with raw parameters.
     """
     try:
-        result = (
+        result = await (
             client.rpc(
                 "remove_tenant_member",
                 {
@@ -173,6 +167,14 @@ def remove_tenant_member(
             )
             .execute()
         )
+
+        """
+        The user who lost the membership no longer sees the tenant, nor
+        the notes shared with them inside it.
+        """
+        for row in result.data or []:
+            await invalidate_me_views(row["removed_user_id"], "tenants", "shared")
+
         return result
     
     except Exception as exc:
@@ -181,4 +183,31 @@ def remove_tenant_member(
         This will be caught by router and converted to HTTP error.
         """
         domain_error = map_db_error(exc)
-        raise domain_error
\ No newline at end of file
+        raise domain_error
+
+async def get_my_tenant_role(
+    *,
+    access_token: str,
+    tenant_id: UUID,
+):
+    """
+    Get the caller's role in a tenant.
+
+    Uses auth_user_tenant_roles() (migration 023), so it is a single
+    indexed lookup on tenant_members. Empty result means not a member.
+    """
+    from app.errors.db import map_db_error
+
+    client = get_user_client(access_token)
+
+    try:
+        result = await (
+            client.rpc("auth_user_tenant_roles", {})
+            .eq("ret_tenant_id", str(tenant_id))
+            .execute()
+        )
+        return result
+
+    except Exception as exc:
+        domain_error = map_db_error(exc)
+        raise domain_error
@@ -15,91 +15,116 @@ Invite operations:
 """
 
 from uuid import UUID
-from app.db.client import get_supabase_client
+from app.db.client import get_user_client
+from app.db.me_cache import invalidate_caller_me_views, invalidate_me_views, me_cache_active
+from app.db.pagination import apply_keyset
 from app.errors.db import map_db_error
 
 
-def request_join_tenant(access_token: str, tenant_id: UUID):
+async def _invalidate_request_user(client, request_id: UUID, *sections) -> None:
+    """
+    Invalidate cached /me views of the user a join request / invite is about.
+    The RPCs only return the request ID, so the user is looked up (RLS lets
+    the owner/admin who just acted on the request read it).
+    A failed lookup is ignored: the write has committed and ME_CACHE_TTL
+    bounds staleness.
+    """
+    if not me_cache_active():
+        return
+
+    try:
+        result = await client.table("tenant_join_requests").select("user_id").eq("id", str(request_id)).execute()
+    except Exception:
+        return
+
+    for row in result.data or []:
+        await invalidate_me_views(row["user_id"], *sections)
+
+
+async def request_join_tenant(access_token: str, tenant_id: UUID):
     """
     User requests to join a tenant.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "request_join_tenant",
             {"p_tenant_id": str(tenant_id)},
         ).execute()
 
+        await invalidate_caller_me_views(access_token, "requests")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def approve_join_request(access_token: str, request_id: UUID):
+async def approve_join_request(access_token: str, request_id: UUID):
     """
     Owner/admin approves a pending join request.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "approve_join_request",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await _invalidate_request_user(client, request_id, "requests", "tenants")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def reject_join_request(access_token: str, request_id: UUID):
+async def reject_join_request(access_token: str, request_id: UUID):
     """
     Owner/admin rejects a pending join request.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "reject_join_request",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await _invalidate_request_user(client, request_id, "requests")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def cancel_join_request(access_token: str, request_id: UUID):
+async def cancel_join_request(access_token: str, request_id: UUID):
     """
     User cancels their own pending join request.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "cancel_join_request",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await invalidate_caller_me_views(access_token, "requests")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def invite_user_to_tenant(access_token: str, tenant_id: UUID, target_user_id: UUID):
+async def invite_user_to_tenant(access_token: str, tenant_id: UUID, target_user_id: UUID):
     """
     Owner/admin invites a user to join a tenant.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "invite_user_to_tenant",
             {
                 "p_tenant_id": str(tenant_id),
@@ -107,61 +132,66 @@ def invite_user_to_tenant(access_token: str, tenant_id: UUID, target_user_id: UU
             },
         ).execute()
 
+        await invalidate_me_views(target_user_id, "invites")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def accept_invite(access_token: str, request_id: UUID):
+async def accept_invite(access_token: str, request_id: UUID):
     """
     User accepts a pending invite to join a tenant.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "accept_invite",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await invalidate_caller_me_views(access_token, "invites", "tenants")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def decline_invite(access_token: str, request_id: UUID):
+async def decline_invite(access_token: str, request_id: UUID):
     """
     User declines a pending invite to join a tenant.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "decline_invite",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await invalidate_caller_me_views(access_token, "invites")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def revoke_invite(access_token: str, request_id: UUID):
+async def revoke_invite(access_token: str, request_id: UUID):
     """
     Owner/admin revokes a pending invite (via cancel_invite RPC with invite direction).
     Note: DB function is cancel_invite but we use revoke as the domain operation name.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "cancel_invite",
             {"p_request_id": str(request_id)},
         ).execute()
 
+        await _invalidate_request_user(client, request_id, "invites")
+
         return result
     except Exception as e:
         raise map_db_error(e)
@@ -172,14 +202,14 @@ Query adapters - direct table access with RLS enforcement
 """
 
 
-def list_join_requests(access_token: str, tenant_id: UUID, status: str = None, limit: int = 20, offset: int = 0):
+async def list_join_requests(access_token: str, tenant_id: UUID, status: str = None, limit: int = 20, offset: int = 0, cursor: str = None):
     """
     List join requests for a tenant (direction='join').
     Enforced by RLS: only owner/admin can see, or requester/initiator.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
         query = client.table("tenant_join_requests").select(
             "id, tenant_id, user_id, initiated_by, direction, status, decided_by, decided_at, created_at"
@@ -188,20 +218,20 @@ def list_join_requests(access_token: str, tenant_id: UUID, status: str = None, l
         if status:
             query = query.eq("status", status)
 
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_invites(access_token: str, tenant_id: UUID, status: str = None, limit: int = 20, offset: int = 0):
+async def list_invites(access_token: str, tenant_id: UUID, status: str = None, limit: int = 20, offset: int = 0, cursor: str = None):
     """
     List invites for a tenant (direction='invite').
     Enforced by RLS: only owner/admin can see, or invited user.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
         query = client.table("tenant_join_requests").select(
             "id, tenant_id, user_id, initiated_by, direction, status, decided_by, decided_at, created_at"
@@ -210,38 +240,40 @@ def list_invites(access_token: str, tenant_id: UUID, status: str = None, limit:
         if status:
             query = query.eq("status", status)
 
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_my_invites(access_token: str, limit: int = 20, offset: int = 0):
+async def list_my_invites(access_token: str, limit: int = 20, offset: int = 0, cursor: str = None):
     """
     List all pending invites for the authenticated user.
     Enforced by RLS: can only see invites where user_id = auth.uid() and status='pending'.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("tenant_join_requests").select(
+        query = client.table("tenant_join_requests").select(
             "id, tenant_id, user_id, initiated_by, direction, status, decided_by, decided_at, created_at"
-        ).eq("direction", "invite").eq("status", "pending").order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        ).eq("direction", "invite").eq("status", "pending")
+
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_my_join_requests(access_token: str, status: str = None, limit: int = 20, offset: int = 0):
+async def list_my_join_requests(access_token: str, status: str = None, limit: int = 20, offset: int = 0, cursor: str = None):
     """
     List all join requests sent by the authenticated user (direction='join').
     Enforced by RLS: can only see own requests.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
         query = client.table("tenant_join_requests").select(
             "id, tenant_id, user_id, initiated_by, direction, status, decided_by, decided_at, created_at"
@@ -250,7 +282,7 @@ def list_my_join_requests(access_token: str, status: str = None, limit: int = 20
         if status:
             query = query.eq("status", status)
 
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
         return result
     except Exception as e:
         raise map_db_error(e)
@@ -5,123 +5,409 @@ Operations:
 - create_note() - Create a new note in a tenant
 - get_note() - Get a single note by ID
 - update_note() - Update note content (owner or write-share only)
+- update_note_if_match() - Update note content only at an expected version (via RPC)
+- apply_note_patch() - Apply splice operations against a base version (via RPC)
 - delete_note() - Soft-delete a note (owner-only, via RPC)
+- list_my_notes() - List notes the user can read
+- list_tenant_notes() - List notes in a tenant (count may come from cache)
+- search_notes() - Ranked full-text search over readable notes (via RPC)
+- create_notes_batch() - Create many notes in one multi-row insert
+- update_notes_batch() - Update many notes in one statement (via RPC)
+- get_notes_by_ids() - Fetch readable notes among a set of IDs
+- scan_tenant_note_texts() - Page through all active notes of a tenant (service role)
+
+Content writes and deletes invalidate the cached "shared" /me section of
+every sharee, in a background task: it embeds note titles and previews
+(GET /me/notes/shared).
 """
 
+import asyncio
+from typing import Literal, Optional
 from uuid import UUID
-from app.db.client import get_supabase_client
+from app.db.client import get_service_client, get_user_client
+from app.db.me_cache import invalidate_me_views, me_cache_active
+from app.db.counts import CountMode, count_method
+from app.db.membership import get_my_tenant_role
+from app.contracts.note import NoteView
+from app.db.pagination import apply_keyset
+from app.db.tags import normalize_tags
 from app.errors.db import map_db_error
 
 
-def create_note(access_token: str, tenant_id: UUID, content: str):
+"""
+Columns returned by note reads.
+Explicit so that large derived columns (search_vector) never leave the database.
+"""
+NOTE_COLUMNS = "id, tenant_id, owner_id, content, tags, version, created_at, updated_at, deleted_at, deleted_by"
+
+"""
+Columns returned by batch writes: the caller already has the content.
+"""
+NOTE_BATCH_COLUMNS = "id, tenant_id, owner_id, version, created_at, updated_at"
+
+"""
+Columns per list projection (contracts NoteView).
+"summary" reads the stored title / preview columns (migration 030)
+instead of content.
+"""
+NOTE_LIST_COLUMNS = {
+    "full": NOTE_COLUMNS,
+    "summary": "id, tenant_id, owner_id, title, preview, tags, created_at, updated_at",
+}
+
+
+"""
+Sharee invalidations in flight; holds references so tasks are not
+garbage-collected before they finish.
+"""
+_sharee_invalidations: set[asyncio.Task] = set()
+
+
+def _invalidate_sharees(client, note_ids: list[str]) -> None:
+    """
+    Invalidate the cached "shared" /me section of every user the notes are
+    shared with. RLS lets anyone who can write or delete a note read its
+    shares.
+
+    Runs as a background task: the note_shares lookup is a round trip the
+    write does not need to wait for. A failed lookup is ignored: the write
+    has committed and ME_CACHE_TTL bounds staleness.
+    """
+    if not note_ids or not me_cache_active():
+        return
+
+    task = asyncio.create_task(_invalidate_sharees_now(client, note_ids))
+    _sharee_invalidations.add(task)
+    task.add_done_callback(_sharee_invalidations.discard)
+
+
+async def _invalidate_sharees_now(client, note_ids: list[str]) -> None:
+    try:
+        result = await client.table("note_shares").select("user_id").in_("note_id", note_ids).execute()
+    except Exception:
+        return
+
+    for user_id in {row["user_id"] for row in result.data or []}:
+        await invalidate_me_views(user_id, "shared")
+
+
+def _returning(query, columns: str):
+    """
+    Restrict the representation returned by an insert / update to columns.
+    The client's write builders have no select(); PostgREST honours
+    ?select= on writes. Sets the builder's request params directly, so
+    postgrest is pinned in requirements.txt (tests/unit/test_note_returning.py).
+    """
+    query.request.params = query.request.params.set("select", columns.replace(" ", ""))
+    return query
+
+
+def _tag_array_literal(tags: list[str]) -> str:
+    """
+    Build a Postgres array literal for a tag filter.
+    Tags are normalized the same way as normalize_tags() in the database.
+    """
+    normalized = normalize_tags(tags)
+    return "{" + ",".join(f'"{t}"' for t in normalized) + "}"
+
+
+async def create_note(access_token: str, tenant_id: UUID, content: str):
     """
     Create a new note in a tenant.
     owner_id is automatically set to auth.uid() by database DEFAULT.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("notes").insert({
+        query = client.table("notes").insert({
             "tenant_id": str(tenant_id),
             "content": content,
-        }).execute()
+        })
+        result = await _returning(query, NOTE_COLUMNS).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def create_notes_batch(access_token: str, tenant_id: UUID, items: list[dict]):
+    """
+    Create many notes in a tenant with a single multi-row INSERT.
+    items: [{"content": str, "tags": list[str]}]; rows come back in input order,
+    with NOTE_BATCH_COLUMNS only.
+    RLS insert policy applies to every row, so the batch succeeds or fails as a whole.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        query = client.table("notes").insert([
+            {
+                "tenant_id": str(tenant_id),
+                "content": item["content"],
+                "tags": item.get("tags") or [],
+            }
+            for item in items
+        ])
+        result = await _returning(query, NOTE_BATCH_COLUMNS).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def update_notes_batch(access_token: str, items: list[dict]):
+    """
+    Update content of many notes in one statement.
+    items: [{"id": str, "content": str}]
+    RPC is SECURITY INVOKER: notes the caller cannot update are skipped,
+    only updated rows are returned, with NOTE_BATCH_COLUMNS only.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "update_notes_batch",
+            {"p_items": items},
+        ).select(NOTE_BATCH_COLUMNS).execute()
+
+        _invalidate_sharees(client, [row["id"] for row in result.data or []])
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def get_note(access_token: str, note_id: UUID):
+async def get_note(access_token: str, note_id: UUID):
     """
     Get a single note by ID.
     RLS enforces access control: user must own note, be tenant member, or have share.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("notes").select("*").eq("id", str(note_id)).limit(1).execute()
+        result = await client.table("notes").select(NOTE_COLUMNS).eq("id", str(note_id)).limit(1).execute()
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def update_note(access_token: str, note_id: UUID, content: str):
+async def update_note(access_token: str, note_id: UUID, content: str):
     """
     Update note content.
     RLS enforces access control: only owner or write-share users can update.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("notes").update({
+        query = client.table("notes").update({
             "content": content,
-        }).eq("id", str(note_id)).execute()
+        }).eq("id", str(note_id))
+        result = await _returning(query, NOTE_COLUMNS).execute()
+
+        _invalidate_sharees(client, [row["id"] for row in result.data or []])
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def update_note_if_match(access_token: str, note_id: UUID, content: str, expected_version: int):
+    """
+    Update note content only if the note is still at expected_version.
+    Compare and write happen in one statement inside the RPC.
+    Raises PreconditionFailed (DB0404) if the note changed, NotFound (DB0401)
+    if it is not visible, PermissionDenied (DB0405) without write access.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "update_note_if_match",
+            {
+                "p_note_id": str(note_id),
+                "p_content": content,
+                "p_expected_version": expected_version,
+            },
+        ).execute()
+
+        _invalidate_sharees(client, [row["id"] for row in result.data or []])
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def delete_note(access_token: str, note_id: UUID):
+async def apply_note_patch(access_token: str, note_id: UUID, base_version: int, ops: list[dict]):
+    """
+    Apply splice operations to a note at base_version.
+    ops: [{"start": int, "delete": int, "insert": str}], offsets in code points.
+    The RPC rebuilds the content and writes it conditionally on the version.
+    Raises PreconditionFailed (DB0404) on a base mismatch, InvalidArgument
+    (DB0406) for operations that do not fit the base content.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "apply_note_patch",
+            {
+                "p_note_id": str(note_id),
+                "p_base_version": base_version,
+                "p_ops": ops,
+            },
+        ).execute()
+
+        _invalidate_sharees(client, [row["id"] for row in result.data or []])
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def delete_note(access_token: str, note_id: UUID):
     """
     Soft-delete a note (owner-only, via RPC).
     RPC enforces owner-only access and soft-delete logic.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "delete_note",
             {"p_note_id": str(note_id)},
         ).execute()
 
+        if result.data:
+            _invalidate_sharees(client, [str(note_id)])
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
-def list_my_notes(access_token: str, limit: int = 20, offset: int = 0):
+async def list_my_notes(
+    access_token: str,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
+    view: NoteView = "full",
+):
     """
     List all notes the authenticated user owns or has access to (via share).
     RLS enforces access control: returns only notes user can read.
     Notes: filters out soft-deleted notes (deleted_at IS NOT NULL).
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
+    view selects the projection (see NOTE_LIST_COLUMNS).
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("notes").select("*", count="exact") \
-            .is_("deleted_at", "null") \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .offset(offset) \
-            .execute()
+        query = client.table("notes").select(NOTE_LIST_COLUMNS[view], count=count_method(count)) \
+            .is_("deleted_at", "null")
+
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_tenant_notes(access_token: str, tenant_id: UUID, limit: int = 20, offset: int = 0):
+async def list_tenant_notes(
+    access_token: str,
+    tenant_id: UUID,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
+    tags: Optional[list[str]] = None,
+    tag_mode: Literal["all", "any"] = "all",
+    view: NoteView = "full",
+):
     """
     List all notes in a specific tenant.
     RLS enforces access control: user must be tenant member.
     Notes: filters out soft-deleted notes (deleted_at IS NOT NULL).
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
+    view selects the projection (see NOTE_LIST_COLUMNS).
+
+    tags filters by tag: tag_mode="all" requires every tag (tags @> ...),
+    "any" requires at least one (tags && ...). Both use idx_notes_tenant_tags.
+
+    count="estimated" (without tags) gives tenant owners / admins, who see
+    every active note, the trigger-maintained tenant_stats.active_note_count;
+    other members, and tag-filtered lists, get the PostgREST estimate.
+    The role and the counter are read concurrently with the page.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("notes").select("*", count="exact") \
+        query = client.table("notes").select(NOTE_LIST_COLUMNS[view], count=count_method(count)) \
             .eq("tenant_id", str(tenant_id)) \
+            .is_("deleted_at", "null")
+
+        if tags:
+            operator = "cs" if tag_mode == "all" else "ov"
+            query = query.filter("tags", operator, _tag_array_literal(tags))
+
+        page = apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset).execute()
+
+        if count != "estimated" or tags:
+            return await page
+
+        stats = client.table("tenant_stats").select("active_note_count") \
+            .eq("tenant_id", str(tenant_id)) \
+            .limit(1) \
+            .execute()
+        result, role, stats = await asyncio.gather(
+            page,
+            get_my_tenant_role(access_token=access_token, tenant_id=tenant_id),
+            stats,
+        )
+
+        if role.data and role.data[0]["ret_role"] in ("owner", "admin") and stats.data:
+            result.count = stats.data[0]["active_note_count"]
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def search_notes(access_token: str, query: str, tenant_id: UUID = None, limit: int = 20, offset: int = 0):
+    """
+    Full-text search over notes the user can read.
+    RPC is SECURITY INVOKER: RLS (notes_select) scopes the matches.
+    Results are ranked by ts_rank_cd; returns up to limit + 1 rows.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "search_notes",
+            {
+                "p_query": query,
+                "p_tenant_id": str(tenant_id) if tenant_id else None,
+                "p_limit": limit + 1,
+                "p_offset": offset,
+            },
+        ).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def get_notes_by_ids(access_token: str, note_ids: list[str]):
+    """
+    Fetch active notes by ID.
+    RLS enforces access control: IDs the user cannot read are silently dropped.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.table("notes").select(NOTE_COLUMNS) \
+            .in_("id", note_ids) \
             .is_("deleted_at", "null") \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .offset(offset) \
             .execute()
 
         return result
@@ -129,4 +415,22 @@ def list_tenant_notes(access_token: str, tenant_id: UUID, limit: int = 20, offse
         raise map_db_error(e)
 
 
+async def scan_tenant_note_texts(tenant_id: UUID, limit: int = 1000, cursor: str = None):
+    """
+    Page through id/owner/content of every active note in a tenant.
+    Runs as service role (bypasses RLS): callers MUST NOT return these rows
+    to users without re-checking visibility.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
+    """
+    try:
+        client = get_service_client()
+
+        query = client.table("notes").select("id, owner_id, content, created_at") \
+            .eq("tenant_id", str(tenant_id)) \
+            .is_("deleted_at", "null")
+
+        result = await apply_keyset(query, cursor=cursor, key_column="id", limit=limit).execute()
 
+        return result
+    except Exception as e:
+        raise map_db_error(e)
@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination helpers for PostgREST list queries.
+
+Cursors are opaque to clients. Internally a cursor encodes the sort key
+of the last row of the previous page: (created_at, <tiebreaker column>).
+Pages are ordered by created_at DESC, tiebreaker DESC, so the next page
+is every row strictly "before" that pair. Backed by composite indexes,
+fetching page N costs the same as page 1.
+
+This module MUST NOT contain any business logic.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from app.errors.db import InvalidArgument
+
+
+def encode_cursor(created_at: str, key: str) -> str:
+    """
+    Build an opaque cursor from the sort key of a row.
+    """
+    raw = json.dumps([created_at, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _parse_uuid(value: str) -> str:
+    return str(uuid.UUID(value))
+
+
+def _parse_bigint(value: str) -> str:
+    if not value.isascii() or not value.isdigit():
+        raise ValueError
+    return str(int(value))
+
+
+"""
+Parsers for tiebreaker columns, keyed by column name. Each returns the
+canonical text form of a valid value and raises ValueError otherwise.
+Columns not listed here are uuids.
+"""
+_KEY_PARSERS: dict[str, Callable[[str], str]] = {
+    "revision": _parse_bigint,
+}
+
+
+def decode_cursor(cursor: str, key_column: str = "id") -> tuple[str, str]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Both values are parsed for their column type and returned re-serialized,
+    so they are safe to embed in a PostgREST filter.
+
+    Raises InvalidArgument if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, key = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(created_at, str) or not isinstance(key, str):
+            raise ValueError
+        parsed_at = datetime.fromisoformat(created_at)
+        parse_key = _KEY_PARSERS.get(key_column, _parse_uuid)
+        return parsed_at.isoformat(), parse_key(key)
+    except (ValueError, TypeError, AttributeError, UnicodeDecodeError):
+        raise InvalidArgument("Invalid pagination cursor")
+
+
+def apply_keyset(query: Any, *, cursor: Optional[str], key_column: str, limit: int, offset: int = 0) -> Any:
+    """
+    Apply keyset ordering, cursor filter and page size to a PostgREST query.
+
+    Fetches limit + 1 rows so split_page() can tell whether a next page exists.
+    offset is honoured only without a cursor (legacy clients).
+    """
+    query = query.order("created_at", desc=True).order(key_column, desc=True)
+
+    if cursor:
+        created_at, key = decode_cursor(cursor, key_column)
+        """
+        Values are double-quoted: timestamps contain PostgREST reserved chars.
+        decode_cursor has already normalized both, so no quote can leak in.
+        """
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",{key_column}.lt."{key}")'
+        )
+    elif offset:
+        query = query.offset(offset)
+
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Optional[list[dict]], limit: int, key_column: str) -> tuple[list[dict], Optional[str]]:
+    """
+    Trim the look-ahead row and build the cursor for the next page.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = rows or []
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last["created_at"], str(last[key_column]))
@@ -0,0 +1,64 @@
+"""
+Database adapters for note revision history (table note_revisions).
+
+Operations:
+- list_note_revisions() - Page through a note's revisions, newest first
+- get_revision_chain() - Rows needed to rebuild the note as of a version
+
+Revisions are written by a trigger on notes (migration 029); the API
+only reads them. RLS: visible to whoever can read the note.
+"""
+
+from uuid import UUID
+from app.db.client import get_user_client
+from app.db.pagination import apply_keyset
+from app.errors.db import map_db_error
+
+
+"""
+Maximum rows between two snapshots (1 snapshot + 31 deltas).
+Mirrors the chain limit in record_note_revision().
+"""
+REVISION_CHAIN_SPAN = 32
+
+REVISION_COLUMNS = "note_id, revision, kind, content_length, changed_by, created_at"
+
+
+async def list_note_revisions(access_token: str, note_id: UUID, limit: int = 20, offset: int = 0, cursor: str = None):
+    """
+    List revisions of a note (metadata only, no content).
+    """
+    try:
+        client = get_user_client(access_token)
+
+        query = client.table("note_revisions").select(REVISION_COLUMNS).eq("note_id", str(note_id))
+        query = apply_keyset(query, cursor=cursor, key_column="revision", limit=limit, offset=offset)
+        result = await query.execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def get_revision_chain(access_token: str, note_id: UUID, version: int):
+    """
+    Fetch the latest REVISION_CHAIN_SPAN revisions at or before version,
+    newest first. The chain always contains the snapshot the newest row
+    builds on.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await (
+            client.table("note_revisions")
+            .select(REVISION_COLUMNS + ", chain_length, content, delta_start, delta_delete, delta_insert")
+            .eq("note_id", str(note_id))
+            .lte("revision", version)
+            .order("revision", desc=True)
+            .limit(REVISION_CHAIN_SPAN)
+            .execute()
+        )
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
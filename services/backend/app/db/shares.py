@@ -5,15 +5,18 @@ Operations:
 - share_note() - Share a note or change permission (via RPC)
 - revoke_share() - Revoke share access (via RPC)
 - list_note_shares() - List all shares for a note
-- list_shared_with_me() - List all shares granted to the authenticated user
+- list_shared_with_me() - List notes shared with the authenticated user (with note summaries)
 """
 
 from uuid import UUID
-from app.db.client import get_supabase_client
+from app.db.client import get_user_client
+from app.db.counts import CountMode, count_method
+from app.db.me_cache import invalidate_me_views
+from app.db.pagination import apply_keyset
 from app.errors.db import map_db_error
 
 
-def share_note(access_token: str, note_id: UUID, target_user_id: UUID, permission: str):
+async def share_note(access_token: str, note_id: UUID, target_user_id: UUID, permission: str):
     """
     Share a note with another user (or change existing share permission).
     
@@ -26,10 +29,9 @@ def share_note(access_token: str, note_id: UUID, target_user_id: UUID, permissio
     - Audit log is written
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "change_note_share_permission",
             {
                 "p_note_id": str(note_id),
@@ -38,12 +40,14 @@ def share_note(access_token: str, note_id: UUID, target_user_id: UUID, permissio
             },
         ).execute()
 
+        await invalidate_me_views(target_user_id, "shared")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def revoke_share(access_token: str, note_id: UUID, target_user_id: UUID):
+async def revoke_share(access_token: str, note_id: UUID, target_user_id: UUID):
     """
     Revoke share access to a note.
     
@@ -54,10 +58,9 @@ def revoke_share(access_token: str, note_id: UUID, target_user_id: UUID):
     - Atomic operation: deletes note_shares record and writes audit log
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.rpc(
+        result = await client.rpc(
             "revoke_note_share",
             {
                 "p_note_id": str(note_id),
@@ -65,53 +68,70 @@ def revoke_share(access_token: str, note_id: UUID, target_user_id: UUID):
             },
         ).execute()
 
+        await invalidate_me_views(target_user_id, "shared")
+
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_note_shares(access_token: str, note_id: UUID, limit: int = 20, offset: int = 0):
+async def list_note_shares(access_token: str, note_id: UUID, limit: int = 20, offset: int = 0, cursor: str = None, count: CountMode = "exact"):
     """
     List all users who have access to a note.
     
     RLS enforces:
     - Caller must be note owner, tenant admin/owner, or be a sharee of the note
     - Returns note_shares records (user_id, permission, created_at)
+
+    Keyset paginated on (created_at, user_id); returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
+        client = get_user_client(access_token)
 
-        result = client.table("note_shares").select("note_id, user_id, permission, created_at", count="exact") \
-            .eq("note_id", str(note_id)) \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .offset(offset) \
-            .execute()
+        query = client.table("note_shares").select("note_id, user_id, permission, created_at", count=count_method(count)) \
+            .eq("note_id", str(note_id))
+
+        result = await apply_keyset(query, cursor=cursor, key_column="user_id", limit=limit, offset=offset).execute()
 
         return result
     except Exception as e:
         raise map_db_error(e)
 
 
-def list_shared_with_me(access_token: str, limit: int = 20, offset: int = 0):
+async def list_shared_with_me(
+    access_token: str,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
+):
     """
-    List all note shares granted to the authenticated user.
-    
-    Query: note_shares table only (RLS filters to user's shares).
-    RLS enforces:
-    - Returns only shares where user_id = auth.uid()
-    - Returns minimal share data (note_id, user_id, permission, created_at)
+    List notes shared with the authenticated user, with note summaries.
+
+    One embedded select instead of a share list plus one note read per share:
+    - notes!inner: summary columns (title / preview, migration 030); the
+      inner join drops shares whose note is deleted or no longer readable
+    - tenants: tenant name (null if the tenant is deleted)
+    - users via notes.owner_id: owner email (null if the owner is gone)
+
+    Reads the my_note_shares view (migration 031), which keeps only shares
+    granted to auth.uid(): note_shares RLS alone also lets note owners and
+    tenant admins see shares they granted to others.
+
+    Keyset paginated on (created_at, note_id) of the share, served by
+    idx_note_shares_user_keyset; returns up to limit + 1 rows.
     """
     try:
-        client = get_supabase_client()
-        client.postgrest.auth(access_token)
-
-        result = client.table("note_shares").select("note_id, user_id, permission, created_at", count="exact") \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .offset(offset) \
-            .execute()
+        client = get_user_client(access_token)
+
+        query = client.table("my_note_shares").select(
+            "note_id, user_id, permission, created_at, "
+            "notes!inner(tenant_id, owner_id, title, preview, updated_at, "
+            "tenants(name), owner:users!notes_owner_id_fkey(email))",
+            count=count_method(count),
+        )
+
+        result = await apply_keyset(query, cursor=cursor, key_column="note_id", limit=limit, offset=offset).execute()
 
         return result
     except Exception as e:
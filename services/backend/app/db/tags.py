@@ -0,0 +1,93 @@
+"""
+Database adapters for note tags.
+
+Operations:
+- add_note_tags() - Add tags to a note (write access, via RPC)
+- remove_note_tag() - Remove one tag from a note (write access, via RPC)
+- list_tenant_tags() - Tag facets (tag, note count) for a tenant (via RPC)
+
+normalize_tags() mirrors public.normalize_tags() so request input can be
+rejected per item before it reaches the database.
+"""
+
+import unicodedata
+from uuid import UUID
+from app.db.client import get_user_client
+from app.errors.db import InvalidArgument, map_db_error
+
+
+MAX_TAGS_PER_NOTE = 32
+MAX_TAG_LENGTH = 64
+
+
+def normalize_tags(tags: list[str]) -> list[str]:
+    """
+    Trim, lower-case, de-duplicate and sort tags.
+    Raises InvalidArgument for tags the database would reject (DB0601 / DB0603).
+
+    Like btrim(), only spaces are trimmed: other whitespace is kept, and
+    control characters (tab, newline, ...) are rejected as by [:cntrl:].
+    """
+    normalized = sorted({t.strip(" ").lower() for t in tags if t and t.strip(" ")})
+    for tag in normalized:
+        if len(tag) > MAX_TAG_LENGTH or any(ch in '",{}\\' or unicodedata.category(ch) == "Cc" for ch in tag):
+            raise InvalidArgument("Tag is too long or contains invalid characters")
+    if len(normalized) > MAX_TAGS_PER_NOTE:
+        raise InvalidArgument(f"A note can have at most {MAX_TAGS_PER_NOTE} tags")
+    return normalized
+
+
+async def add_note_tags(access_token: str, note_id: UUID, tags: list[str]):
+    """
+    Add tags to a note.
+    RPC normalizes tags, merges them with existing ones and enforces
+    write access (owner or write share) and the per-note tag limit.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "add_note_tags",
+            {"p_note_id": str(note_id), "p_tags": tags},
+        ).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def remove_note_tag(access_token: str, note_id: UUID, tag: str):
+    """
+    Remove a single tag from a note.
+    Removing a tag the note does not have is a no-op.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "remove_note_tag",
+            {"p_note_id": str(note_id), "p_tag": tag},
+        ).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
+
+
+async def list_tenant_tags(access_token: str, tenant_id: UUID, limit: int = 100):
+    """
+    List tag facets for a tenant, most used first.
+    Owners/admins read the incrementally maintained tenant_tag_counts;
+    members get counts over the notes they can read.
+    """
+    try:
+        client = get_user_client(access_token)
+
+        result = await client.rpc(
+            "tenant_tag_facets",
+            {"p_tenant_id": str(tenant_id), "p_limit": limit},
+        ).execute()
+
+        return result
+    except Exception as e:
+        raise map_db_error(e)
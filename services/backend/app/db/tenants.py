@@ -18,11 +18,14 @@ Constraints:
 """
 
 from uuid import UUID
-from app.db.client import get_supabase_client
+from app.db.client import get_user_client
+from app.db.counts import CountMode, count_method
+from app.db.me_cache import invalidate_caller_me_views, invalidate_me_views, me_cache_active
+from app.db.pagination import apply_keyset
 from dotenv import load_dotenv
 load_dotenv()
 
-def create_tenant(
+async def create_tenant(
     *,
     access_token: str,
     name: str,
@@ -40,21 +43,16 @@ def create_tenant(
     from app.errors.db import map_db_error
 
     """
-    Obtain singleton Supabase client initialized with service role key.
-    """
-    client = get_supabase_client()
-
-    """
-    Attach user JWT to PostgREST request context.
+    Obtain PostgREST client scoped to the user JWT.
     This enables auth.uid() inside the RPC.
     """
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     """
     Execute RPC with raw parameters.
     """
     try:
-        result = (
+        result = await (
             client.rpc(
                 "create_tenant",
                 {
@@ -63,6 +61,8 @@ def create_tenant(
             )
             .execute()
         )
+        await invalidate_caller_me_views(access_token, "tenants")
+
         return result
     
     except Exception as exc:
@@ -74,7 +74,7 @@ def create_tenant(
         raise domain_error
 
 
-def delete_tenant(
+async def delete_tenant(
     *,
     access_token: str,
     tenant_id: UUID,
@@ -95,21 +95,28 @@ def delete_tenant(
     from app.errors.db import map_db_error
 
     """
-    Obtain singleton Supabase client initialized with service role key.
+    Obtain PostgREST client scoped to the user JWT.
+    This enables auth.uid() inside the RPC.
     """
-    client = get_supabase_client()
+    client = get_user_client(access_token)
 
     """
-    Attach user JWT to PostgREST request context.
-    This enables auth.uid() inside the RPC.
+    Members lose the tenant with it; collect them first so their cached
+    /me views can be invalidated (only when that cache is active).
     """
-    client.postgrest.auth(access_token)
+    member_ids = []
+    if me_cache_active():
+        try:
+            members = await client.table("tenant_members").select("user_id").eq("tenant_id", str(tenant_id)).execute()
+            member_ids = [row["user_id"] for row in members.data or []]
+        except Exception:
+            member_ids = []
 
     """
     Execute RPC with raw parameters.
     """
     try:
-        result = (
+        result = await (
             client.rpc(
                 "delete_tenant",
                 {
@@ -118,6 +125,10 @@ def delete_tenant(
             )
             .execute()
         )
+
+        for user_id in member_ids:
+            await invalidate_me_views(user_id, "tenants", "shared")
+
         return result
     
     except Exception as exc:
@@ -128,17 +139,20 @@ def delete_tenant(
         domain_error = map_db_error(exc)
         raise domain_error
 
-def list_tenants(
+async def list_tenants(
     *,
     access_token: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
 ):
     """
     List all tenants the authenticated user belongs to.
     
     RLS enforces: user must be a member of the tenant.
     Returns list of tenant items.
+    Keyset paginated on (created_at, id); returns up to limit + 1 rows.
     """
     from app.errors.db import map_db_error
 
@@ -146,19 +160,17 @@ def list_tenants(
     Create new client with user-specific auth context.
     Each request gets its own client instance to avoid auth context collisions.
     """
-    client = get_supabase_client()
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     try:
         """
         Query tenants table.
         RLS ensures only tenants where the user is a member are visible.
         """
-        result = (
-            client.table("tenants")
-            .select("id, name, created_at", count="exact")
-            .limit(limit)
-            .offset(offset)
+        query = client.table("tenants").select("id, name, created_at", count=count_method(count))
+
+        result = await (
+            apply_keyset(query, cursor=cursor, key_column="id", limit=limit, offset=offset)
             .execute()
         )
         return result
@@ -168,7 +180,7 @@ def list_tenants(
         raise domain_error
 
 
-def get_tenant_details(
+async def get_tenant_details(
     *,
     access_token: str,
     tenant_id: UUID,
@@ -177,25 +189,21 @@ def get_tenant_details(
     Get detailed information about a specific tenant.
     
     RLS enforces: user must be a member of the tenant.
-    Returns tenant info with member count.
+    Returns tenant info with its tenant_stats row embedded (member and
+    note counts maintained by triggers, migration 032): a primary-key
+    lookup, no counting at read time.
     """
     from app.errors.db import map_db_error
 
     """
     Create new client with user-specific auth context.
     """
-    client = get_supabase_client()
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     try:
-        """
-        Query tenant with member count aggregation.
-        Note: May need to use RPC if member_count view doesn't exist.
-        For now, query tenant and let backend count if needed.
-        """
-        result = (
+        result = await (
             client.table("tenants")
-            .select("id, name, created_at")
+            .select("id, name, created_at, tenant_stats(member_count, active_note_count, last_activity_at)")
             .eq("id", str(tenant_id))
             .limit(1)
             .execute()
@@ -207,37 +215,41 @@ def get_tenant_details(
         raise domain_error
 
 
-def list_tenant_members(
+async def list_tenant_members(
     *,
     access_token: str,
     tenant_id: UUID,
     limit: int = 20,
     offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
 ):
     """
     List members of a specific tenant with their details.
     
     RLS enforces: user must be a member of the tenant.
     Returns list of tenant_members with user email info.
+    Keyset paginated on (created_at, user_id); returns up to limit + 1 rows.
     """
     from app.errors.db import map_db_error
 
     """
     Create new client with user-specific auth context.
     """
-    client = get_supabase_client()
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     try:
         """
         Query tenant_members joined with users table.
         """
-        result = (
+        query = (
             client.table("tenant_members")
-            .select("user_id, role, created_at, users(email)", count="exact")
+            .select("user_id, role, created_at, users(email)", count=count_method(count))
             .eq("tenant_id", str(tenant_id))
-            .limit(limit)
-            .offset(offset)
+        )
+
+        result = await (
+            apply_keyset(query, cursor=cursor, key_column="user_id", limit=limit, offset=offset)
             .execute()
         )
         return result
@@ -247,11 +259,13 @@ def list_tenant_members(
         raise domain_error
 
 
-def list_my_tenants(
+async def list_my_tenants(
     *,
     access_token: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
 ):
     """
     List all tenants the authenticated user is a member of.
@@ -259,6 +273,7 @@ def list_my_tenants(
     This query joins tenant_members with tenants to get tenant info for user.
     RLS enforces: implicit - only the authenticated user's own memberships.
     Returns tenant items with pagination.
+    Keyset paginated on membership (created_at, tenant_id); returns up to limit + 1 rows.
     """
     from app.errors.db import map_db_error
 
@@ -266,8 +281,7 @@ def list_my_tenants(
     Create new client with user-specific auth context.
     Each request gets its own client instance to avoid auth context collisions.
     """
-    client = get_supabase_client()
-    client.postgrest.auth(access_token)
+    client = get_user_client(access_token)
 
     try:
         """
@@ -276,11 +290,13 @@ def list_my_tenants(
         we get back all tenants they belong to with tenant metadata.
         RLS on tenant_members ensures only querying own memberships.
         """
-        result = (
+        query = (
             client.table("tenant_members")
-            .select("tenants(id, name, created_at)", count="exact")
-            .limit(limit)
-            .offset(offset)
+            .select("tenant_id, created_at, tenants(id, name, created_at)", count=count_method(count))
+        )
+
+        result = await (
+            apply_keyset(query, cursor=cursor, key_column="tenant_id", limit=limit, offset=offset)
             .execute()
         )
         return result
@@ -51,6 +51,28 @@ class NotFound(DomainError):
     code = "NOT_FOUND"
 
 
+class InvalidArgument(DomainError):
+    """
+    Raised when caller input is rejected before or by the database.
+    """
+    code = "INVALID_ARGUMENT"
+
+
+class PreconditionFailed(DomainError):
+    """
+    Raised when a conditional write finds the resource in another state.
+    """
+    code = "PRECONDITION_FAILED"
+
+
+class ServiceUnavailable(DomainError):
+    """
+    Raised when a feature depends on a backing service that is not
+    configured or not reachable.
+    """
+    code = "SERVICE_UNAVAILABLE"
+
+
 
 """
 Error code to domain error class mapping.
@@ -95,6 +117,9 @@ ERROR_CODE_MAP = {
     'DB0401': (NotFound, 'Note not found, deleted, or tenant is inactive'),
     'DB0402': (PermissionDenied, 'Only note owner can perform this action'),
     'DB0403': (NotFound, 'Note tenant is inactive or deleted'),
+    'DB0404': (PreconditionFailed, 'Note was modified since the given version'),
+    'DB0405': (PermissionDenied, 'Write access to the note is required'),
+    'DB0406': (InvalidArgument, 'Patch operations are invalid for the base content'),
     
     # SHARE ERRORS
     'DB0501': (DomainError, 'Cannot share note with yourself'),
@@ -103,6 +128,11 @@ ERROR_CODE_MAP = {
     'DB0504': (PermissionDenied, 'Only note owner can change share permissions'),
     'DB0505': (NotFound, 'Note not found or deleted'),
     'DB0506': (PermissionDenied, 'Caller is not a member of the note\'s tenant'),
+
+    # TAG ERRORS
+    'DB0601': (InvalidArgument, 'Tag is too long or contains invalid characters'),
+    'DB0602': (PermissionDenied, 'Write access to the note is required to change tags'),
+    'DB0603': (InvalidArgument, 'A note can have at most 32 tags'),
 }
 
 
@@ -142,6 +172,10 @@ def map_db_error(error: Exception) -> DomainError:
     3. Fall back to message-based heuristics if code not found
     """
 
+    # Already a domain error (e.g. raised while building the query)
+    if isinstance(error, DomainError):
+        return error
+
     # Try structured error code first
     error_code = _extract_error_code(error)
     
@@ -4,6 +4,9 @@ from app.errors.db import (
     PermissionDenied,
     InvariantViolated,
     NotFound,
+    InvalidArgument,
+    PreconditionFailed,
+    ServiceUnavailable,
 )
 
 def get_status_code_for_error(error: DomainError) -> int:
@@ -17,4 +20,10 @@ def get_status_code_for_error(error: DomainError) -> int:
         return status.HTTP_409_CONFLICT
     if isinstance(error, NotFound):
         return status.HTTP_404_NOT_FOUND
+    if isinstance(error, InvalidArgument):
+        return status.HTTP_400_BAD_REQUEST
+    if isinstance(error, PreconditionFailed):
+        return status.HTTP_412_PRECONDITION_FAILED
+    if isinstance(error, ServiceUnavailable):
+        return status.HTTP_503_SERVICE_UNAVAILABLE
     return status.HTTP_500_INTERNAL_SERVER_ERROR
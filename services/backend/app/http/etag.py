@@ -0,0 +1,100 @@
+"""
+ETags and conditional requests.
+
+- If-None-Match -> 304 Not Modified on reads
+- If-Match -> expected note version on writes (412 when stale)
+
+- Single notes get a strong ETag "v<version>". notes.version is bumped by
+  a trigger on every row update, so any change to content, tags or
+  deletion state produces a new tag, and If-Match maps back to a version.
+- List pages get a weak ETag from the max updated_at in the page plus the
+  page's IDs, total and next cursor, so rows entering or leaving the page
+  also change it.
+
+Responses carry "Cache-Control: private, no-cache": clients may keep a
+copy but must revalidate it, which is what makes If-None-Match useful.
+"""
+
+import hashlib
+import re
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+
+
+CACHE_CONTROL = "private, no-cache"
+
+_NOTE_ETAG = re.compile(r'^"v(\d+)(?:-[A-Za-z0-9_.]+)?"$')
+
+
+def _digest(*parts: Any) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(str(part).encode("utf-8"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()[:32]
+
+
+def note_etag(version: int, variant: str = "") -> str:
+    """
+    Strong ETag of a single note representation.
+    variant distinguishes representations of the same row (e.g. rendering).
+    """
+    return f'"v{version}-{variant}"' if variant else f'"v{version}"'
+
+
+def version_from_etag(etag: str) -> Optional[int]:
+    """
+    Note version carried by a strong note ETag, or None if it is not one.
+    Weak tags never match: If-Match uses strong comparison.
+    """
+    match = _NOTE_ETAG.match(etag.strip())
+    return int(match.group(1)) if match else None
+
+
+def list_etag(rows: Iterable[dict], *extra: Any, id_field: str = "id") -> str:
+    """
+    Weak ETag of a list page.
+    extra carries page-level values (total, next cursor, ...).
+    """
+    ids = []
+    max_updated_at = ""
+    for row in rows:
+        ids.append(row.get(id_field))
+        updated_at = row.get("updated_at") or ""
+        if updated_at > max_updated_at:
+            max_updated_at = updated_at
+    return f'W/"{_digest(max_updated_at, ",".join(map(str, ids)), *extra)}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match matches etag.
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+    """
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Attach validator headers to a 200 response.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Empty 304 response for a matching If-None-Match.
+    """
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,66 @@
+"""
+Server-side Markdown rendering for ?render=html.
+
+Output is safe to inject as HTML by construction:
+- raw HTML in notes is escaped, never passed through (html=False)
+- link / image URLs go through markdown-it's validator, which rejects
+  javascript:, vbscript:, file: and non-image data: URLs
+
+Rendered HTML is memoized in a bounded LRU keyed by the SHA-256 of the
+content, so identical content renders once across users and requests.
+Very large notes are rendered but not cached, to keep memory bounded.
+"""
+
+import hashlib
+
+from anyio import to_thread
+from markdown_it import MarkdownIt
+
+from app.cache.lru import TTLCache
+from app.config import settings
+
+
+_renderer = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+_rendered: TTLCache[str, str] = TTLCache(maxsize=settings.RENDER_CACHE_SIZE)
+
+
+def _content_key(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _render_uncached(contents: list[str]) -> list[str]:
+    return [_renderer.render(content) for content in contents]
+
+
+async def render_markdown_many(contents: list[str]) -> list[str]:
+    """
+    Render several notes, reusing cached HTML.
+
+    Cache misses are rendered together in one worker thread so large
+    notes do not block the event loop.
+    """
+    keys = [_content_key(content) for content in contents]
+    rendered = [_rendered.get(key) for key in keys]
+
+    missing = {}
+    for position, html in enumerate(rendered):
+        if html is None:
+            missing.setdefault(keys[position], contents[position])
+
+    if missing:
+        fresh = await to_thread.run_sync(_render_uncached, list(missing.values()))
+        fresh_by_key = dict(zip(missing, fresh))
+        for key, html in fresh_by_key.items():
+            if len(missing[key]) <= settings.RENDER_CACHE_MAX_CHARS:
+                _rendered.set(key, html)
+        rendered = [html if html is not None else fresh_by_key[key] for key, html in zip(keys, rendered)]
+
+    return rendered
+
+
+async def render_markdown(content: str) -> str:
+    """
+    Render one note (see render_markdown_many).
+    """
+    return (await render_markdown_many([content]))[0]
@@ -0,0 +1,21 @@
+"""
+Rendering of search snippets produced by the search_notes RPC.
+
+The database marks matches with control characters instead of HTML,
+because snippets are cut from raw user content. Escaping happens here,
+before the <mark> tags are added, so snippets are safe to inject as HTML.
+"""
+
+import html
+
+
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+
+def render_snippet(raw: str) -> str:
+    """
+    Escape a raw snippet and turn match delimiters into <mark> tags.
+    """
+    escaped = html.escape(raw or "", quote=False)
+    return escaped.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
@@ -0,0 +1,34 @@
+"""
+Server-sent events framing (text/event-stream).
+
+- sse_event(): one "event:" / "data:" frame; data is a single JSON line
+- sse_comment(): a comment line, ignored by EventSource; used as heartbeat
+  so proxies do not close idle streams
+- sse_retry(): reconnection delay hint for EventSource, in milliseconds
+
+SSE_HEADERS disable caching and proxy buffering (nginx buffers responses
+unless told otherwise, which would hold events back).
+"""
+
+import json
+from typing import Any
+
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def sse_comment(text: str) -> str:
+    return f": {text}\n\n"
+
+
+def sse_retry(milliseconds: int) -> str:
+    return f"retry: {milliseconds}\n\n"
@@ -1,3 +1,7 @@
+import logging
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 
@@ -11,8 +15,42 @@ from app.errors.http import get_status_code_for_error
 from app.http.response import ApiResponse, ErrorPayload
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.db.audit import ensure_audit_log_partitions
+from app.db.client import close_http_client
+from app.services.note_events import close_note_event_broker
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifecycle.
+
+    Startup:
+    - Size the threadpool left for sync work. Endpoints and adapters are
+      async, so it is no longer on the request path for DB calls.
+    - Create upcoming audit_logs partitions (for deployments without
+      pg_cron). Failure is logged, not fatal: the default partition
+      still accepts writes.
+
+    Shutdown:
+    - End event streams and close the LISTEN connection.
+    - Release pooled PostgREST connections.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_MAX_WORKERS
+    if settings.AUDIT_PARTITIONS_ON_STARTUP:
+        try:
+            await ensure_audit_log_partitions()
+        except Exception:
+            logger.warning("could not create audit_logs partitions", exc_info=True)
+    yield
+    await close_note_event_broker()
+    await close_http_client()
+
 
-app = FastAPI(title="AI Note Knowledge Backend")
+app = FastAPI(title="AI Note Knowledge Backend", lifespan=lifespan)
 
 
 app.add_middleware(
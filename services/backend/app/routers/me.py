@@ -6,21 +6,33 @@ Endpoints:
 - GET /me/invites/pending - List pending invites directed to authenticated user
 - GET /me/requests - List join requests sent by authenticated user
 - GET /me/notes/shared - List notes shared with authenticated user
+- GET /me/bootstrap - First pages of the above plus one tenant's details, members and notes, fetched concurrently
+
+Responses are cached per user (app/db/me_cache.py) when local JWT
+verification is enabled; write adapters invalidate the affected users.
 """
 
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from app.http.response import ApiResponse
-from app.auth.deps import get_current_access_token
+from app.auth.deps import get_current_access_token, get_current_user_id
+from app.db.me_cache import cached_me_view
 from app.db.membership_requests import list_my_invites, list_my_join_requests
 from app.db.shares import list_shared_with_me
 from app.db.tenants import list_my_tenants
+from app.db.pagination import split_page
+from app.services.bootstrap import gather_sections
+from app.routers.tenants import load_tenant_details, load_tenant_members, load_tenant_notes
+from app.db.counts import CountMode
 from app.contracts.request import (
     ListMyInvitesResponse,
     ListMyJoinRequestsResponse,
 )
+from app.contracts.me import BootstrapResponse
 from app.contracts.note import (
+    NoteView,
     ListSharedWithMeResponse,
+    SharedNoteItem,
 )
 from app.contracts.tenant import (
     ListTenantsResponse,
@@ -34,36 +46,33 @@ router = APIRouter(
 )
 
 
-@router.get("/tenants")
-def list_my_tenants_endpoint(
-    limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
-    access_token: str = Depends(get_current_access_token),
-):
+async def load_my_tenants(
+    access_token: str,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
+) -> ListTenantsResponse:
     """
-    List all tenants the authenticated user is a member of.
-
-    RLS enforces: user only sees tenants they are a member of.
-    Returns paginated list of tenants where user has membership.
-    
-    Access control:
-    - Authenticated user can see only their own tenants
-    - RLS filters tenant_members by auth.uid()
+    One page of GET /me/tenants (uncached).
     """
-    result = list_my_tenants(
+    result = await list_my_tenants(
         access_token=access_token,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count=count,
     )
-    
+    rows, next_cursor = split_page(result.data, limit, "tenant_id")
+
     """
     Extract tenants list from query result.
     Note: result.data contains tenant_members records with nested tenants info.
     We need to extract the tenant data from the nested structure.
     """
     tenants = []
-    if result.data:
-        for member in result.data:
+    if rows:
+        for member in rows:
             tenant_data = member.get("tenants")
             if tenant_data:
                 tenants.append(
@@ -73,20 +82,81 @@ def list_my_tenants_endpoint(
                         created_at=tenant_data["created_at"],
                     )
                 )
+
+    return ListTenantsResponse(
+        tenants=tenants,
+        total=result.count,
+        next_cursor=next_cursor,
+    )
+
+
+async def load_my_invites(
+    access_token: str,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+) -> ListMyInvitesResponse:
+    """
+    One page of GET /me/invites/pending (uncached).
+    """
+    result = await list_my_invites(access_token, limit, offset, cursor)
+    invites, next_cursor = split_page(result.data, limit, "id")
+    return ListMyInvitesResponse(invites=invites, next_cursor=next_cursor)
+
+
+async def load_my_join_requests(
+    access_token: str,
+    status: str = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+) -> ListMyJoinRequestsResponse:
+    """
+    One page of GET /me/requests (uncached).
+    """
+    result = await list_my_join_requests(access_token, status, limit, offset, cursor)
+    requests, next_cursor = split_page(result.data, limit, "id")
+    return ListMyJoinRequestsResponse(requests=requests, next_cursor=next_cursor)
+
+
+@router.get("/tenants")
+async def list_my_tenants_endpoint(
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    cursor: str = Query(default=None),
+    count: CountMode = Query(default="exact"),
+    access_token: str = Depends(get_current_access_token),
+    user_id: UUID = Depends(get_current_user_id),
+):
+    """
+    List all tenants the authenticated user is a member of.
+
+    RLS enforces: user only sees tenants they are a member of.
+    Returns paginated list of tenants where user has membership.
+    
+    Access control:
+    - Authenticated user can see only their own tenants
+    - RLS filters tenant_members by auth.uid()
+    """
+    
+    params = {"limit": limit, "offset": offset, "cursor": cursor, "count": count}
+    data = await cached_me_view(
+        user_id, "tenants", params,
+        lambda: load_my_tenants(access_token, limit, offset, cursor, count),
+    )
     
     return ApiResponse(
         success=True,
-        data=ListTenantsResponse(
-            tenants=tenants,
-            total=result.count,
-        ),
+        data=data,
     )
 
 @router.get("/invites/pending")
-def list_my_invites_endpoint(
+async def list_my_invites_endpoint(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
     access_token: str = Depends(get_current_access_token),
+    user_id: UUID = Depends(get_current_user_id),
 ):
     """
     List all pending invites directed to the authenticated user.
@@ -97,22 +167,25 @@ def list_my_invites_endpoint(
     - user_id = authenticated user's id
     """
     
-    result = list_my_invites(access_token, limit, offset)
-    
-    invites = result.data if result.data else []
+    data = await cached_me_view(
+        user_id, "invites", {"limit": limit, "offset": offset, "cursor": cursor},
+        lambda: load_my_invites(access_token, limit, offset, cursor),
+    )
     
     return ApiResponse(
         success=True,
-        data=ListMyInvitesResponse(invites=invites),
+        data=data,
     )
 
 
 @router.get("/requests")
-def list_my_join_requests_endpoint(
+async def list_my_join_requests_endpoint(
     status: str = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
     access_token: str = Depends(get_current_access_token),
+    user_id: UUID = Depends(get_current_user_id),
 ):
     """
     List all join requests sent by the authenticated user.
@@ -122,37 +195,126 @@ def list_my_join_requests_endpoint(
     - initiated_by = authenticated user's id
     """
     
-    result = list_my_join_requests(access_token, status, limit, offset)
-    
-    requests = result.data if result.data else []
+    params = {"status": status, "limit": limit, "offset": offset, "cursor": cursor}
+    data = await cached_me_view(
+        user_id, "requests", params,
+        lambda: load_my_join_requests(access_token, status, limit, offset, cursor),
+    )
     
     return ApiResponse(
         success=True,
-        data=ListMyJoinRequestsResponse(requests=requests),
+        data=data,
     )
 
 
 @router.get("/notes/shared")
-def list_shared_with_me_endpoint(
+async def list_shared_with_me_endpoint(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    count: CountMode = Query("exact"),
     access_token: str = Depends(get_current_access_token),
+    user_id: UUID = Depends(get_current_user_id),
 ):
     """
-    List all note shares granted to the authenticated user.
+    List all notes shared with the authenticated user.
+    
+    Each share carries a summary of its note (title, preview, tenant name,
+    owner email, updated_at), fetched in the same query, so clients need no
+    per-note requests.
+    
+    Note summaries are cached with the listing. Editing or deleting a
+    shared note invalidates the cached listing of every sharee right after
+    the write; ME_CACHE_TTL only bounds staleness if that invalidation
+    fails.
     
     Access control:
     - User can see only notes shared with them
     - RLS enforces access control at database level
-    - Returns share records (note_id, permission, created_at)
     """
     
-    result = list_shared_with_me(access_token, limit, offset)
+    async def load():
+        result = await list_shared_with_me(access_token, limit, offset, cursor, count)
+        rows, next_cursor = split_page(result.data, limit, "note_id")
+        shares = [
+            SharedNoteItem(
+                note_id=item["note_id"],
+                user_id=item["user_id"],
+                permission=item["permission"],
+                created_at=item["created_at"],
+                tenant_id=item["notes"]["tenant_id"],
+                tenant_name=(item["notes"].get("tenants") or {}).get("name"),
+                owner_id=item["notes"]["owner_id"],
+                owner_email=(item["notes"].get("owner") or {}).get("email"),
+                title=item["notes"]["title"],
+                preview=item["notes"]["preview"],
+                updated_at=item["notes"]["updated_at"],
+            )
+            for item in rows
+        ]
+        return ListSharedWithMeResponse(
+            shares=shares,
+            total=result.count,
+            next_cursor=next_cursor,
+        )
+    
+    params = {"limit": limit, "offset": offset, "cursor": cursor, "count": count}
+    data = await cached_me_view(user_id, "shared", params, load)
     
     return ApiResponse(
         success=True,
-        data=ListSharedWithMeResponse(
-            shares=result.data if result.data else [],
-            total=result.count,
+        data=data,
+    )
+
+
+@router.get("/bootstrap")
+async def bootstrap_endpoint(
+    tenant_id: UUID = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    notes_view: NoteView = Query("full"),
+    access_token: str = Depends(get_current_access_token),
+    user_id: UUID = Depends(get_current_user_id),
+):
+    """
+    Composite payload for the dashboard / workspace first paint.
+    
+    Sections (first page of each, limit items):
+    - tenants, invites, requests: as GET /me/tenants, /me/invites/pending, /me/requests
+    - with tenant_id: tenant, members, notes as GET /tenants/{tenant_id},
+      /tenants/{tenant_id}/members and /tenants/{tenant_id}/notes?view=notes_view
+    
+    All sections are queried concurrently, so latency is that of the
+    slowest one. Sections fail independently: a failed section is null and
+    reported in errors; the response is still 200.
+    
+    /me sections share the per-user cache with their own endpoints.
+    
+    Access control:
+    - Same as each underlying endpoint (RLS)
+    """
+    
+    sections = {
+        "tenants": lambda: cached_me_view(
+            user_id, "tenants", {"limit": limit, "offset": 0, "cursor": None, "count": "exact"},
+            lambda: load_my_tenants(access_token, limit),
+        ),
+        "invites": lambda: cached_me_view(
+            user_id, "invites", {"limit": limit, "offset": 0, "cursor": None},
+            lambda: load_my_invites(access_token, limit),
+        ),
+        "requests": lambda: cached_me_view(
+            user_id, "requests", {"status": None, "limit": limit, "offset": 0, "cursor": None},
+            lambda: load_my_join_requests(access_token, None, limit),
         ),
+    }
+    if tenant_id is not None:
+        sections["tenant"] = lambda: load_tenant_details(access_token, tenant_id)
+        sections["members"] = lambda: load_tenant_members(access_token, tenant_id, limit)
+        sections["notes"] = lambda: load_tenant_notes(access_token, tenant_id, limit, view=notes_view)
+    
+    data, errors = await gather_sections(sections)
+    
+    return ApiResponse(
+        success=True,
+        data=BootstrapResponse(**data, errors=errors),
     )
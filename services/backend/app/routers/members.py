@@ -15,7 +15,7 @@ router = APIRouter(
 
 
 @router.post("/{user_id}/role")
-def change_member_role(
+async def change_member_role(
     tenant_id: UUID,
     user_id: UUID,
     payload: ChangeMemberRolePayload,
@@ -41,7 +41,7 @@ def change_member_role(
     Execute RPC via database adapter.
     Router does not handle HTTP concerns.
     """
-    result = change_tenant_member_role(
+    result = await change_tenant_member_role(
         access_token=access_token,
         tenant_id=tenant_id,
         target_user_id=user_id,
@@ -58,7 +58,7 @@ def change_member_role(
 
 
 @router.delete("/{user_id}")
-def remove_member(
+async def remove_member(
     tenant_id: UUID,
     user_id: UUID,
     access_token: str = Depends(get_current_access_token),
@@ -78,7 +78,7 @@ def remove_member(
     Execute RPC via database adapter.
     Router does not handle business logic.
     """
-    result = remove_tenant_member(
+    result = await remove_tenant_member(
         access_token=access_token,
         tenant_id=tenant_id,
         target_user_id=user_id,
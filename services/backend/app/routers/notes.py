@@ -3,37 +3,69 @@ HTTP endpoints for note management.
 
 Endpoints:
 - GET /notes - List notes the authenticated user owns or has access to
-- GET /notes/{note_id} - Get a single note
-- PATCH /notes/{note_id} - Update note content
+- GET /notes/search - Full-text search over readable notes
+- PATCH /notes:batch - Update content of many notes at once
+- GET /notes/{note_id} - Get a single note (ETag / If-None-Match)
+- PATCH /notes/{note_id} - Update note content, full or by patch (If-Match for optimistic concurrency)
 - DELETE /notes/{note_id} - Soft-delete a note
 - POST /notes/{note_id}/shares - Share a note with another user
 - DELETE /notes/{note_id}/shares/{target_user_id} - Revoke share access
 - GET /notes/{note_id}/shares - List users who have access to a note
+- GET /notes/{note_id}/revisions - List recorded revisions of a note
+- GET /notes/{note_id}/revisions/{revision} - Note content as of a version
+- POST /notes/{note_id}/tags - Add tags to a note
+- DELETE /notes/{note_id}/tags/{tag} - Remove a tag from a note
 """
 
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
-from app.http.response import ApiResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Request, Response
+from app.http.response import ApiResponse, ErrorPayload
 from app.auth.deps import get_current_access_token
-from app.db.notes import get_note, update_note, delete_note, list_my_notes
+from app.db.notes import get_note, update_note, update_note_if_match, apply_note_patch, delete_note, list_my_notes, search_notes, update_notes_batch
 from app.db.shares import share_note, revoke_share, list_note_shares
+from app.db.tags import add_note_tags, remove_note_tag
+from app.db.revisions import list_note_revisions
+from app.db.counts import CountMode
+from app.db.pagination import split_page
+from app.http.etag import etag_matches, list_etag, not_modified, note_etag, set_etag, version_from_etag
+from app.http.markdown import render_markdown, render_markdown_many
+from app.http.snippets import render_snippet
+from app.services.semantic_index import get_semantic_index
+from app.services.note_revisions import get_note_revision
+from app.config import settings
 from app.errors.db import (
+    InvalidArgument,
     InvariantViolated,
     NotFound,
     PermissionDenied,
+    PreconditionFailed,
     )
 from app.contracts.note import (
+    NoteView,
+    RenderMode,
     GetNoteResponse,
     UpdateNotePayload,
     UpdateNoteResponse,
+    PatchNoteResponse,
     DeleteNoteResponse,
     ListMyNotesResponse,
     NoteItem,
+    NoteSummaryItem,
     ShareNotePayload,
     ShareNoteResponse,
     RevokeShareResponse,
     NoteShareItem,
     ListNoteSharesResponse,
+    NoteSearchItem,
+    SearchNotesResponse,
+    AddNoteTagsPayload,
+    NoteTagsResponse,
+    BatchUpdateNotesPayload,
+    BatchNoteItem,
+    BatchNotesResponse,
+    NoteRevisionItem,
+    ListNoteRevisionsResponse,
+    NoteRevisionResponse,
 )
 
 
@@ -44,20 +76,69 @@ router = APIRouter(
 
 
 @router.get("")
-def list_my_notes_endpoint(
+async def list_my_notes_endpoint(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    count: CountMode = Query("exact"),
+    render: RenderMode = Query(None),
+    view: NoteView = Query("full"),
     access_token: str = Depends(get_current_access_token),
 ):
     """
     List all notes the authenticated user owns or has access to via share.
     
+    With render=html each item also carries sanitized HTML rendered
+    server-side (cached by content hash).
+    
+    With view=summary items carry title and preview instead of content
+    (cannot be combined with render).
+    
+    Returns a weak ETag; If-None-Match with it yields 304 while the page
+    is unchanged.
+    
     Access control:
     - RLS enforces: returns only notes user can read
     - Filters out soft-deleted notes (deleted_at IS NOT NULL)
     """
     
-    result = list_my_notes(access_token, limit, offset)
+    if view == "summary" and render:
+        raise InvalidArgument("render cannot be combined with view=summary")
+    
+    result = await list_my_notes(access_token, limit, offset, cursor, count, view=view)
+    rows, next_cursor = split_page(result.data, limit, "id")
+    
+    etag = list_etag(rows, result.count, next_cursor, render, view)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    if view == "summary":
+        notes = [
+            NoteSummaryItem(
+                id=item["id"],
+                tenant_id=item["tenant_id"],
+                owner_id=item["owner_id"],
+                title=item["title"],
+                preview=item["preview"],
+                tags=item.get("tags") or [],
+                created_at=item["created_at"],
+                updated_at=item["updated_at"],
+            )
+            for item in rows
+        ]
+        return ApiResponse(
+            success=True,
+            data=ListMyNotesResponse(
+                notes=notes,
+                total=result.count,
+                next_cursor=next_cursor,
+            ),
+        )
+    
+    rendered = await render_markdown_many([item["content"] for item in rows]) if render == "html" else [None] * len(rows)
     
     notes = [
         NoteItem(
@@ -65,10 +146,12 @@ def list_my_notes_endpoint(
             tenant_id=item["tenant_id"],
             owner_id=item["owner_id"],
             content=item["content"],
+            tags=item.get("tags") or [],
+            html=html,
             created_at=item["created_at"],
             updated_at=item["updated_at"],
         )
-        for item in result.data
+        for item, html in zip(rows, rendered)
     ]
     
     return ApiResponse(
@@ -76,24 +159,161 @@ def list_my_notes_endpoint(
         data=ListMyNotesResponse(
             notes=notes,
             total=result.count,
+            next_cursor=next_cursor,
+        ),
+    )
+
+
+@router.patch(":batch")
+async def update_notes_batch_endpoint(
+    payload: BatchUpdateNotesPayload,
+    background_tasks: BackgroundTasks,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Update content of many notes in one database statement.
+    
+    results[i] reports the outcome of items[i]. Notes that do not exist,
+    are deleted, or that the caller cannot write are reported as NOT_FOUND.
+    
+    Access control:
+    - Same as PATCH /notes/{note_id}: owner or write-share, enforced by RLS per row
+    """
+    
+    items = payload.items
+    if not items:
+        raise InvalidArgument("Batch must contain at least one item")
+    if len(items) > settings.NOTES_BATCH_MAX_ITEMS:
+        raise InvalidArgument(f"Batch cannot exceed {settings.NOTES_BATCH_MAX_ITEMS} items")
+    
+    results: list[ApiResponse] = [None] * len(items)
+    first_position: dict[UUID, int] = {}
+    
+    for position, item in enumerate(items):
+        if item.id in first_position:
+            results[position] = ApiResponse(
+                success=False,
+                error=ErrorPayload(code=InvalidArgument.code, message="Duplicate note id in batch"),
+            )
+        else:
+            first_position[item.id] = position
+    
+    result = await update_notes_batch(
+        access_token,
+        [{"id": str(items[position].id), "content": items[position].content} for position in first_position.values()],
+    )
+    updated = {UUID(row["id"]): row for row in result.data or []}
+    
+    for note_id, position in first_position.items():
+        data = updated.get(note_id)
+        if data is None:
+            results[position] = ApiResponse(
+                success=False,
+                error=ErrorPayload(code=NotFound.code, message="Note not found or access denied"),
+            )
+            continue
+        
+        results[position] = ApiResponse(
+            success=True,
+            data=BatchNoteItem(
+                id=data["id"],
+                tenant_id=data["tenant_id"],
+                owner_id=data["owner_id"],
+                version=data["version"],
+                created_at=data["created_at"],
+                updated_at=data["updated_at"],
+            ),
+        )
+    
+    """
+    One embedding call for the whole batch, after the response is sent.
+    """
+    background_tasks.add_task(
+        get_semantic_index().index_notes,
+        [
+            (data["tenant_id"], data["id"], data["owner_id"], items[first_position[note_id]].content)
+            for note_id, data in updated.items()
+        ],
+    )
+    
+    failed = sum(1 for item in results if not item.success)
+    
+    return ApiResponse(
+        success=True,
+        data=BatchNotesResponse(
+            results=results,
+            succeeded=len(results) - failed,
+            failed=failed,
+        ),
+    )
+
+
+@router.get("/search")
+async def search_notes_endpoint(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Full-text search over every note the authenticated user can read.
+    
+    Query syntax (websearch): words, "quoted phrases", OR, -excluded.
+    Results are ranked by relevance with highlighted snippets. Only the
+    first 100,000 characters of a note are searchable.
+    
+    Access control:
+    - RLS enforces: only notes user can read are matched
+    - Soft-deleted notes are never returned
+    """
+    
+    result = await search_notes(access_token, q, None, limit, offset)
+    rows = result.data or []
+    
+    return ApiResponse(
+        success=True,
+        data=SearchNotesResponse(
+            results=[
+                NoteSearchItem(
+                    id=item["id"],
+                    tenant_id=item["tenant_id"],
+                    owner_id=item["owner_id"],
+                    rank=item["rank"],
+                    snippet=render_snippet(item["snippet"]),
+                    created_at=item["created_at"],
+                    updated_at=item["updated_at"],
+                )
+                for item in rows[:limit]
+            ],
+            next_offset=offset + limit if len(rows) > limit else None,
         ),
     )
 
 
 @router.get("/{note_id}")
-def get_note_endpoint(
+async def get_note_endpoint(
     note_id: UUID,
+    request: Request,
+    response: Response,
+    render: RenderMode = Query(None),
     access_token: str = Depends(get_current_access_token),
 ):
     """
     Get a single note by ID.
     
+    With render=html the response also carries sanitized HTML rendered
+    server-side (cached by content hash).
+    
+    Returns a strong ETag derived from the note version. With a matching
+    If-None-Match 304 is returned: the note is read once either way, but
+    unchanged content is neither rendered nor sent.
+    
     Access control:
     - User must own the note, be a tenant member, or have note share
     - RLS enforces access control at database level
     """
     
-    result = get_note(access_token, note_id)
+    result = await get_note(access_token, note_id)
     
     if not result.data:
         raise NotFound(
@@ -102,6 +322,10 @@ def get_note_endpoint(
         )
     
     data = result.data[0]
+    etag = note_etag(data["version"], render or "")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
     return ApiResponse(
         success=True,
@@ -110,6 +334,9 @@ def get_note_endpoint(
             tenant_id=data["tenant_id"],
             owner_id=data["owner_id"],
             content=data["content"],
+            tags=data.get("tags") or [],
+            html=await render_markdown(data["content"]) if render == "html" else None,
+            version=data["version"],
             created_at=data["created_at"],
             updated_at=data["updated_at"],
             deleted_at=data.get("deleted_at"),
@@ -119,13 +346,30 @@ def get_note_endpoint(
 
 
 @router.patch("/{note_id}")
-def update_note_endpoint(
+async def update_note_endpoint(
     note_id: UUID,
     payload: UpdateNotePayload,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    if_match: str = Header(None),
     access_token: str = Depends(get_current_access_token),
 ):
     """
-    Update note content.
+    Update note content, by full replacement or by patch.
+    
+    Full replacement ({"content": ...}):
+    - With If-Match (the note's ETag) the update only applies if nobody
+      changed the note since it was read; a stale ETag returns 412 (DB0404)
+    - Check and write are a single statement, no extra read
+    - Without If-Match (or with "*") the update is unconditional
+    
+    Patch ({"base_version": n, "ops": [{"start", "delete", "insert"}]}):
+    - Splice operations against version n (or the If-Match version),
+      applied atomically by the database; 412 if n is not current
+    - The response omits content (the client already has it)
+    
+    Both return the new ETag for the next conditional update. The semantic
+    index is refreshed after the response is sent.
     
     Access control:
     - Only note owner can update
@@ -133,9 +377,24 @@ def update_note_endpoint(
     - RLS enforces access control at database level
     """
     
+    expected_version = None
+    if if_match and if_match.strip() != "*":
+        expected_version = version_from_etag(if_match)
+        if expected_version is None:
+            raise PreconditionFailed("If-Match must be a single note ETag")
+    
+    if payload.ops is not None:
+        return await _patch_note(access_token, note_id, payload, expected_version, response)
+    
+    if payload.content is None:
+        raise InvalidArgument("Either content or ops is required")
+    
     content = payload.content
     
-    result = update_note(access_token, note_id, content)
+    if expected_version is not None:
+        result = await update_note_if_match(access_token, note_id, content, expected_version)
+    else:
+        result = await update_note(access_token, note_id, content)
     
     if not result.data or len(result.data) == 0:
         raise InvariantViolated(
@@ -145,6 +404,9 @@ def update_note_endpoint(
     
     data = result.data[0]
     
+    background_tasks.add_task(get_semantic_index().index_notes, [(data["tenant_id"], data["id"], data["owner_id"], data["content"])])
+    set_etag(response, note_etag(data["version"]))
+    
     return ApiResponse(
         success=True,
         data=UpdateNoteResponse(
@@ -152,6 +414,64 @@ def update_note_endpoint(
             tenant_id=data["tenant_id"],
             owner_id=data["owner_id"],
             content=data["content"],
+            version=data["version"],
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+        ),
+    )
+
+
+async def _patch_note(
+    access_token: str,
+    note_id: UUID,
+    payload: UpdateNotePayload,
+    expected_version: int | None,
+    response: Response,
+) -> ApiResponse:
+    if payload.content is not None:
+        raise InvalidArgument("Send either content or ops, not both")
+    
+    base_version = payload.base_version if payload.base_version is not None else expected_version
+    if base_version is None:
+        raise InvalidArgument("A patch requires base_version or If-Match")
+    if expected_version is not None and expected_version != base_version:
+        raise PreconditionFailed("If-Match does not match base_version")
+    
+    if not payload.ops:
+        raise InvalidArgument("Patch must contain at least one operation")
+    if len(payload.ops) > settings.NOTE_PATCH_MAX_OPS:
+        raise InvalidArgument(f"Patch cannot exceed {settings.NOTE_PATCH_MAX_OPS} operations")
+    
+    result = await apply_note_patch(
+        access_token,
+        note_id,
+        base_version,
+        [op.model_dump() for op in payload.ops],
+    )
+    
+    if not result.data:
+        raise InvariantViolated(
+            message="Patch note operation returned no data",
+            code="DB0403",
+        )
+    
+    data = result.data[0]
+    
+    """
+    Patches come in bursts while someone types: re-embed once per burst,
+    on a worker thread.
+    """
+    get_semantic_index().defer_index_note(data["tenant_id"], data["id"], data["owner_id"], data["content"])
+    set_etag(response, note_etag(data["version"]))
+    
+    return ApiResponse(
+        success=True,
+        data=PatchNoteResponse(
+            id=data["id"],
+            tenant_id=data["tenant_id"],
+            owner_id=data["owner_id"],
+            version=data["version"],
+            length=len(data["content"]),
             created_at=data["created_at"],
             updated_at=data["updated_at"],
         ),
@@ -159,7 +479,7 @@ def update_note_endpoint(
 
 
 @router.delete("/{note_id}")
-def delete_note_endpoint(
+async def delete_note_endpoint(
     note_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -173,7 +493,7 @@ def delete_note_endpoint(
     - Audit log is created
     """
     
-    result = delete_note(access_token, note_id)
+    result = await delete_note(access_token, note_id)
     
     if not result.data or len(result.data) == 0:
         raise InvariantViolated(
@@ -183,6 +503,8 @@ def delete_note_endpoint(
     
     data = result.data[0]
     
+    get_semantic_index().remove_note(note_id)
+    
     return ApiResponse(
         success=True,
         data=DeleteNoteResponse(
@@ -193,7 +515,7 @@ def delete_note_endpoint(
 
 
 @router.post("/{note_id}/shares")
-def share_note_endpoint(
+async def share_note_endpoint(
     note_id: UUID,
     payload: ShareNotePayload,
     access_token: str = Depends(get_current_access_token),
@@ -216,7 +538,7 @@ def share_note_endpoint(
     RPC call returns void, so result.data will be empty.
     If no error is raised, it means success.
     """
-    result = share_note(access_token, note_id, target_user_id, permission)
+    result = await share_note(access_token, note_id, target_user_id, permission)
     
     return ApiResponse(
         success=True,
@@ -230,7 +552,7 @@ def share_note_endpoint(
 
 
 @router.delete("/{note_id}/shares/{target_user_id}")
-def revoke_share_endpoint(
+async def revoke_share_endpoint(
     note_id: UUID,
     target_user_id: UUID,
     access_token: str = Depends(get_current_access_token),
@@ -245,7 +567,7 @@ def revoke_share_endpoint(
     - If any error occurs, RPC raises exception
     """
     
-    result = revoke_share(access_token, note_id, target_user_id)
+    result = await revoke_share(access_token, note_id, target_user_id)
     
     return ApiResponse(
         success=True,
@@ -258,10 +580,12 @@ def revoke_share_endpoint(
 
 
 @router.get("/{note_id}/shares")
-def list_note_shares_endpoint(
+async def list_note_shares_endpoint(
     note_id: UUID,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    count: CountMode = Query("exact"),
     access_token: str = Depends(get_current_access_token),
 ):
     """
@@ -274,7 +598,8 @@ def list_note_shares_endpoint(
     - RLS enforces access control at database level
     """
     
-    result = list_note_shares(access_token, note_id, limit, offset)
+    result = await list_note_shares(access_token, note_id, limit, offset, cursor, count)
+    rows, next_cursor = split_page(result.data, limit, "user_id")
     
     shares = [
         NoteShareItem(
@@ -283,7 +608,7 @@ def list_note_shares_endpoint(
             permission=item["permission"],
             created_at=item["created_at"],
         )
-        for item in result.data
+        for item in rows
     ]
     
     return ApiResponse(
@@ -291,5 +616,150 @@ def list_note_shares_endpoint(
         data=ListNoteSharesResponse(
             shares=shares,
             total=result.count,
+            next_cursor=next_cursor,
+        ),
+    )
+
+
+@router.get("/{note_id}/revisions")
+async def list_note_revisions_endpoint(
+    note_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    List recorded revisions of a note, newest first.
+    
+    A revision is recorded for every content change (tag-only changes
+    bump the version without one).
+    
+    Access control:
+    - Same as reading the note (RLS)
+    """
+    
+    result = await list_note_revisions(access_token, note_id, limit, offset, cursor)
+    rows, next_cursor = split_page(result.data, limit, "revision")
+    
+    return ApiResponse(
+        success=True,
+        data=ListNoteRevisionsResponse(
+            revisions=[
+                NoteRevisionItem(
+                    revision=item["revision"],
+                    kind=item["kind"],
+                    content_length=item["content_length"],
+                    changed_by=item.get("changed_by"),
+                    created_at=item["created_at"],
+                )
+                for item in rows
+            ],
+            next_cursor=next_cursor,
         ),
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/{note_id}/revisions/{revision}")
+async def get_note_revision_endpoint(
+    note_id: UUID,
+    revision: int,
+    response: Response,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Get the content of a note as of a version.
+    
+    Rebuilt from the nearest snapshot plus at most 31 deltas, read in a
+    single query. Any version can be requested: it resolves to the latest
+    recorded revision at or before it.
+    
+    Access control:
+    - Same as reading the note (RLS)
+    """
+    
+    row, content = await get_note_revision(access_token, note_id, revision)
+    
+    """
+    A recorded revision never changes: clients may cache it indefinitely.
+    A version past the latest revision may still resolve differently later.
+    """
+    if row["revision"] == revision:
+        response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    
+    return ApiResponse(
+        success=True,
+        data=NoteRevisionResponse(
+            note_id=row["note_id"],
+            revision=row["revision"],
+            content=content,
+            changed_by=row.get("changed_by"),
+            created_at=row["created_at"],
+        ),
+    )
+
+
+@router.post("/{note_id}/tags")
+async def add_note_tags_endpoint(
+    note_id: UUID,
+    payload: AddNoteTagsPayload,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Add tags to a note.
+    
+    Access control:
+    - Note owner or users with write share
+    - Caller must be a tenant member
+    - RPC enforces all rules (normalization, max 32 tags per note)
+    """
+    
+    result = await add_note_tags(access_token, note_id, payload.tags)
+    
+    if not result.data:
+        raise InvariantViolated(
+            message="Add tags operation returned no data",
+        )
+    
+    data = result.data[0]
+    
+    return ApiResponse(
+        success=True,
+        data=NoteTagsResponse(
+            note_id=data["note_id"],
+            tags=data["tags"],
+        ),
+    )
+
+
+@router.delete("/{note_id}/tags/{tag}")
+async def remove_note_tag_endpoint(
+    note_id: UUID,
+    tag: str,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Remove a tag from a note.
+    
+    Access control:
+    - Note owner or users with write share
+    - Caller must be a tenant member
+    - Removing a tag the note does not carry is a no-op
+    """
+    
+    result = await remove_note_tag(access_token, note_id, tag)
+    
+    if not result.data:
+        raise InvariantViolated(
+            message="Remove tag operation returned no data",
+        )
+    
+    data = result.data[0]
+    
+    return ApiResponse(
+        success=True,
+        data=NoteTagsResponse(
+            note_id=data["note_id"],
+            tags=data["tags"],
+        ),
+    )
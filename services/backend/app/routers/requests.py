@@ -42,7 +42,7 @@ router = APIRouter(
 
 
 @router.post("/{request_id}/approve")
-def approve_join_request_endpoint(
+async def approve_join_request_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -56,7 +56,7 @@ def approve_join_request_endpoint(
     - Membership is created on approval
     """
 
-    result = approve_join_request(access_token, request_id)
+    result = await approve_join_request(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -76,7 +76,7 @@ def approve_join_request_endpoint(
 
 
 @router.post("/{request_id}/reject")
-def reject_join_request_endpoint(
+async def reject_join_request_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -90,7 +90,7 @@ def reject_join_request_endpoint(
     - Membership is NOT created
     """
 
-    result = reject_join_request(access_token, request_id)
+    result = await reject_join_request(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -110,7 +110,7 @@ def reject_join_request_endpoint(
 
 
 @router.post("/{request_id}/cancel")
-def cancel_join_request_endpoint(
+async def cancel_join_request_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -123,7 +123,7 @@ def cancel_join_request_endpoint(
     - Request must be a 'join' request (not 'invite')
     """
 
-    result = cancel_join_request(access_token, request_id)
+    result = await cancel_join_request(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -143,7 +143,7 @@ def cancel_join_request_endpoint(
 
 
 @router.post("/{request_id}/accept")
-def accept_invite_endpoint(
+async def accept_invite_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -157,7 +157,7 @@ def accept_invite_endpoint(
     - Membership is created on acceptance
     """
 
-    result = accept_invite(access_token, request_id)
+    result = await accept_invite(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -177,7 +177,7 @@ def accept_invite_endpoint(
 
 
 @router.post("/{request_id}/decline")
-def decline_invite_endpoint(
+async def decline_invite_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -191,7 +191,7 @@ def decline_invite_endpoint(
     - Membership is NOT created
     """
 
-    result = decline_invite(access_token, request_id)
+    result = await decline_invite(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -211,7 +211,7 @@ def decline_invite_endpoint(
 
 
 @router.post("/{request_id}/revoke")
-def revoke_invite_endpoint(
+async def revoke_invite_endpoint(
     request_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -224,7 +224,7 @@ def revoke_invite_endpoint(
     - Request must be an 'invite' request (not 'join')
     """
 
-    result = revoke_invite(access_token, request_id)
+    result = await revoke_invite(access_token, request_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -1,13 +1,40 @@
+import asyncio
+from datetime import datetime
+from typing import List, Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
-from app.http.response import ApiResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.http.response import ApiResponse, ErrorPayload
 
 from app.auth.deps import get_current_access_token
-from app.db.membership import leave_tenant
+from app.auth.verifier import token_expiry
+from app.db.audit import list_tenant_audit_logs
+from app.db.events import get_tenant_event_scope
+from app.db.membership import get_my_tenant_role, leave_tenant
 from app.db.tenants import create_tenant, delete_tenant, list_tenants, get_tenant_details, list_tenant_members
 from app.db.membership_requests import request_join_tenant, invite_user_to_tenant, list_join_requests, list_invites
-from app.db.notes import create_note, list_tenant_notes
-from app.errors.db import DomainError, NotFound
+from app.db.notes import create_note, create_notes_batch, list_tenant_notes, search_notes
+from app.db.tags import list_tenant_tags, normalize_tags
+from app.services.semantic_index import get_semantic_index, semantic_search_notes
+from app.services.notes_export import ExportCompression, prepare_export
+from app.services.note_events import get_note_event_broker, stream_events
+from app.services.notes_import import (
+    ImportFormat,
+    ImportJob,
+    create_import_job,
+    detect_format,
+    get_import_job,
+    run_import,
+    spool_body,
+)
+from app.db.counts import CountMode
+from app.db.pagination import split_page
+from app.http.etag import etag_matches, list_etag, not_modified, set_etag
+from app.http.markdown import render_markdown_many
+from app.http.snippets import render_snippet
+from app.http.sse import SSE_HEADERS, SSE_MEDIA_TYPE
+from app.errors.db import DomainError, InvalidArgument, InvariantViolated, NotFound, PermissionDenied
+from app.config import settings
 from app.contracts.tenant import (
     CreateTenantPayload,
     CreateTenantResponse,
@@ -19,6 +46,7 @@ from app.contracts.tenant import (
     TenantItem,
     TenantMemberItem,
 )
+from app.contracts.audit import AuditLogItem, ListAuditLogsResponse
 from app.contracts.request import (
     RequestJoinTenantResponse,
     InviteUserToTenantPayload,
@@ -27,10 +55,24 @@ from app.contracts.request import (
     ListInvitesResponse,
 )
 from app.contracts.note import (
+    NoteView,
+    RenderMode,
     CreateNotePayload,
     CreateNoteResponse,
     ListTenantNotesResponse,
     NoteItem,
+    NoteSummaryItem,
+    NoteSearchItem,
+    SearchNotesResponse,
+    ListTenantTagsResponse,
+    TagFacetItem,
+    SemanticNoteItem,
+    SemanticSearchResponse,
+    BatchCreateNotesPayload,
+    BatchNoteItem,
+    BatchNotesResponse,
+    ImportErrorItem,
+    ImportJobResponse,
 )
 
 
@@ -41,7 +83,7 @@ router = APIRouter(
 
 
 @router.post("")
-def create_tenant_endpoint(
+async def create_tenant_endpoint(
     payload: CreateTenantPayload,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -64,7 +106,7 @@ def create_tenant_endpoint(
     Execute RPC via database adapter.
     Router does not handle business logic.
     """
-    result = create_tenant(
+    result = await create_tenant(
         access_token=access_token,
         name=name,
     )
@@ -77,7 +119,7 @@ def create_tenant_endpoint(
 
 
 @router.delete("/{tenant_id}")
-def delete_tenant_endpoint(
+async def delete_tenant_endpoint(
     tenant_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -97,7 +139,7 @@ def delete_tenant_endpoint(
     Execute RPC via database adapter.
     Router does not handle business logic.
     """
-    result = delete_tenant(
+    result = await delete_tenant(
         access_token=access_token,
         tenant_id=tenant_id,
     )
@@ -118,7 +160,7 @@ def delete_tenant_endpoint(
 
 
 @router.post("/{tenant_id}/leave")
-def leave_tenant_endpoint(
+async def leave_tenant_endpoint(
     tenant_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -138,7 +180,7 @@ def leave_tenant_endpoint(
     Execute RPC via database adapter.
     Router does not handle business logic.
     """
-    result = leave_tenant(
+    result = await leave_tenant(
         access_token=access_token,
         tenant_id=tenant_id,
     )
@@ -160,9 +202,11 @@ def leave_tenant_endpoint(
 
 
 @router.get("")
-def list_tenants_endpoint(
+async def list_tenants_endpoint(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str = Query(default=None),
+    count: CountMode = Query(default="exact"),
     access_token: str = Depends(get_current_access_token),
 ):
     """
@@ -171,11 +215,14 @@ def list_tenants_endpoint(
     RLS enforces: user only sees tenants they are a member of.
     Returns paginated list of tenants.
     """
-    result = list_tenants(
+    result = await list_tenants(
         access_token=access_token,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count=count,
     )
+    rows, next_cursor = split_page(result.data, limit, "id")
     
     """
     Extract tenants list and return with proper contract.
@@ -187,7 +234,7 @@ def list_tenants_endpoint(
             name=item["name"],
             created_at=item["created_at"],
         )
-        for item in result.data
+        for item in rows
     ]
     
     return ApiResponse(
@@ -195,22 +242,17 @@ def list_tenants_endpoint(
         data=ListTenantsResponse(
             tenants=tenants,
             total=result.count,
+            next_cursor=next_cursor,
         ),
     )
 
 
-@router.get("/{tenant_id}")
-def get_tenant_details_endpoint(
-    tenant_id: UUID,
-    access_token: str = Depends(get_current_access_token),
-):
+async def load_tenant_details(access_token: str, tenant_id: UUID) -> TenantDetailsResponse:
     """
-    Get detailed information about a specific tenant.
-
-    RLS enforces: user must be a member of the tenant.
-    Returns tenant info with metadata.
+    Tenant details as returned by GET /tenants/{tenant_id}.
+    Also used by GET /me/bootstrap.
     """
-    result = get_tenant_details(
+    result = await get_tenant_details(
         access_token=access_token,
         tenant_id=tenant_id,
     )
@@ -227,36 +269,62 @@ def get_tenant_details_endpoint(
     
     data = result.data[0]
     
-    return ApiResponse(
-        success=True,
-        data=TenantDetailsResponse(
-            id=data["id"],
-            name=data["name"],
-            created_at=data["created_at"],
-        ),
+    """
+    tenant_stats is one-to-one with tenants: PostgREST embeds an object
+    (or null if the row does not exist yet).
+    """
+    stats = data.get("tenant_stats") or {}
+    if isinstance(stats, list):
+        stats = stats[0] if stats else {}
+    
+    return TenantDetailsResponse(
+        id=data["id"],
+        name=data["name"],
+        created_at=data["created_at"],
+        member_count=stats.get("member_count", 0),
+        active_note_count=stats.get("active_note_count", 0),
+        last_activity_at=stats.get("last_activity_at"),
     )
 
 
-@router.get("/{tenant_id}/members")
-def list_tenant_members_endpoint(
+@router.get("/{tenant_id}")
+async def get_tenant_details_endpoint(
     tenant_id: UUID,
-    limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
     access_token: str = Depends(get_current_access_token),
 ):
     """
-    List members of a specific tenant.
+    Get detailed information about a specific tenant.
 
-    RLS enforces: user must be a member of the tenant to see its members.
-    Returns paginated list of members with their roles and emails.
+    RLS enforces: user must be a member of the tenant.
+    Returns tenant info with metadata.
     """
+    return ApiResponse(
+        success=True,
+        data=await load_tenant_details(access_token, tenant_id),
+    )
 
-    result = list_tenant_members(
+
+async def load_tenant_members(
+    access_token: str,
+    tenant_id: UUID,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = None,
+    count: CountMode = "exact",
+) -> ListTenantMembersResponse:
+    """
+    One page of GET /tenants/{tenant_id}/members.
+    Also used by GET /me/bootstrap.
+    """
+    result = await list_tenant_members(
         access_token=access_token,
         tenant_id=tenant_id,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count=count,
     )
+    rows, next_cursor = split_page(result.data, limit, "user_id")
     
     """
     Extract members and flatten nested user data.
@@ -269,20 +337,162 @@ def list_tenant_members_endpoint(
             role=item["role"],
             created_at=item["created_at"],
         )
-        for item in result.data
+        for item in rows
     ]
     
+    return ListTenantMembersResponse(
+        members=members,
+        total=result.count,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{tenant_id}/members")
+async def list_tenant_members_endpoint(
+    tenant_id: UUID,
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    cursor: str = Query(default=None),
+    count: CountMode = Query(default="exact"),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    List members of a specific tenant.
+
+    RLS enforces: user must be a member of the tenant to see its members.
+    Returns paginated list of members with their roles and emails.
+    """
+    return ApiResponse(
+        success=True,
+        data=await load_tenant_members(access_token, tenant_id, limit, offset, cursor, count),
+    )
+
+
+@router.get("/{tenant_id}/audit")
+async def list_tenant_audit_logs_endpoint(
+    tenant_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str = Query(None),
+    count: CountMode = Query("none"),
+    action: str = Query(None),
+    actor_id: UUID = Query(None),
+    target_type: str = Query(None),
+    target_id: UUID = Query(None),
+    since: datetime = Query(None),
+    until: datetime = Query(None),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    List the audit log of a tenant, newest first.
+    
+    Filtering:
+    - action: exact action, or a prefix such as "tenant.member.*"
+    - actor_id, target_type, target_id: exact match
+    - since / until: created_at window; narrowing it limits the monthly
+      partitions scanned
+    
+    count defaults to none: the log grows without bound.
+    
+    Access control:
+    - Tenant owners and admins only (403 otherwise)
+    - RLS enforces the same rule on audit_logs
+    """
+    
+    """
+    Role check and page query are independent: run them concurrently.
+    """
+    membership, result = await asyncio.gather(
+        get_my_tenant_role(access_token=access_token, tenant_id=tenant_id),
+        list_tenant_audit_logs(
+            access_token,
+            tenant_id,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+            action=action,
+            actor_id=actor_id,
+            target_type=target_type,
+            target_id=target_id,
+            since=since,
+            until=until,
+        ),
+    )
+    if not membership.data or membership.data[0]["ret_role"] not in ("owner", "admin"):
+        raise PermissionDenied("Only tenant owner or admin can read the audit log")
+    
+    rows, next_cursor = split_page(result.data, limit, "id")
+    
     return ApiResponse(
         success=True,
-        data=ListTenantMembersResponse(
-            members=members,
+        data=ListAuditLogsResponse(
+            entries=[AuditLogItem(**row) for row in rows],
             total=result.count,
+            next_cursor=next_cursor,
         ),
     )
 
 
+@router.get("/{tenant_id}/events")
+async def stream_tenant_events_endpoint(
+    tenant_id: UUID,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Stream changes to a tenant's notes, shares and members as server-sent
+    events.
+    
+    Events (data is JSON with IDs and versions, never note content):
+    - note.created / note.updated / note.deleted
+    - share.granted / share.changed / share.revoked
+    - member.role_changed (caller's own role)
+    - resync: events may have been missed (slow client or lost database
+      connection); refetch what is on screen
+    
+    The stream ends when the caller is removed from the tenant, and when
+    the access token expires: reconnect with a fresh token. Comment lines
+    are sent as heartbeat while idle.
+    
+    Access control:
+    - Caller must be a member of the tenant (403 otherwise)
+    - Only events about notes the caller can read are sent (same rules as
+      RLS on notes)
+    - 503 when event streams are not configured
+    """
+    
+    broker = get_note_event_broker()
+    
+    """
+    Subscribe before reading the scope: events committed in between are
+    held by the subscription instead of being lost.
+    """
+    subscription = await broker.subscribe(tenant_id)
+    try:
+        scope = await get_tenant_event_scope(access_token, tenant_id)
+        if not scope.data:
+            raise PermissionDenied("Only tenant members can subscribe to tenant events")
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+    
+    row = scope.data[0]
+    subscription.activate(
+        str(row["user_id"]),
+        row["role"],
+        (str(note_id) for note_id in row["shared_note_ids"] or []),
+    )
+    
+    """
+    The database accepted the token, so its exp can be trusted.
+    """
+    return StreamingResponse(
+        stream_events(broker, subscription, expires_at=token_expiry(access_token)),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
 @router.post("/{tenant_id}/requests/join")
-def request_join_endpoint(
+async def request_join_endpoint(
     tenant_id: UUID,
     access_token: str = Depends(get_current_access_token),
 ):
@@ -296,7 +506,7 @@ def request_join_endpoint(
     - Join/invite cannot both be pending
     """
 
-    result = request_join_tenant(access_token, tenant_id)
+    result = await request_join_tenant(access_token, tenant_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -316,7 +526,7 @@ def request_join_endpoint(
 
 
 @router.post("/{tenant_id}/invites")
-def invite_user_to_tenant_endpoint(
+async def invite_user_to_tenant_endpoint(
     tenant_id: UUID,
     payload: InviteUserToTenantPayload,
     access_token: str = Depends(get_current_access_token),
@@ -333,7 +543,7 @@ def invite_user_to_tenant_endpoint(
 
     target_user_id = payload.target_user_id
 
-    result = invite_user_to_tenant(access_token, tenant_id, target_user_id)
+    result = await invite_user_to_tenant(access_token, tenant_id, target_user_id)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -353,11 +563,12 @@ def invite_user_to_tenant_endpoint(
 
 
 @router.get("/{tenant_id}/requests/join")
-def list_join_requests_endpoint(
+async def list_join_requests_endpoint(
     tenant_id: UUID,
     status: str = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
     access_token: str = Depends(get_current_access_token),
 ):
     """
@@ -369,22 +580,23 @@ def list_join_requests_endpoint(
     - RLS enforces at database level
     """
     
-    result = list_join_requests(access_token, tenant_id, status, limit, offset)
+    result = await list_join_requests(access_token, tenant_id, status, limit, offset, cursor)
     
-    requests = result.data if result.data else []
+    requests, next_cursor = split_page(result.data, limit, "id")
     
     return ApiResponse(
         success=True,
-        data=ListJoinRequestsResponse(requests=requests),
+        data=ListJoinRequestsResponse(requests=requests, next_cursor=next_cursor),
     )
 
 
 @router.get("/{tenant_id}/invites")
-def list_invites_endpoint(
+async def list_invites_endpoint(
     tenant_id: UUID,
     status: str = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
     access_token: str = Depends(get_current_access_token),
 ):
     """
@@ -396,24 +608,26 @@ def list_invites_endpoint(
     - RLS enforces at database level
     """
     
-    result = list_invites(access_token, tenant_id, status, limit, offset)
+    result = await list_invites(access_token, tenant_id, status, limit, offset, cursor)
     
-    invites = result.data if result.data else []
+    invites, next_cursor = split_page(result.data, limit, "id")
     
     return ApiResponse(
         success=True,
-        data=ListInvitesResponse(invites=invites),
+        data=ListInvitesResponse(invites=invites, next_cursor=next_cursor),
     )
 
 
 @router.post("/{tenant_id}/notes")
-def create_note_endpoint(
+async def create_note_endpoint(
     tenant_id: UUID,
     payload: CreateNotePayload,
+    background_tasks: BackgroundTasks,
     access_token: str = Depends(get_current_access_token),
 ):
     """
     Create a new note in a tenant.
+    The semantic index is updated after the response is sent.
     
     Access control:
     - Caller must be authenticated
@@ -424,7 +638,7 @@ def create_note_endpoint(
     
     content = payload.content
     
-    result = create_note(access_token, tenant_id, content)
+    result = await create_note(access_token, tenant_id, content)
     
     if not result.data or len(result.data) == 0:
         raise DomainError(
@@ -434,6 +648,8 @@ def create_note_endpoint(
     
     data = result.data[0]
     
+    background_tasks.add_task(get_semantic_index().index_notes, [(data["tenant_id"], data["id"], data["owner_id"], data["content"])])
+    
     return ApiResponse(
         success=True,
         data=CreateNoteResponse(
@@ -446,40 +662,429 @@ def create_note_endpoint(
         ),
     )
 
-@router.get("/{tenant_id}/notes")
-def list_tenant_notes_endpoint(
+@router.post("/{tenant_id}/notes:batch")
+async def create_notes_batch_endpoint(
     tenant_id: UUID,
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    payload: BatchCreateNotesPayload,
+    background_tasks: BackgroundTasks,
     access_token: str = Depends(get_current_access_token),
 ):
     """
-    List all notes in a specific tenant.
+    Create many notes in a tenant with one multi-row insert.
+    
+    Items are validated individually; invalid items get an error result
+    and are not inserted. Valid items are inserted together.
     
     Access control:
-    - User must be a member of the tenant
-    - RLS enforces member requirement
-    - Filters out soft-deleted notes (deleted_at IS NOT NULL)
+    - Caller must be a member of the tenant (RLS, applies to the whole batch)
+    - Caller becomes owner of every created note
     """
     
-    result = list_tenant_notes(access_token, tenant_id, limit, offset)
+    items = payload.items
+    if not items:
+        raise InvalidArgument("Batch must contain at least one item")
+    if len(items) > settings.NOTES_BATCH_MAX_ITEMS:
+        raise InvalidArgument(f"Batch cannot exceed {settings.NOTES_BATCH_MAX_ITEMS} items")
+    
+    results: list[ApiResponse] = [None] * len(items)
+    valid: list[tuple[int, dict]] = []
+    
+    for position, item in enumerate(items):
+        try:
+            valid.append((position, {"content": item.content, "tags": normalize_tags(item.tags)}))
+        except InvalidArgument as exc:
+            results[position] = ApiResponse(
+                success=False,
+                error=ErrorPayload(code=exc.code, message=str(exc)),
+            )
+    
+    if valid:
+        result = await create_notes_batch(access_token, tenant_id, [row for _, row in valid])
+        rows = result.data or []
+        
+        if len(rows) != len(valid):
+            raise InvariantViolated("Batch insert returned an unexpected number of rows")
+        
+        for (position, _), data in zip(valid, rows):
+            results[position] = ApiResponse(
+                success=True,
+                data=BatchNoteItem(
+                    id=data["id"],
+                    tenant_id=data["tenant_id"],
+                    owner_id=data["owner_id"],
+                    version=data["version"],
+                    created_at=data["created_at"],
+                    updated_at=data["updated_at"],
+                ),
+            )
+        
+        """
+        One embedding call for the whole batch, after the response is sent.
+        """
+        background_tasks.add_task(
+            get_semantic_index().index_notes,
+            [(data["tenant_id"], data["id"], data["owner_id"], row["content"]) for (_, row), data in zip(valid, rows)],
+        )
+    
+    failed = sum(1 for item in results if not item.success)
+    
+    return ApiResponse(
+        success=True,
+        data=BatchNotesResponse(
+            results=results,
+            succeeded=len(results) - failed,
+            failed=failed,
+        ),
+    )
+
+def note_list_items(rows: list[dict], view: NoteView, rendered: list[str] | None = None) -> list:
+    """
+    Build list items for a page of note rows.
+    rendered holds the HTML of each row when ?render=html was asked for.
+    """
+    if view == "summary":
+        return [
+            NoteSummaryItem(
+                id=item["id"],
+                tenant_id=item["tenant_id"],
+                owner_id=item["owner_id"],
+                title=item["title"],
+                preview=item["preview"],
+                tags=item.get("tags") or [],
+                created_at=item["created_at"],
+                updated_at=item["updated_at"],
+            )
+            for item in rows
+        ]
     
-    notes = [
+    return [
         NoteItem(
             id=item["id"],
             tenant_id=item["tenant_id"],
             owner_id=item["owner_id"],
             content=item["content"],
+            tags=item.get("tags") or [],
+            html=rendered[position] if rendered else None,
             created_at=item["created_at"],
             updated_at=item["updated_at"],
         )
-        for item in result.data
+        for position, item in enumerate(rows)
     ]
+
+
+async def load_tenant_notes(
+    access_token: str,
+    tenant_id: UUID,
+    limit: int = 20,
+    count: CountMode = "exact",
+    view: NoteView = "full",
+) -> ListTenantNotesResponse:
+    """
+    First page of GET /tenants/{tenant_id}/notes (no filters, no rendering).
+    Used by GET /me/bootstrap.
+    """
+    result = await list_tenant_notes(access_token, tenant_id, limit, count=count, view=view)
+    rows, next_cursor = split_page(result.data, limit, "id")
+    
+    return ListTenantNotesResponse(
+        notes=note_list_items(rows, view),
+        total=result.count,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{tenant_id}/notes")
+async def list_tenant_notes_endpoint(
+    tenant_id: UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    count: CountMode = Query("exact"),
+    tags: List[str] = Query(None),
+    tag_mode: Literal["all", "any"] = Query("all"),
+    render: RenderMode = Query(None),
+    view: NoteView = Query("full"),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    List all notes in a specific tenant.
+    
+    Filtering:
+    - ?tags=a&tags=b with tag_mode=all returns notes carrying every tag
+    - tag_mode=any returns notes carrying at least one of them
+    
+    With render=html each item also carries sanitized HTML rendered
+    server-side (cached by content hash).
+    
+    With view=summary items carry title and preview instead of content
+    (cannot be combined with render).
+    
+    Returns a weak ETag; If-None-Match with it yields 304 while the page
+    is unchanged.
+    
+    Access control:
+    - User must be a member of the tenant
+    - RLS enforces member requirement
+    - Filters out soft-deleted notes (deleted_at IS NOT NULL)
+    """
+    
+    if view == "summary" and render:
+        raise InvalidArgument("render cannot be combined with view=summary")
+    
+    result = await list_tenant_notes(access_token, tenant_id, limit, offset, cursor, count, tags, tag_mode, view)
+    rows, next_cursor = split_page(result.data, limit, "id")
+    
+    etag = list_etag(rows, result.count, next_cursor, render, view)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    rendered = await render_markdown_many([item["content"] for item in rows]) if render == "html" else None
     
     return ApiResponse(
         success=True,
         data=ListTenantNotesResponse(
-            notes=notes,
+            notes=note_list_items(rows, view, rendered),
             total=result.count,
+            next_cursor=next_cursor,
+        ),
+    )
+
+
+@router.get("/{tenant_id}/notes/search")
+async def search_tenant_notes_endpoint(
+    tenant_id: UUID,
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Full-text search over notes in a specific tenant.
+    
+    Query syntax (websearch): words, "quoted phrases", OR, -excluded.
+    Results are ranked by relevance with highlighted snippets. Only the
+    first 100,000 characters of a note are searchable.
+    
+    Access control:
+    - RLS enforces: only notes user can read are matched
+    - Soft-deleted notes are never returned
+    """
+    
+    result = await search_notes(access_token, q, tenant_id, limit, offset)
+    rows = result.data or []
+    
+    return ApiResponse(
+        success=True,
+        data=SearchNotesResponse(
+            results=[
+                NoteSearchItem(
+                    id=item["id"],
+                    tenant_id=item["tenant_id"],
+                    owner_id=item["owner_id"],
+                    rank=item["rank"],
+                    snippet=render_snippet(item["snippet"]),
+                    created_at=item["created_at"],
+                    updated_at=item["updated_at"],
+                )
+                for item in rows[:limit]
+            ],
+            next_offset=offset + limit if len(rows) > limit else None,
+        ),
+    )
+
+
+@router.get("/{tenant_id}/tags")
+async def list_tenant_tags_endpoint(
+    tenant_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    List tag facets (tag, note count) for a tenant, most used first.
+    
+    Access control:
+    - Owner/admin: counts over all active notes, read from the
+      incrementally maintained per-tenant aggregate
+    - Member: counts over the notes they can read
+    - Non-member: empty list
+    """
+    
+    result = await list_tenant_tags(access_token, tenant_id, limit)
+    
+    return ApiResponse(
+        success=True,
+        data=ListTenantTagsResponse(
+            tags=[
+                TagFacetItem(tag=item["tag"], note_count=item["note_count"])
+                for item in result.data or []
+            ],
         ),
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/{tenant_id}/notes/semantic")
+async def semantic_search_tenant_notes_endpoint(
+    tenant_id: UUID,
+    q: str = Query(..., min_length=1, max_length=2000),
+    k: int = Query(10, ge=1, le=50),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Meaning-based search over notes in a specific tenant.
+    
+    Ranks notes by cosine similarity between embeddings of the query and
+    each note, computed by an in-process per-tenant index.
+    
+    Access control:
+    - Caller must be a member of the tenant
+    - Notes are ranked only among those the caller can read (all notes
+      for tenant owners/admins, own and shared notes for members)
+    - Hits are re-read under the caller's token, so RLS has the last word
+    """
+    
+    hits = await semantic_search_notes(access_token, tenant_id, q, k)
+    
+    return ApiResponse(
+        success=True,
+        data=SemanticSearchResponse(
+            results=[
+                SemanticNoteItem(
+                    id=item["id"],
+                    tenant_id=item["tenant_id"],
+                    owner_id=item["owner_id"],
+                    content=item["content"],
+                    tags=item.get("tags") or [],
+                    score=score,
+                    created_at=item["created_at"],
+                    updated_at=item["updated_at"],
+                )
+                for item, score in hits
+            ],
+        ),
+    )
+
+
+@router.get("/{tenant_id}/notes/export")
+async def export_tenant_notes_endpoint(
+    tenant_id: UUID,
+    compression: ExportCompression = Query("none"),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Stream every note of a tenant the caller can read as NDJSON.
+    
+    One JSON object per line, newest first. With compression=gzip the
+    body is a .ndjson.gz file. Notes are read in keyset chunks without
+    counting, so memory use does not grow with tenant size.
+    
+    Access control:
+    - Caller must be a member of the tenant
+    - RLS enforces which notes are exported
+    """
+    
+    body = await prepare_export(
+        access_token,
+        tenant_id,
+        chunk_size=settings.EXPORT_CHUNK_SIZE,
+        chunk_max_bytes=settings.EXPORT_CHUNK_MAX_BYTES,
+        compression=compression,
+    )
+    
+    filename = f"notes-{tenant_id}.ndjson" + (".gz" if compression == "gzip" else "")
+    
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if compression == "gzip" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _import_job_response(job: ImportJob) -> ImportJobResponse:
+    return ImportJobResponse(
+        job_id=job.id,
+        tenant_id=job.tenant_id,
+        format=job.format,
+        status=job.status,
+        processed=job.processed,
+        imported=job.imported,
+        failed=job.failed,
+        errors=[ImportErrorItem(**error) for error in job.errors],
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/{tenant_id}/notes/import", status_code=202)
+async def import_tenant_notes_endpoint(
+    tenant_id: UUID,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: ImportFormat = Query(None),
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Bulk-import notes into a tenant from the raw request body.
+    
+    Accepted bodies (chosen by ?format= or Content-Type):
+    - application/x-ndjson: one {"content": ..., "tags": [...]} per line
+      (the export format is accepted as is)
+    - application/zip: every .md file becomes a note; tags may be set in
+      a front matter block
+    
+    The body is spooled as it arrives, then parsed and inserted in
+    bounded batches by a background job. Returns 202 with the job;
+    poll GET /tenants/{tenant_id}/notes/import/{job_id} for progress.
+    
+    Access control:
+    - Caller must be a member of the tenant
+    - Caller becomes owner of every imported note
+    """
+    
+    import_format = detect_format(request.headers.get("content-type"), format)
+    
+    membership = await get_my_tenant_role(access_token=access_token, tenant_id=tenant_id)
+    if not membership.data:
+        raise PermissionDenied("Caller is not a member of this tenant")
+    
+    body = await spool_body(request.stream())
+    
+    job = create_import_job(tenant_id, import_format)
+    background_tasks.add_task(run_import, job, access_token, body)
+    
+    return ApiResponse(
+        success=True,
+        data=_import_job_response(job),
+    )
+
+
+@router.get("/{tenant_id}/notes/import/{job_id}")
+async def get_import_job_endpoint(
+    tenant_id: UUID,
+    job_id: str,
+    access_token: str = Depends(get_current_access_token),
+):
+    """
+    Get progress of a bulk import job.
+    
+    Jobs are tracked by the worker that accepted the upload and expire
+    IMPORT_JOB_TTL seconds after they finish.
+    
+    Access control:
+    - Caller must be a member of the tenant the job imports into
+    """
+    
+    job = get_import_job(job_id)
+    if job is None or job.tenant_id != str(tenant_id):
+        raise NotFound("Import job not found")
+    
+    membership = await get_my_tenant_role(access_token=access_token, tenant_id=tenant_id)
+    if not membership.data:
+        raise PermissionDenied("Caller is not a member of this tenant")
+    
+    return ApiResponse(
+        success=True,
+        data=_import_job_response(job),
+    )
@@ -0,0 +1,59 @@
+"""
+Concurrent fan-out of independent reads (GET /me/bootstrap).
+
+All sections are awaited together, so a response costs the slowest read
+instead of the sum of them. Sections fail independently: a failure or a
+timeout is reported for that section only and the others are returned.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from app.config import settings
+from app.errors.db import DomainError
+from app.http.response import ErrorPayload
+
+
+SectionLoader = Callable[[], Awaitable[Any]]
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_section(loader: SectionLoader) -> Any:
+    return await asyncio.wait_for(loader(), timeout=settings.BOOTSTRAP_SECTION_TIMEOUT)
+
+
+def _section_error(name: str, error: Exception) -> ErrorPayload:
+    if isinstance(error, DomainError):
+        return ErrorPayload(code=error.code, message=str(error))
+    if isinstance(error, asyncio.TimeoutError):
+        return ErrorPayload(code="TIMEOUT", message=f"Section '{name}' timed out")
+
+    logger.error("bootstrap section %s failed", name, exc_info=error)
+    return ErrorPayload(code="DOMAIN_ERROR", message=f"Section '{name}' failed")
+
+
+async def gather_sections(loaders: dict[str, SectionLoader]) -> tuple[dict[str, Any], dict[str, ErrorPayload]]:
+    """
+    Run every loader concurrently.
+
+    Returns (data, errors), both keyed by section name; each section is in
+    exactly one of them. Cancellation of the request is not swallowed.
+    """
+    results = await asyncio.gather(
+        *(_run_section(loader) for loader in loaders.values()),
+        return_exceptions=True,
+    )
+
+    data: dict[str, Any] = {}
+    errors: dict[str, ErrorPayload] = {}
+    for name, result in zip(loaders, results):
+        if isinstance(result, Exception):
+            errors[name] = _section_error(name, result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            data[name] = result
+
+    return data, errors
@@ -0,0 +1,91 @@
+"""
+Text embedding for semantic note search.
+
+Responsibilities:
+- Define the Embedder interface used by the semantic index
+- Provide a deterministic, CPU-only default embedder (no model, no network)
+
+HashingEmbedder uses feature hashing over character n-grams: every n-gram
+is hashed into one of `dim` buckets with a random sign, counts are damped
+with log1p and the vector is L2-normalized, so a dot product is a cosine
+similarity. It captures lexical overlap and morphology (shared stems,
+typos) rather than deep meaning; a model-backed embedder can replace it
+behind the same interface.
+"""
+
+import re
+from typing import Protocol, Sequence
+
+import numpy as np
+
+
+class Embedder(Protocol):
+    """
+    Turns texts into L2-normalized float32 vectors of a fixed dimension.
+    """
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Return an array of shape (len(texts), dim).
+        """
+        ...
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+"""
+Multiplier of the polynomial n-gram hash (FNV prime, fits in uint32).
+Fixed, so vectors are identical across processes and restarts.
+"""
+_PRIME = np.uint64(16777619)
+_MASK = np.uint64(0xFFFFFFFF)
+
+
+class HashingEmbedder:
+    """
+    Deterministic hashed character n-gram embedder.
+
+    Hashing is vectorized per text with NumPy: code points are combined into
+    rolling n-gram hashes and accumulated with bincount, so embedding a
+    note costs microseconds and needs no vocabulary.
+    """
+
+    def __init__(self, dim: int = 256, ngram_sizes: Sequence[int] = (3, 4, 5)):
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            out[row] = self._embed_one(text)
+        return out
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        normalized = " " + _WHITESPACE.sub(" ", (text or "").lower()).strip() + " "
+        codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for n in self.ngram_sizes:
+            if len(codes) < n:
+                continue
+
+            """
+            Polynomial hash of every n-gram at once:
+            h = ((c0 * P + c1) * P + c2) ... mod 2^32
+            """
+            hashes = np.full(len(codes) - n + 1, np.uint64(n), dtype=np.uint64)
+            for offset in range(n):
+                hashes = ((hashes * _PRIME) + codes[offset:len(codes) - n + 1 + offset]) & _MASK
+
+            buckets = (hashes % np.uint64(self.dim)).astype(np.intp)
+            signs = np.where(hashes & np.uint64(1 << 31), -1.0, 1.0)
+            vector += np.bincount(buckets, weights=signs, minlength=self.dim).astype(np.float32)
+
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
@@ -0,0 +1,333 @@
+"""
+In-process fan-out of tenant change events (GET /tenants/{tenant_id}/events).
+
+One LISTEN connection per worker on the note_events channel (migration
+035) feeds every event stream served by that worker:
+- events are routed by tenant_id to that tenant's subscriptions only
+- each subscription filters by visibility (notes_select rules) with the
+  scope loaded when it opened; share and member events keep it current,
+  and member.removed ends the stream
+- a subscription is registered before its scope is loaded: events that
+  arrive in between are held and replayed once the scope is known, so
+  nothing committed while the stream opens is lost
+- streams end when the caller's access token expires; the client
+  reconnects with a fresh one
+- slow consumers never block the listener: a full queue drops its
+  backlog and gets a "resync" event (the client refetches)
+- events sent while the connection was down are lost, so after a
+  reconnect every subscription gets "resync" too
+
+The connection is opened with the first subscription and re-established
+with EVENTS_RECONNECT_DELAY between attempts. Requires the optional
+`asyncpg` package and DATABASE_URL.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Iterable, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.errors.db import ServiceUnavailable
+from app.http.sse import sse_comment, sse_event, sse_retry
+
+
+CHANNEL = "note_events"
+
+"""
+Seconds a new subscription waits for the listener before giving up.
+"""
+CONNECT_TIMEOUT = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class TenantSubscription:
+    """
+    One stream's view of a tenant's events.
+    get() returns None once the subscription is closed.
+
+    Until activate() provides the caller's scope, events are held (up to
+    EVENTS_QUEUE_SIZE, then a resync replaces them).
+    """
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self.user_id: Optional[str] = None
+        self.role: Optional[str] = None
+        self.shared_note_ids: set[str] = set()
+        self.closed = False
+        self._held: Optional[list[dict[str, Any]]] = []
+        self._held_overflow = False
+        self._queue: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def activate(self, user_id: str, role: str, shared_note_ids: Iterable[str]) -> None:
+        """
+        Set the caller's scope and replay the events held so far.
+        Replaying events already reflected in the scope is harmless: share
+        updates are idempotent and note events only prompt a refetch.
+        """
+        self.user_id = user_id
+        self.role = role
+        self.shared_note_ids = set(shared_note_ids)
+
+        held, self._held = self._held or [], None
+        if self._held_overflow:
+            self.resync()
+            return
+        for event in held:
+            self.offer(event)
+
+    def _can_see_note(self, event: dict[str, Any]) -> bool:
+        return (
+            self.role in ("owner", "admin")
+            or event.get("owner_id") == self.user_id
+            or event.get("note_id") in self.shared_note_ids
+        )
+
+    def offer(self, event: dict[str, Any]) -> None:
+        """
+        Update the scope from event, then queue it if visible. Never blocks.
+        """
+        if self.closed:
+            return
+
+        if self._held is not None:
+            if len(self._held) < settings.EVENTS_QUEUE_SIZE:
+                self._held.append(event)
+            else:
+                self._held_overflow = True
+            return
+
+        kind = event.get("type", "")
+
+        if kind.startswith("member."):
+            if event.get("user_id") != self.user_id:
+                return
+            if kind == "member.removed":
+                self.close()
+                return
+            self.role = event.get("role") or self.role
+            self._put(event)
+            return
+
+        if kind.startswith("share.") and event.get("user_id") == self.user_id:
+            if kind == "share.revoked":
+                self.shared_note_ids.discard(event.get("note_id"))
+            else:
+                self.shared_note_ids.add(event.get("note_id"))
+            self._put(event)
+            return
+
+        if self._can_see_note(event):
+            self._put(event)
+
+    def resync(self) -> None:
+        """
+        Replace the backlog with a single "resync" event.
+        """
+        if self.closed:
+            return
+        self._clear()
+        self._queue.put_nowait({"type": "resync", "tenant_id": self.tenant_id})
+
+    def close(self) -> None:
+        """
+        End the stream after the events already queued.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self._queue.full():
+            self._clear()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Optional[dict[str, Any]]:
+        return await self._queue.get()
+
+    def _put(self, event: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.resync()
+
+    def _clear(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+class NoteEventBroker:
+    """
+    Single LISTEN connection fanned out to in-process subscriptions.
+    """
+
+    def __init__(self, dsn: str, asyncpg_module: Any):
+        self._dsn = dsn
+        self._asyncpg = asyncpg_module
+        self._subscriptions: dict[str, set[TenantSubscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    async def subscribe(self, tenant_id: UUID) -> TenantSubscription:
+        """
+        Register a subscription once the listener is connected.
+        It holds events until TenantSubscription.activate() is called.
+        Raises ServiceUnavailable if it cannot connect in time.
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ServiceUnavailable("Event stream is temporarily unavailable")
+
+        subscription = TenantSubscription(str(tenant_id))
+        self._subscriptions.setdefault(subscription.tenant_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TenantSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.tenant_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.tenant_id]
+
+    def _dispatch(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("ignoring malformed note event: %r", payload)
+            return
+
+        for subscription in list(self._subscriptions.get(event.get("tenant_id"), ())):
+            subscription.offer(event)
+
+    async def _listen(self) -> None:
+        """
+        Keep one LISTEN connection alive until cancelled.
+        Idle connections are probed every EVENTS_HEARTBEAT_INTERVAL so a
+        silently dropped connection is noticed.
+        """
+        reconnecting = False
+        while True:
+            connection = None
+            try:
+                connection = await self._asyncpg.connect(self._dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _connection: lost.set())
+                await connection.add_listener(CHANNEL, self._dispatch)
+
+                if reconnecting:
+                    for subscriptions in self._subscriptions.values():
+                        for subscription in subscriptions:
+                            subscription.resync()
+                self._connected.set()
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=settings.EVENTS_HEARTBEAT_INTERVAL)
+                    except asyncio.TimeoutError:
+                        await connection.execute("select 1")
+                logger.warning("note events connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("note events listener failed", exc_info=True)
+            finally:
+                self._connected.clear()
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            reconnecting = True
+            await asyncio.sleep(settings.EVENTS_RECONNECT_DELAY)
+
+    async def close(self) -> None:
+        """
+        Stop listening and end every stream.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions.clear()
+
+
+async def stream_events(
+    broker: NoteEventBroker,
+    subscription: TenantSubscription,
+    expires_at: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    SSE body for one subscription.
+    A comment is sent after EVENTS_HEARTBEAT_INTERVAL seconds without
+    events. Ends when the subscription is closed or at expires_at (epoch
+    seconds, the access token's exp); the subscription is always
+    released, including when the client disconnects (the response
+    cancels this generator).
+    """
+    try:
+        yield sse_retry(int(settings.EVENTS_RECONNECT_DELAY * 1000))
+        while True:
+            timeout = settings.EVENTS_HEARTBEAT_INTERVAL
+            if expires_at is not None:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    return
+                timeout = min(timeout, remaining)
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if expires_at is None or time.time() < expires_at:
+                    yield sse_comment("ping")
+                continue
+            if event is None:
+                return
+            yield sse_event(event["type"], event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+_broker: Optional[NoteEventBroker] = None
+
+
+def get_note_event_broker() -> NoteEventBroker:
+    """
+    Process-wide broker. Raises ServiceUnavailable when streams are not
+    configured (DATABASE_URL unset or asyncpg missing).
+    """
+    global _broker
+    if _broker is None:
+        if not settings.DATABASE_URL:
+            raise ServiceUnavailable("Event streams are not configured")
+        try:
+            import asyncpg
+        except ImportError:
+            raise ServiceUnavailable("Event streams require the 'asyncpg' package")
+        _broker = NoteEventBroker(settings.DATABASE_URL, asyncpg)
+    return _broker
+
+
+def override_note_event_broker(broker: Optional[NoteEventBroker]) -> None:
+    """
+    Replace the process-wide broker (tests, alternative transports).
+    """
+    global _broker
+    _broker = broker
+
+
+async def close_note_event_broker() -> None:
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
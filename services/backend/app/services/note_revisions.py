@@ -0,0 +1,49 @@
+"""
+Reconstruction of past note contents from revision delta chains.
+
+A revision is either a full snapshot or one splice (start, delete,
+insert) against the previous revision. Rebuilding version N reads one
+chain (snapshot + at most 31 deltas) in a single query and replays it,
+so the work is bounded whatever the length of the history.
+"""
+
+from uuid import UUID
+
+from app.db.revisions import get_revision_chain
+from app.errors.db import InvariantViolated, NotFound
+
+
+def replay_chain(rows: list[dict]) -> str:
+    """
+    Rebuild the content of rows[0] from a chain ordered newest first.
+    Offsets are code points, as in the database (Python str slicing).
+    """
+    for depth, row in enumerate(rows):
+        if row["kind"] == "snapshot":
+            break
+    else:
+        raise InvariantViolated("Revision chain has no snapshot")
+
+    parts = rows[depth]["content"]
+    for row in reversed(rows[:depth]):
+        start, delete = row["delta_start"], row["delta_delete"]
+        parts = parts[:start] + row["delta_insert"] + parts[start + delete:]
+
+    if len(parts) != rows[0]["content_length"]:
+        raise InvariantViolated("Revision chain does not rebuild to the recorded length")
+    return parts
+
+
+async def get_note_revision(access_token: str, note_id: UUID, version: int) -> tuple[dict, str]:
+    """
+    Return (revision row, content) of the note as of version.
+
+    Raises NotFound if the note is not readable or has no revision at or
+    before version (history starts when the revision trigger was installed).
+    """
+    result = await get_revision_chain(access_token, note_id, version)
+    rows = result.data or []
+    if not rows:
+        raise NotFound("Revision not found or access denied")
+
+    return rows[0], replay_chain(rows)
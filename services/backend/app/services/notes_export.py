@@ -0,0 +1,133 @@
+"""
+Streaming export of a tenant's notes as NDJSON.
+
+Responsibilities:
+- Walk the tenant's notes with the keyset cursor, one chunk at a time
+- Serialize each note as one JSON line, optionally gzip-compressed
+- Hold at most one chunk in memory, whatever the tenant size
+
+Chunks are bounded by row count and by bytes: output is split into
+pieces of about chunk_max_bytes of note content, and the next page size
+is derived from the average note size seen so far. Serialization and
+compression run on a worker thread, one piece at a time, never on the
+event loop.
+
+The first chunk is fetched before streaming starts (prepare_export), so
+auth / RLS errors still produce a normal error response instead of a
+truncated 200 body.
+"""
+
+import json
+import zlib
+from typing import AsyncIterator, Iterator, Literal, Optional
+from uuid import UUID
+
+from anyio import to_thread
+
+from app.db.membership import get_my_tenant_role
+from app.db.notes import list_tenant_notes
+from app.db.pagination import split_page
+from app.errors.db import PermissionDenied
+
+
+ExportCompression = Literal["none", "gzip"]
+
+EXPORT_FIELDS = ("id", "tenant_id", "owner_id", "content", "tags", "created_at", "updated_at")
+
+
+def _to_line(row: dict) -> bytes:
+    record = {field: row.get(field) for field in EXPORT_FIELDS}
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _row_size(row: dict) -> int:
+    """
+    Rough serialized size of a row: its content dominates.
+    """
+    return len(row.get("content") or "") + 256
+
+
+def _split_by_size(rows: list[dict], max_bytes: int) -> Iterator[list[dict]]:
+    """
+    Group consecutive rows into pieces of about max_bytes (at least one row).
+    """
+    piece, size = [], 0
+    for row in rows:
+        if piece and size + _row_size(row) > max_bytes:
+            yield piece
+            piece, size = [], 0
+        piece.append(row)
+        size += _row_size(row)
+    if piece:
+        yield piece
+
+
+class _ChunkEncoder:
+    """
+    Serializes pieces of rows to NDJSON, optionally into a single gzip
+    member (wbits=31). Each piece is sync-flushed so clients receive data
+    as it is produced. Used from one thread at a time.
+    """
+
+    def __init__(self, compression: ExportCompression):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compression == "gzip" else None
+
+    def encode(self, rows: list[dict]) -> bytes:
+        data = b"".join(_to_line(row) for row in rows)
+        if self._compressor is None:
+            return data
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._compressor is None:
+            return b""
+        return self._compressor.flush()
+
+
+async def _fetch_chunk(access_token: str, tenant_id: UUID, chunk_size: int, cursor: Optional[str]):
+    result = await list_tenant_notes(access_token, tenant_id, limit=chunk_size, cursor=cursor, count="none")
+    return split_page(result.data, chunk_size, "id")
+
+
+async def prepare_export(
+    access_token: str,
+    tenant_id: UUID,
+    *,
+    chunk_size: int,
+    chunk_max_bytes: int,
+    compression: ExportCompression = "none",
+) -> AsyncIterator[bytes]:
+    """
+    Check access, fetch the first chunk and return the body iterator.
+
+    Raises PermissionDenied if the caller is not a member of the tenant.
+    """
+    membership = await get_my_tenant_role(access_token=access_token, tenant_id=tenant_id)
+    if not membership.data:
+        raise PermissionDenied("Caller is not a member of this tenant")
+
+    first_rows, next_cursor = await _fetch_chunk(access_token, tenant_id, chunk_size, None)
+    encoder = _ChunkEncoder(compression)
+
+    async def body() -> AsyncIterator[bytes]:
+        rows, cursor = first_rows, next_cursor
+        seen_rows, seen_bytes = 0, 0
+        while True:
+            for piece in _split_by_size(rows, chunk_max_bytes):
+                yield await to_thread.run_sync(encoder.encode, piece)
+
+            seen_rows += len(rows)
+            seen_bytes += sum(_row_size(row) for row in rows)
+            if cursor is None:
+                break
+
+            limit = chunk_size
+            if seen_rows:
+                limit = max(1, min(chunk_size, chunk_max_bytes * seen_rows // seen_bytes))
+            rows, cursor = await _fetch_chunk(access_token, tenant_id, limit, cursor)
+
+        tail = encoder.finish()
+        if tail:
+            yield tail
+
+    return body()
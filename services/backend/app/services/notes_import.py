@@ -0,0 +1,341 @@
+"""
+Bulk import of notes from NDJSON or a zip of Markdown files.
+
+Responsibilities:
+- Spool the request body to a bounded temporary file as it streams in
+- Parse it lazily with generators (one record at a time)
+- Group records into bounded batches for multi-row inserts
+- Track progress in an in-process job registry
+
+Pipeline:
+    request stream -> SpooledTemporaryFile -> iter_*_records()
+        -> batched(IMPORT_BATCH_SIZE) -> create_notes_batch()
+
+Memory is bounded by the spool threshold plus one batch. Jobs live in
+this worker process only: status must be polled on the same instance
+(sticky sessions when running several workers). Inserts run under the
+uploader's access token, so an import that outlives the token fails its
+remaining batches.
+"""
+
+import json
+import tempfile
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from itertools import islice
+from typing import IO, AsyncIterator, Iterable, Iterator, Literal, Optional
+from uuid import UUID
+
+from anyio import to_thread
+
+from app.cache.lru import TTLCache
+from app.config import settings
+from app.db.notes import create_notes_batch
+from app.db.tags import normalize_tags
+from app.errors.db import DomainError, InvalidArgument, PermissionDenied
+from app.services.semantic_index import get_semantic_index
+
+
+ImportFormat = Literal["ndjson", "zip"]
+ImportStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class ImportRecord:
+    """
+    One note parsed from the upload, or the reason it could not be parsed.
+    source identifies it for error reports ("line 12", "docs/a.md").
+    """
+
+    __slots__ = ("source", "content", "tags", "error")
+
+    def __init__(self, source: str, content: str = "", tags: Optional[list[str]] = None, error: Optional[str] = None):
+        self.source = source
+        self.content = content
+        self.tags = tags or []
+        self.error = error
+
+
+class ImportJob:
+    """
+    Progress of one import. Mutated only by its own background task.
+    """
+
+    def __init__(self, tenant_id: UUID, import_format: ImportFormat):
+        self.id = str(uuid.uuid4())
+        self.tenant_id = str(tenant_id)
+        self.format = import_format
+        self.status: ImportStatus = "queued"
+        self.processed = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+
+    def record_error(self, source: str, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"source": source, "message": message})
+
+
+"""
+Internal job registry (per process). Queued and running jobs are held
+until run_import finishes them and are never evicted; finished jobs
+expire IMPORT_JOB_TTL seconds after finishing.
+"""
+_active_jobs: dict[str, ImportJob] = {}
+_finished_jobs: TTLCache[str, ImportJob] = TTLCache(maxsize=1000, ttl=settings.IMPORT_JOB_TTL)
+
+
+def get_import_job(job_id: str) -> Optional[ImportJob]:
+    """
+    Look up a job started by this process.
+    """
+    return _active_jobs.get(job_id) or _finished_jobs.get(job_id)
+
+
+def create_import_job(tenant_id: UUID, import_format: ImportFormat) -> ImportJob:
+    """
+    Register a new queued job.
+    """
+    job = ImportJob(tenant_id, import_format)
+    _active_jobs[job.id] = job
+    return job
+
+
+async def spool_body(chunks: AsyncIterator[bytes]) -> IO[bytes]:
+    """
+    Copy a streamed request body into a SpooledTemporaryFile.
+
+    Small uploads stay in memory, larger ones roll over to disk.
+    Raises InvalidArgument if the body exceeds IMPORT_MAX_BYTES.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_MEMORY)
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > settings.IMPORT_MAX_BYTES:
+                raise InvalidArgument(f"Import exceeds {settings.IMPORT_MAX_BYTES} bytes")
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool
+
+
+def iter_ndjson_records(fileobj: IO[bytes]) -> Iterator[ImportRecord]:
+    """
+    Parse NDJSON: one {"content": str, "tags": [str]} object per line.
+    Other keys (e.g. those written by the export endpoint) are ignored.
+    Blank lines are skipped.
+
+    At most IMPORT_MAX_NOTE_BYTES + 1 bytes of a line are read: the rest
+    of an oversized line is skipped in chunks, never held in memory.
+    """
+    limit = settings.IMPORT_MAX_NOTE_BYTES
+    number = 0
+    while raw := fileobj.readline(limit + 1):
+        number += 1
+        source = f"line {number}"
+        if len(raw) > limit:
+            if not raw.endswith(b"\n"):
+                _skip_line(fileobj)
+            yield ImportRecord(source, error="Record is too large")
+            continue
+
+        line = raw.strip()
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            yield ImportRecord(source, error="Invalid JSON")
+            continue
+
+        if not isinstance(record, dict) or not isinstance(record.get("content"), str):
+            yield ImportRecord(source, error="Record must be an object with a string 'content'")
+            continue
+
+        tags = record.get("tags") or []
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            yield ImportRecord(source, error="'tags' must be a list of strings")
+            continue
+
+        yield ImportRecord(source, record["content"], tags)
+
+
+def _skip_line(fileobj: IO[bytes], chunk_size: int = 64 * 1024) -> None:
+    """
+    Advance past the next newline (or to EOF).
+    """
+    while chunk := fileobj.readline(chunk_size):
+        if chunk.endswith(b"\n"):
+            return
+
+
+def iter_markdown_zip_records(fileobj: IO[bytes]) -> Iterator[ImportRecord]:
+    """
+    Parse a zip archive: every *.md entry becomes one note.
+
+    An optional front matter block may declare tags:
+        ---
+        tags: [work, ideas]      (or "tags: work, ideas", or a "- tag" list)
+        ---
+    The front matter is stripped from the note content.
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        yield ImportRecord("archive", error="Not a valid zip archive")
+        return
+
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(".md"):
+                continue
+            if info.file_size > settings.IMPORT_MAX_NOTE_BYTES:
+                yield ImportRecord(info.filename, error="File is too large")
+                continue
+
+            try:
+                with archive.open(info) as entry:
+                    data = entry.read(settings.IMPORT_MAX_NOTE_BYTES + 1)
+            except (zipfile.BadZipFile, RuntimeError):
+                yield ImportRecord(info.filename, error="File is unreadable")
+                continue
+
+            """
+            file_size comes from the entry header and may understate the
+            real size; a read that was cut off never reaches the CRC check.
+            """
+            if len(data) > settings.IMPORT_MAX_NOTE_BYTES:
+                yield ImportRecord(info.filename, error="File is too large")
+                continue
+
+            try:
+                text = data.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                yield ImportRecord(info.filename, error="File is not UTF-8")
+                continue
+
+            content, tags = _split_front_matter(text)
+            yield ImportRecord(info.filename, content, tags)
+
+
+def _split_front_matter(text: str) -> tuple[str, list[str]]:
+    """
+    Extract tags from a leading '---' front matter block.
+    """
+    if not text.startswith("---"):
+        return text, []
+
+    lines = text.splitlines(keepends=True)
+    for end in range(1, len(lines)):
+        if lines[end].strip() == "---":
+            break
+    else:
+        return text, []
+
+    tags: list[str] = []
+    in_tag_list = False
+    for line in lines[1:end]:
+        stripped = line.strip()
+        if stripped.lower().startswith("tags:"):
+            value = stripped[5:].strip()
+            in_tag_list = not value
+            tags.extend(t.strip().strip("'\"") for t in value.strip("[]").split(",") if t.strip())
+        elif in_tag_list and stripped.startswith("- "):
+            tags.append(stripped[2:].strip().strip("'\""))
+        else:
+            in_tag_list = False
+
+    return "".join(lines[end + 1:]).lstrip("\n"), tags
+
+
+def _batched(records: Iterable[ImportRecord], size: int) -> Iterator[list[ImportRecord]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def run_import(job: ImportJob, access_token: str, fileobj: IO[bytes]) -> None:
+    """
+    Process a spooled upload to completion, updating job as it goes.
+
+    Parsing happens in a worker thread one batch at a time; each batch of
+    valid records is written with a single multi-row insert, then embedded
+    for the semantic index with a single call on a worker thread.
+    """
+    job.status = "running"
+    tenant_id = UUID(job.tenant_id)
+    parser = iter_ndjson_records if job.format == "ndjson" else iter_markdown_zip_records
+    batches = _batched(parser(fileobj), settings.IMPORT_BATCH_SIZE)
+    semantic_index = get_semantic_index()
+
+    try:
+        while True:
+            batch = await to_thread.run_sync(next, batches, None)
+            if batch is None:
+                break
+
+            rows, sources = [], []
+            for record in batch:
+                job.processed += 1
+                if record.error:
+                    job.record_error(record.source, record.error)
+                    continue
+                try:
+                    rows.append({"content": record.content, "tags": normalize_tags(record.tags)})
+                    sources.append(record.source)
+                except InvalidArgument as exc:
+                    job.record_error(record.source, str(exc))
+
+            if not rows:
+                continue
+
+            try:
+                result = await create_notes_batch(access_token, tenant_id, rows)
+            except PermissionDenied:
+                raise
+            except DomainError as exc:
+                for source in sources:
+                    job.record_error(source, str(exc))
+                continue
+
+            await semantic_index.index_notes(
+                [(data["tenant_id"], data["id"], data["owner_id"], row["content"]) for row, data in zip(rows, result.data or [])]
+            )
+            job.imported += len(result.data or [])
+
+        job.status = "succeeded"
+    except DomainError as exc:
+        job.status = "failed"
+        job.record_error("job", str(exc))
+    except Exception:
+        job.status = "failed"
+        job.record_error("job", "Unexpected error while importing")
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+        fileobj.close()
+        _finished_jobs.set(job.id, job)
+        _active_jobs.pop(job.id, None)
+
+
+def detect_format(content_type: Optional[str], requested: Optional[ImportFormat]) -> ImportFormat:
+    """
+    Pick the parser from an explicit ?format= or the Content-Type header.
+    """
+    if requested:
+        return requested
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("application/zip", "application/x-zip-compressed"):
+        return "zip"
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq"):
+        return "ndjson"
+    raise InvalidArgument("Unsupported import type: send application/x-ndjson or application/zip")
@@ -0,0 +1,506 @@
+"""
+In-process semantic index over tenant notes.
+
+Responsibilities:
+- Keep one embedding matrix per tenant (rows = active notes)
+- Answer cosine top-k queries with a single matrix product + argpartition
+- Apply incremental updates on note create / update / delete
+- Rank only the rows the caller may read, then re-check the final hits
+  under the caller's token before returning anything
+
+Embedding (char n-gram hashing, up to the note size limit) is CPU-bound:
+every build, write and query embeds on a worker thread, never on the
+event loop.
+
+Indexes are built lazily on the first query for a tenant by scanning its
+notes with the service role and kept in a bounded LRU. Once an index is
+older than SEMANTIC_INDEX_TTL, the next query starts a rebuild in the
+background and keeps using the stale index until the new one is swapped
+in, so writes made by other workers are eventually picked up without
+stalling a request on a full rescan.
+
+Memory is bounded by SEMANTIC_INDEX_MAX_BYTES across all tenants: the
+least recently used indexes are dropped to make room, and a tenant too
+large for the budget alone cannot be searched semantically.
+
+Each row also records the note's owner, so a query is masked by the
+caller's visibility scope (role, user ID, shared notes; the notes_select
+rules) before top-k selection. The database remains the source of truth
+for access control: hits are re-read under the caller's token.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Iterable, Optional
+from uuid import UUID
+
+import numpy as np
+from anyio import to_thread
+
+from app.cache.lru import TTLCache
+from app.config import settings
+from app.db.events import get_tenant_event_scope
+from app.db.notes import get_notes_by_ids, scan_tenant_note_texts
+from app.db.pagination import split_page
+from app.errors.db import PermissionDenied, ServiceUnavailable
+from app.services.embeddings import Embedder, HashingEmbedder
+
+
+logger = logging.getLogger(__name__)
+
+
+class TenantVectorIndex:
+    """
+    Row-major float32 matrix of L2-normalized note embeddings, with the
+    owner of each row as a small integer code.
+
+    Rows are kept dense: removing a note moves the last row into its slot,
+    so a query always scans exactly `size` rows. Capacity grows by doubling.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        capacity = max(capacity, 1)
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._owners = np.zeros(capacity, dtype=np.int32)
+        self._owner_codes: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the allocated matrix (capacity, not size).
+        """
+        return self._matrix.nbytes + self._owners.nbytes
+
+    def upsert(self, note_ids: list[str], vectors: np.ndarray, owner_ids: list[str]) -> None:
+        """
+        Insert or replace embeddings for the given notes.
+        """
+        with self._lock:
+            for note_id, vector, owner_id in zip(note_ids, vectors, owner_ids):
+                row = self._rows.get(note_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ensure_capacity(row + 1)
+                    self._ids.append(note_id)
+                    self._rows[note_id] = row
+                self._matrix[row] = vector
+                self._owners[row] = self._owner_codes.setdefault(str(owner_id), len(self._owner_codes))
+
+    def remove(self, note_id: str) -> bool:
+        """
+        Drop a note. Returns False if it was not indexed.
+        """
+        with self._lock:
+            row = self._rows.pop(note_id, None)
+            if row is None:
+                return False
+
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._owners[row] = self._owners[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+            self._ids.pop()
+            return True
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        *,
+        owner_id: Optional[str] = None,
+        shared_note_ids: Iterable[str] = (),
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Batched cosine top-k.
+
+        queries: (m, dim) L2-normalized vectors.
+        Without owner_id every row is eligible (tenant owner / admin);
+        with it, only rows owned by owner_id or listed in shared_note_ids.
+        Returns, per query, up to k (note_id, score) pairs, best first.
+        """
+        with self._lock:
+            size = len(self._ids)
+            if owner_id is None:
+                rows = None
+                eligible = size
+            else:
+                mask = np.zeros(size, dtype=bool)
+                code = self._owner_codes.get(str(owner_id))
+                if code is not None:
+                    mask = self._owners[:size] == code
+                for note_id in shared_note_ids:
+                    row = self._rows.get(note_id)
+                    if row is not None:
+                        mask[row] = True
+                rows = np.flatnonzero(mask)
+                eligible = len(rows)
+
+            if eligible == 0 or k <= 0:
+                return [[] for _ in range(len(queries))]
+
+            """
+            One GEMM for all queries over the eligible rows only:
+            (m, dim) x (dim, eligible). argpartition selects the k best in
+            O(eligible); only those k are sorted.
+            """
+            matrix = self._matrix[:size] if rows is None else self._matrix[rows]
+            scores = queries @ matrix.T
+            k = min(k, eligible)
+            if k < eligible:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(eligible), (len(queries), eligible))
+
+            results = []
+            for row_scores, candidates in zip(scores, top):
+                ordered = candidates[np.argsort(-row_scores[candidates], kind="stable")]
+                results.append([
+                    (self._ids[i if rows is None else rows[i]], float(row_scores[i]))
+                    for i in ordered
+                ])
+            return results
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+        owners = np.zeros(capacity, dtype=np.int32)
+        owners[:len(self._ids)] = self._owners[:len(self._ids)]
+        self._owners = owners
+
+
+class SemanticIndexRegistry:
+    """
+    Per-tenant indexes with lazy, single-flight builds and background refresh.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        max_tenants: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        scan_page_size: int = 1000,
+        reindex_delay: float = 0.0,
+    ):
+        self.embedder = embedder
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.scan_page_size = scan_page_size
+        self.reindex_delay = reindex_delay
+        """
+        Entries do not expire: a stale index keeps serving while it is
+        rebuilt (see get_or_build).
+        """
+        self._indexes: TTLCache[str, TenantVectorIndex] = TTLCache(maxsize=max_tenants)
+        """
+        In-flight builds, keyed by tenant id; an entry lives only as long
+        as its build.
+        """
+        self._builds: dict[str, asyncio.Task] = {}
+        """
+        Writes applied while a tenant build is running, replayed onto the
+        new index before it is swapped in: tenant id -> note id ->
+        (owner id, vector), or None for a removed note.
+        """
+        self._replay: dict[str, dict[str, Optional[tuple[str, np.ndarray]]]] = {}
+        """
+        note id -> sequence of its newest in-flight embedding; an older
+        embedding finishing late must not overwrite a newer one.
+        """
+        self._latest: dict[str, int] = {}
+        self._sequence = 0
+        """
+        Deferred re-indexing: note id -> (tenant_id, owner_id, newest
+        content), and the timer that will index it.
+        """
+        self._deferred: dict[str, tuple[UUID, UUID, str]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+
+    def peek(self, tenant_id: UUID) -> Optional[TenantVectorIndex]:
+        """
+        Return the tenant index if it is already built.
+        """
+        return self._indexes.get(str(tenant_id))
+
+    async def get_or_build(self, tenant_id: UUID) -> TenantVectorIndex:
+        """
+        Return the tenant index, building it on first use.
+        Concurrent callers for the same tenant share one build. An index
+        older than ttl is returned as is and rebuilt in the background.
+        """
+        key = str(tenant_id)
+        index = self._indexes.get(key)
+        if index is not None:
+            if time.monotonic() - index.built_at >= self.ttl:
+                self._start_build(key, tenant_id)
+            return index
+
+        return await asyncio.shield(self._start_build(key, tenant_id))
+
+    def _start_build(self, key: str, tenant_id: UUID) -> asyncio.Task:
+        build = self._builds.get(key)
+        if build is None:
+            build = asyncio.create_task(self._rebuild(key, tenant_id))
+            build.add_done_callback(self._log_build_failure)
+            self._builds[key] = build
+        return build
+
+    @staticmethod
+    def _log_build_failure(build: asyncio.Task) -> None:
+        if not build.cancelled() and build.exception() is not None:
+            logger.warning("semantic index build failed", exc_info=build.exception())
+
+    async def _rebuild(self, key: str, tenant_id: UUID) -> TenantVectorIndex:
+        replay: dict[str, Optional[tuple[str, np.ndarray]]] = {}
+        self._replay[key] = replay
+        try:
+            index = await self._build(tenant_id)
+            """
+            No await between the replay and the swap: no write can slip in.
+            """
+            for note_key, entry in replay.items():
+                if entry is None:
+                    index.remove(note_key)
+                else:
+                    owner_id, vector = entry
+                    index.upsert([note_key], vector[None, :], [owner_id])
+            self._indexes.set(key, index)
+            self._enforce_budget(key)
+            return index
+        finally:
+            self._replay.pop(key, None)
+            self._builds.pop(key, None)
+
+    async def _build(self, tenant_id: UUID) -> TenantVectorIndex:
+        index = TenantVectorIndex(self.embedder.dim)
+        cursor = None
+        while True:
+            result = await scan_tenant_note_texts(tenant_id, self.scan_page_size, cursor)
+            rows, cursor = split_page(result.data, self.scan_page_size, "id")
+            if rows:
+                ids = [row["id"] for row in rows]
+                texts = [row["content"] for row in rows]
+                vectors = await to_thread.run_sync(self.embedder.embed, texts)
+                index.upsert(ids, vectors, [row["owner_id"] for row in rows])
+                if self.max_bytes is not None and index.nbytes > self.max_bytes:
+                    raise ServiceUnavailable("Tenant is too large for semantic search")
+            if cursor is None:
+                return index
+
+    def _enforce_budget(self, keep: str) -> None:
+        """
+        Drop least recently used indexes (never keep) until the total
+        matrix memory fits max_bytes.
+        """
+        if self.max_bytes is None:
+            return
+        entries = self._indexes.items()
+        total = sum(index.nbytes for _, index in entries)
+        for key, index in entries:
+            if total <= self.max_bytes:
+                return
+            if key != keep:
+                self._indexes.delete(key)
+                total -= index.nbytes
+
+    def _is_tracked(self, tenant_id: UUID) -> bool:
+        """
+        Whether writes to this tenant must be indexed: its index is built
+        or being built.
+        """
+        key = str(tenant_id)
+        return key in self._builds or self._indexes.get(key) is not None
+
+    async def index_notes(self, notes: list[tuple[UUID, UUID, UUID, str]]) -> None:
+        """
+        Add or refresh notes, given as (tenant_id, note_id, owner_id, content), in
+        built or building tenant indexes. Notes of other tenants are
+        skipped: their first query scans the database.
+
+        All texts are embedded in one call on a worker thread. If a note is
+        indexed again before an earlier embedding finishes, only the newest
+        content is kept.
+        """
+        pending = []
+        for tenant_id, note_id, owner_id, content in notes:
+            self._cancel_deferred(str(note_id))
+            if self._is_tracked(tenant_id):
+                pending.append((str(tenant_id), str(note_id), str(owner_id), content))
+        if not pending:
+            return
+
+        self._sequence += 1
+        sequence = self._sequence
+        for _, key, _, _ in pending:
+            self._latest[key] = sequence
+
+        try:
+            vectors = await to_thread.run_sync(self.embedder.embed, [content for _, _, _, content in pending])
+        finally:
+            current = [self._latest.get(key) == sequence for _, key, _, _ in pending]
+            for (_, key, _, _), is_current in zip(pending, current):
+                if is_current:
+                    del self._latest[key]
+
+        for (tenant_key, key, owner_id, _), vector, is_current in zip(pending, vectors, current):
+            if not is_current:
+                continue
+            index = self._indexes.get(tenant_key)
+            if index is not None:
+                index.upsert([key], vector[None, :], [owner_id])
+            replay = self._replay.get(tenant_key)
+            if replay is not None:
+                replay[key] = (owner_id, vector)
+
+    def defer_index_note(self, tenant_id: UUID, note_id: UUID, owner_id: UUID, content: str) -> None:
+        """
+        Index a note reindex_delay seconds from now, with its newest content
+        at that time. For frequent small edits (patches): a burst of edits
+        to one note costs one embedding instead of one per edit.
+        """
+        key = str(note_id)
+        if not self._is_tracked(tenant_id):
+            self._cancel_deferred(key)
+            return
+
+        self._deferred[key] = (tenant_id, owner_id, content)
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._index_deferred(key))
+
+    async def _index_deferred(self, key: str) -> None:
+        await asyncio.sleep(self.reindex_delay)
+        self._timers.pop(key, None)
+        entry = self._deferred.pop(key, None)
+        if entry is None:
+            return
+        tenant_id, owner_id, content = entry
+        try:
+            await self.index_notes([(tenant_id, UUID(key), owner_id, content)])
+        except Exception:
+            logger.warning("deferred semantic re-index of note %s failed", key, exc_info=True)
+
+    def _cancel_deferred(self, key: str) -> None:
+        self._deferred.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def remove_note(self, note_id: UUID) -> None:
+        """
+        Remove a note from whichever built index holds it, and from the
+        writes to replay onto indexes being built.
+        """
+        key = str(note_id)
+        self._latest.pop(key, None)
+        self._cancel_deferred(key)
+        """
+        The tenant is unknown here; marking the note removed in every
+        replay log is harmless for tenants that do not hold it.
+        """
+        for replay in self._replay.values():
+            replay[key] = None
+        for index in self._indexes.values():
+            if index.remove(key):
+                return
+
+
+"""
+Internal singleton registry.
+"""
+_registry: Optional[SemanticIndexRegistry] = None
+
+
+def get_semantic_index() -> SemanticIndexRegistry:
+    """
+    Get the process-wide semantic index registry.
+    """
+    global _registry
+    if _registry is None:
+        _registry = SemanticIndexRegistry(
+            HashingEmbedder(dim=settings.SEMANTIC_EMBEDDING_DIM),
+            max_tenants=settings.SEMANTIC_INDEX_MAX_TENANTS,
+            ttl=settings.SEMANTIC_INDEX_TTL,
+            max_bytes=settings.SEMANTIC_INDEX_MAX_BYTES,
+            reindex_delay=settings.SEMANTIC_REINDEX_DELAY,
+        )
+    return _registry
+
+
+def override_semantic_index(registry: Optional[SemanticIndexRegistry]) -> None:
+    """
+    Override the registry instance (e.g. to plug in another Embedder).
+    This function is intended ONLY for testing purposes.
+    """
+    global _registry
+    _registry = registry
+
+
+async def semantic_search_notes(access_token: str, tenant_id: UUID, query: str, k: int) -> list[tuple[dict, float]]:
+    """
+    Semantic top-k over a tenant's notes, restricted to notes the caller can read.
+
+    The index ranks only the rows in the caller's scope (tenant owners and
+    admins see every note, members their own and those shared with them),
+    so a member's results do not depend on where their notes rank tenant
+    wide. The top k are then re-read under the caller's token, which is
+    also the read that returns their content; notes RLS drops there
+    (index not yet refreshed) are replaced by the next best candidates.
+
+    Returns (note row, score) pairs, best first.
+    """
+    scope = await get_tenant_event_scope(access_token, tenant_id)
+    if not scope.data:
+        raise PermissionDenied("Caller is not a member of this tenant")
+    row = scope.data[0]
+    if row["role"] in ("owner", "admin"):
+        visibility = {}
+    else:
+        visibility = {
+            "owner_id": str(row["user_id"]),
+            "shared_note_ids": [str(note_id) for note_id in row["shared_note_ids"] or []],
+        }
+
+    registry = get_semantic_index()
+    index = await registry.get_or_build(tenant_id)
+    query_vector = await to_thread.run_sync(registry.embedder.embed, [query])
+
+    def search(pool: int) -> list[tuple[str, float]]:
+        return index.search(query_vector, pool, **visibility)[0]
+
+    pool = k
+    checked: set[str] = set()
+    hits: list[tuple[dict, float]] = []
+    while True:
+        candidates = await to_thread.run_sync(search, pool)
+        fresh = [(note_id, score) for note_id, score in candidates if note_id not in checked]
+        if fresh:
+            visible = await get_notes_by_ids(access_token, [note_id for note_id, _ in fresh])
+            rows = {row["id"]: row for row in visible.data or []}
+            hits.extend((rows[note_id], score) for note_id, score in fresh if note_id in rows)
+            checked.update(note_id for note_id, _ in fresh)
+
+        exhausted = len(candidates) < pool
+        if len(hits) >= k or exhausted or pool >= settings.SEMANTIC_MAX_CANDIDATES:
+            hits.sort(key=lambda hit: hit[1], reverse=True)
+            return hits[:k]
+        pool = min(pool * 2, settings.SEMANTIC_MAX_CANDIDATES)
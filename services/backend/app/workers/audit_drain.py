@@ -0,0 +1,72 @@
+"""
+Audit drain worker.
+
+Moves audit events queued by asynchronous audit writes (migration 034)
+into audit_logs, in batches of AUDIT_DRAIN_BATCH_SIZE. While the queue is
+non-empty batches run back to back; once it is empty the worker sleeps
+AUDIT_DRAIN_IDLE_INTERVAL seconds, which bounds how late an event shows up
+in GET /tenants/{tenant_id}/audit.
+
+Run as a separate process next to the API:
+
+    python -m app.workers.audit_drain
+
+Several instances may run at once (batches are claimed with SKIP LOCKED).
+Async writes stay off until enabled in audit_log_settings, so the worker
+is idle until then.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.db.audit import drain_audit_log_queue
+from app.db.client import close_http_client
+
+
+logger = logging.getLogger(__name__)
+
+"""
+Back-off after a failed batch (database unreachable, ...), in seconds.
+"""
+ERROR_BACKOFF = 5.0
+
+
+async def drain_forever(stop: asyncio.Event) -> None:
+    """
+    Drain until stop is set. A batch in flight is always completed.
+    """
+    while not stop.is_set():
+        try:
+            moved = await drain_audit_log_queue(settings.AUDIT_DRAIN_BATCH_SIZE)
+        except Exception:
+            logger.warning("audit drain batch failed", exc_info=True)
+            delay = ERROR_BACKOFF
+        else:
+            if moved:
+                logger.debug("drained %s audit events", moved)
+            delay = 0 if moved >= settings.AUDIT_DRAIN_BATCH_SIZE else settings.AUDIT_DRAIN_IDLE_INTERVAL
+
+        if delay:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await drain_forever(stop)
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
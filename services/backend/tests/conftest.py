@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+
+"""
+Make the app package importable however pytest is invoked (from this
+directory, or from the repository root).
+"""
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+"""
+Settings are read from the environment at import time; unit tests never
+reach Supabase, so placeholders are enough.
+"""
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-role-key")
+os.environ.setdefault("SUPABASE_PUBLISHABLE_KEY", "test-publishable-key")
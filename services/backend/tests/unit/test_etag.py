@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from starlette.requests import Request  # noqa: E402
+
+from app.http.etag import etag_matches, list_etag, note_etag, version_from_etag  # noqa: E402
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_note_etag_round_trip():
+    assert note_etag(7) == '"v7"'
+    assert version_from_etag(note_etag(7)) == 7
+    assert version_from_etag(note_etag(7, "html")) == 7
+    assert version_from_etag(' "v12" ') == 12
+
+
+@pytest.mark.parametrize("etag", ['W/"v7"', "v7", '"7"', '"v"', '"v7', '"vx"', '"v7-<x>"', ""])
+def test_version_from_etag_rejects_other_tags(etag):
+    assert version_from_etag(etag) is None
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('"v7"', True),
+        ('W/"v7"', True),
+        ('"v6", "v7"', True),
+        ('"v6",W/"v7"', True),
+        ('"v6"', False),
+        ('"v7-html"', False),
+    ],
+)
+def test_if_none_match(header, matches):
+    assert etag_matches(_request(header), note_etag(7)) is matches
+
+
+def test_weak_list_etag_matches_strong_header():
+    etag = list_etag([{"id": "a", "updated_at": "2026-03-01"}], 1)
+    assert etag.startswith('W/"')
+    assert etag_matches(_request(etag[2:]), etag)
+
+
+def test_list_etag_changes_with_page_membership_and_extras():
+    rows = [{"id": "a", "updated_at": "2026-03-02"}, {"id": "b", "updated_at": "2026-03-01"}]
+    base = list_etag(rows, 2, None)
+    assert list_etag(list(rows), 2, None) == base
+    assert list_etag(rows[:1], 2, None) != base
+    assert list_etag(rows, 3, None) != base
+    assert list_etag(rows, 2, "cursor") != base
+    assert list_etag([{**rows[0], "updated_at": "2026-03-03"}, rows[1]], 2, None) != base
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("markdown_it")
+
+from app.http import markdown  # noqa: E402
+from app.http.markdown import render_markdown, render_markdown_many  # noqa: E402
+
+
+def _render(content: str) -> str:
+    return asyncio.run(render_markdown(content))
+
+
+def test_renders_markdown():
+    html = _render("# Title\n\n**bold** ~~gone~~ [link](https://example.com)")
+    assert "<h1>Title</h1>" in html
+    assert "<strong>bold</strong>" in html
+    assert "<s>gone</s>" in html
+    assert '<a href="https://example.com">link</a>' in html
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "<script>alert(1)</script>",
+        "text <img src=x onerror=alert(1)>",
+        '<a href="javascript:alert(1)">x</a>',
+    ],
+)
+def test_raw_html_is_escaped(content):
+    html = _render(content)
+    assert "<script" not in html
+    assert "<img" not in html
+    assert "<a " not in html
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[x](javascript:alert(1))",
+        "[x](JaVaScRiPt:alert(1))",
+        "[x](vbscript:msgbox(1))",
+        "[x](data:text/html;base64,PHNjcmlwdD4=)",
+        "![x](javascript:alert(1))",
+    ],
+)
+def test_dangerous_urls_are_not_linked(content):
+    html = _render(content).lower()
+    assert "href=" not in html
+    assert "src=" not in html
+
+
+def test_identical_content_renders_once(monkeypatch):
+    calls = []
+    render = markdown._render_uncached
+
+    def counting(contents):
+        calls.append(list(contents))
+        return render(contents)
+
+    monkeypatch.setattr(markdown, "_render_uncached", counting)
+    markdown._rendered.clear()
+
+    first = asyncio.run(render_markdown_many(["*same*", "*same*", "other"]))
+    second = asyncio.run(render_markdown_many(["*same*"]))
+
+    assert first[0] == first[1] == second[0]
+    assert calls == [["*same*", "other"]]
@@ -0,0 +1,72 @@
+import asyncio
+import time
+import uuid
+
+from app.services.note_events import TenantSubscription, stream_events
+
+
+TENANT = str(uuid.uuid4())
+USER = str(uuid.uuid4())
+
+
+class _Broker:
+    def __init__(self):
+        self.released = []
+
+    def unsubscribe(self, subscription):
+        self.released.append(subscription)
+
+
+def _drain(subscription: TenantSubscription) -> list[dict]:
+    events = []
+    while not subscription._queue.empty():
+        events.append(subscription._queue.get_nowait())
+    return events
+
+
+def test_events_before_activation_are_replayed_through_the_scope():
+    async def run():
+        shared, hidden = str(uuid.uuid4()), str(uuid.uuid4())
+        subscription = TenantSubscription(TENANT)
+
+        subscription.offer({"type": "share.granted", "user_id": USER, "note_id": shared})
+        subscription.offer({"type": "note.updated", "note_id": shared, "owner_id": "someone"})
+        subscription.offer({"type": "note.updated", "note_id": hidden, "owner_id": "someone"})
+        assert _drain(subscription) == []
+
+        subscription.activate(USER, "member", [])
+
+        assert [event.get("note_id") for event in _drain(subscription)] == [shared, shared]
+        assert shared in subscription.shared_note_ids
+
+    asyncio.run(run())
+
+
+def test_overflow_before_activation_becomes_resync():
+    async def run():
+        subscription = TenantSubscription(TENANT)
+        for _ in range(subscription._queue.maxsize + 1):
+            subscription.offer({"type": "note.created", "note_id": "n", "owner_id": USER})
+
+        subscription.activate(USER, "member", [])
+
+        assert [event["type"] for event in _drain(subscription)] == ["resync"]
+
+    asyncio.run(run())
+
+
+def test_stream_ends_when_token_expires():
+    async def run():
+        broker = _Broker()
+        subscription = TenantSubscription(TENANT)
+        subscription.activate(USER, "member", [])
+
+        frames = [
+            frame
+            async for frame in stream_events(broker, subscription, expires_at=time.time() + 0.05)
+        ]
+
+        assert frames[0].startswith("retry:")
+        assert broker.released == [subscription]
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
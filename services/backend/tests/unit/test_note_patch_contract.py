@@ -0,0 +1,37 @@
+import pytest
+
+pydantic = pytest.importorskip("pydantic")
+
+from app.contracts.note import (  # noqa: E402
+    PATCH_MAX_INSERT_CHARS,
+    PATCH_MAX_OPS,
+    PATCH_MAX_POSITION,
+    NoteSpliceOp,
+    UpdateNotePayload,
+)
+
+
+def test_splice_op_accepts_bounds():
+    op = NoteSpliceOp(start=PATCH_MAX_POSITION, delete=PATCH_MAX_POSITION, insert="x")
+    assert op.start == PATCH_MAX_POSITION
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"start": -1},
+        {"start": PATCH_MAX_POSITION + 1},
+        {"start": 0, "delete": -1},
+        {"start": 0, "delete": PATCH_MAX_POSITION + 1},
+        {"start": 0, "insert": "x" * (PATCH_MAX_INSERT_CHARS + 1)},
+    ],
+)
+def test_splice_op_rejects_out_of_range(fields):
+    with pytest.raises(pydantic.ValidationError):
+        NoteSpliceOp(**fields)
+
+
+def test_patch_payload_caps_operation_count():
+    ops = [{"start": i} for i in range(PATCH_MAX_OPS + 1)]
+    with pytest.raises(pydantic.ValidationError):
+        UpdateNotePayload(base_version=1, ops=ops)
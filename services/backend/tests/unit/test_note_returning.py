@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+import pytest
+
+postgrest = pytest.importorskip("postgrest")
+
+from app.db.notes import NOTE_BATCH_COLUMNS, NOTE_COLUMNS, _returning  # noqa: E402
+
+
+def _send(build) -> httpx.Request:
+    """
+    Execute the query built by build(client) against a mock transport and
+    return the request that reached it.
+    """
+    sent: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(201, json=[])
+
+    async def run():
+        async with httpx.AsyncClient(base_url="http://postgrest.test", transport=httpx.MockTransport(handler)) as http:
+            client = postgrest.AsyncPostgrestClient("http://postgrest.test", http_client=http)
+            await build(client).execute()
+
+    asyncio.run(run())
+    assert len(sent) == 1
+    return sent[0]
+
+
+def test_insert_sends_select():
+    request = _send(lambda client: _returning(client.table("notes").insert([{"content": "x"}]), NOTE_BATCH_COLUMNS))
+
+    assert request.method == "POST"
+    assert request.url.params["select"] == NOTE_BATCH_COLUMNS.replace(" ", "")
+    assert "return=representation" in request.headers["prefer"]
+
+
+def test_update_sends_select_alongside_filters():
+    request = _send(
+        lambda client: _returning(client.table("notes").update({"content": "x"}).eq("id", "1"), NOTE_COLUMNS)
+    )
+
+    assert request.method == "PATCH"
+    assert request.url.params["id"] == "eq.1"
+    assert request.url.params["select"] == NOTE_COLUMNS.replace(" ", "")
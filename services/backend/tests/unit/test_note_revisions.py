@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from app.db.revisions import REVISION_CHAIN_SPAN
+from app.errors.db import InvariantViolated
+from app.services.note_revisions import replay_chain
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = 0
+    while n < min(len(a), len(b)) and a[n] == b[n]:
+        n += 1
+    return n
+
+
+def _record(history: list[dict], old: str | None, new: str, version: int) -> None:
+    """
+    Python model of record_note_revision() (migration 029).
+    """
+    previous = history[-1]["chain_length"] if history else None
+    if old is None or previous is None or previous >= REVISION_CHAIN_SPAN - 1:
+        history.append(_snapshot(new, version))
+        return
+
+    prefix = _common_prefix(old, new)
+    suffix = _common_prefix(old[prefix:][::-1], new[prefix:][::-1])
+    insert = new[prefix:len(new) - suffix]
+    if len(insert) * 2 > len(new):
+        history.append(_snapshot(new, version))
+        return
+
+    history.append({
+        "revision": version,
+        "kind": "delta",
+        "chain_length": previous + 1,
+        "content": None,
+        "delta_start": prefix,
+        "delta_delete": len(old) - prefix - suffix,
+        "delta_insert": insert,
+        "content_length": len(new),
+    })
+
+
+def _snapshot(content: str, version: int) -> dict:
+    return {
+        "revision": version,
+        "kind": "snapshot",
+        "chain_length": 0,
+        "content": content,
+        "delta_start": None,
+        "delta_delete": None,
+        "delta_insert": None,
+        "content_length": len(content),
+    }
+
+
+def _chain(history: list[dict], version: int) -> list[dict]:
+    """
+    Same rows as get_revision_chain(): the latest REVISION_CHAIN_SPAN
+    revisions at or before version, newest first.
+    """
+    rows = [row for row in history if row["revision"] <= version]
+    return list(reversed(rows))[:REVISION_CHAIN_SPAN]
+
+
+def _edit(rng: random.Random, content: str) -> str:
+    start = rng.randrange(len(content) + 1)
+    end = min(len(content), start + rng.randrange(4))
+    return content[:start] + rng.choice(["", "x", "ñé", "🙂", "word "]) + content[end:]
+
+
+def test_every_version_rebuilds_across_chain_boundaries():
+    rng = random.Random(7)
+    contents = ["The quick brown fox jumps over the lazy dog. " * 3]
+    history: list[dict] = []
+    _record(history, None, contents[0], 1)
+    for version in range(2, 3 * REVISION_CHAIN_SPAN + 5):
+        contents.append(_edit(rng, contents[-1]))
+        _record(history, contents[-2], contents[-1], version)
+
+    assert sum(row["kind"] == "snapshot" for row in history) >= 3
+    assert max(row["chain_length"] for row in history) == REVISION_CHAIN_SPAN - 1
+    for version, content in enumerate(contents, start=1):
+        assert replay_chain(_chain(history, version)) == content
+
+
+def test_large_rewrite_is_stored_as_snapshot():
+    history: list[dict] = []
+    _record(history, None, "short", 1)
+    _record(history, "short", "an entirely different and much longer text", 2)
+    assert history[-1]["kind"] == "snapshot"
+    assert replay_chain(_chain(history, 2)) == "an entirely different and much longer text"
+
+
+def test_delta_offsets_are_code_points():
+    history: list[dict] = []
+    _record(history, None, "héllo 🙂 wörld, some padding", 1)
+    _record(history, "héllo 🙂 wörld, some padding", "héllo 🙂 wide wörld, some padding", 2)
+    assert history[-1]["kind"] == "delta"
+    assert replay_chain(_chain(history, 2)) == "héllo 🙂 wide wörld, some padding"
+
+
+def test_chain_without_snapshot_is_rejected():
+    history: list[dict] = []
+    _record(history, None, "base content here", 1)
+    _record(history, "base content here", "base content there", 2)
+    with pytest.raises(InvariantViolated):
+        replay_chain(_chain(history, 2)[:1])
+
+
+def test_chain_with_wrong_length_is_rejected():
+    rows = [_snapshot("abc", 1)]
+    rows[0]["content_length"] = 4
+    with pytest.raises(InvariantViolated):
+        replay_chain(rows)
@@ -0,0 +1,86 @@
+import asyncio
+import gzip
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anyio")
+
+from app.db.pagination import decode_cursor  # noqa: E402
+from app.services import notes_export  # noqa: E402
+
+
+TENANT = uuid.uuid4()
+
+
+def _notes(sizes: list[int]) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.UUID(int=len(sizes) - i)),
+            "tenant_id": str(TENANT),
+            "owner_id": str(TENANT),
+            "content": "x" * size,
+            "tags": [],
+            "created_at": "2026-03-01T00:00:00+00:00",
+            "updated_at": "2026-03-01T00:00:00+00:00",
+        }
+        for i, size in enumerate(sizes)
+    ]
+
+
+@pytest.fixture
+def tenant_notes(monkeypatch):
+    notes: list[dict] = []
+    limits: list[int] = []
+
+    async def list_tenant_notes(access_token, tenant_id, *, limit, cursor, count):
+        limits.append(limit)
+        start = 0
+        if cursor:
+            _, key = decode_cursor(cursor)
+            start = next(i for i, row in enumerate(notes) if row["id"] == key) + 1
+        return SimpleNamespace(data=notes[start:start + limit + 1])
+
+    async def get_my_tenant_role(access_token, tenant_id):
+        return SimpleNamespace(data=[{"role": "member"}])
+
+    monkeypatch.setattr(notes_export, "list_tenant_notes", list_tenant_notes)
+    monkeypatch.setattr(notes_export, "get_my_tenant_role", get_my_tenant_role)
+    return SimpleNamespace(notes=notes, limits=limits)
+
+
+def _export(compression: str, chunk_size: int, chunk_max_bytes: int) -> list[bytes]:
+    async def run():
+        body = await notes_export.prepare_export(
+            "token",
+            TENANT,
+            chunk_size=chunk_size,
+            chunk_max_bytes=chunk_max_bytes,
+            compression=compression,
+        )
+        return [chunk async for chunk in body]
+
+    return asyncio.run(run())
+
+
+def test_export_splits_large_notes_and_shrinks_pages(tenant_notes):
+    tenant_notes.notes.extend(_notes([10_000] * 12))
+
+    chunks = _export("none", chunk_size=5, chunk_max_bytes=25_000)
+
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [row["id"] for row in tenant_notes.notes]
+    assert all(len(chunk) < 25_000 for chunk in chunks)
+    assert tenant_notes.limits[0] == 5
+    assert all(limit == 2 for limit in tenant_notes.limits[1:])
+
+
+def test_gzip_export_is_one_valid_member(tenant_notes):
+    tenant_notes.notes.extend(_notes([100] * 7))
+
+    chunks = _export("gzip", chunk_size=3, chunk_max_bytes=1_000)
+
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert len(lines) == 7
@@ -0,0 +1,42 @@
+import asyncio
+import io
+import uuid
+
+import pytest
+
+pytest.importorskip("anyio")
+
+from app.cache.lru import TTLCache  # noqa: E402
+from app.services import notes_import  # noqa: E402
+
+
+TENANT = uuid.uuid4()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    finished = TTLCache(maxsize=1, ttl=3600)
+    monkeypatch.setattr(notes_import, "_active_jobs", {})
+    monkeypatch.setattr(notes_import, "_finished_jobs", finished)
+    return finished
+
+
+def test_queued_jobs_are_not_evicted_by_finished_ones(registry):
+    queued = notes_import.create_import_job(TENANT, "ndjson")
+    for _ in range(3):
+        job = notes_import.create_import_job(TENANT, "ndjson")
+        asyncio.run(notes_import.run_import(job, "token", io.BytesIO(b"")))
+
+    assert notes_import.get_import_job(queued.id) is queued
+    assert queued.status == "queued"
+
+
+def test_finished_job_moves_to_the_ttl_registry(registry):
+    job = notes_import.create_import_job(TENANT, "ndjson")
+    asyncio.run(notes_import.run_import(job, "token", io.BytesIO(b"\n")))
+
+    assert job.status == "succeeded"
+    assert job.finished_at is not None
+    assert job.id not in notes_import._active_jobs
+    assert registry.get(job.id) is job
+    assert notes_import.get_import_job(job.id) is job
@@ -0,0 +1,100 @@
+import base64
+import json
+import uuid
+
+import pytest
+
+from app.db.pagination import apply_keyset, decode_cursor, encode_cursor, split_page
+from app.errors.db import InvalidArgument
+
+
+CREATED_AT = "2026-03-01T12:30:45.123456+00:00"
+
+
+def _raw_cursor(payload) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+class _Query:
+    """
+    Records the PostgREST builder calls made by apply_keyset.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+
+def test_cursor_round_trip():
+    key = str(uuid.uuid4())
+    assert decode_cursor(encode_cursor(CREATED_AT, key)) == (CREATED_AT, key)
+
+
+def test_cursor_round_trip_bigint_key():
+    cursor = encode_cursor(CREATED_AT, "42")
+    assert decode_cursor(cursor, "revision") == (CREATED_AT, "42")
+
+
+def test_cursor_normalizes_values():
+    key = uuid.uuid4()
+    created_at, parsed_key = decode_cursor(encode_cursor("2026-03-01T12:30:45Z", str(key).upper()))
+    assert created_at == "2026-03-01T12:30:45+00:00"
+    assert parsed_key == str(key)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not-base64!",
+        _raw_cursor({"created_at": CREATED_AT}),
+        _raw_cursor([CREATED_AT]),
+        _raw_cursor([CREATED_AT, 1]),
+        _raw_cursor(["yesterday", str(uuid.uuid4())]),
+        _raw_cursor([CREATED_AT, "not-a-uuid"]),
+        _raw_cursor([f'{CREATED_AT}",id.gt."0', str(uuid.uuid4())]),
+        _raw_cursor([CREATED_AT, '0"),or(id.gt."0']),
+    ],
+)
+def test_decode_cursor_rejects_bad_input(cursor):
+    with pytest.raises(InvalidArgument):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("key", ["-1", "1.5", "1e3", "１２"])
+def test_decode_cursor_rejects_bad_bigint_key(key):
+    with pytest.raises(InvalidArgument):
+        decode_cursor(encode_cursor(CREATED_AT, key), "revision")
+
+
+def test_apply_keyset_builds_filter_from_normalized_values():
+    key = str(uuid.uuid4())
+    query = apply_keyset(_Query(), cursor=encode_cursor(CREATED_AT, key), key_column="id", limit=10)
+
+    filters = [args[0] for name, args, _ in query.calls if name == "or_"]
+    assert filters == [
+        f'created_at.lt."{CREATED_AT}",and(created_at.eq."{CREATED_AT}",id.lt."{key}")'
+    ]
+    assert ("limit", (11,), {}) in query.calls
+
+
+def test_apply_keyset_offset_only_without_cursor():
+    query = apply_keyset(_Query(), cursor=None, key_column="id", limit=5, offset=20)
+    assert ("offset", (20,), {}) in query.calls
+
+
+def test_split_page_builds_next_cursor():
+    rows = [{"created_at": CREATED_AT, "id": str(uuid.uuid4())} for _ in range(3)]
+
+    page, next_cursor = split_page(rows, 2, "id")
+    assert page == rows[:2]
+    assert decode_cursor(next_cursor) == (CREATED_AT, rows[1]["id"])
+
+    page, next_cursor = split_page(rows, 3, "id")
+    assert page == rows and next_cursor is None
@@ -0,0 +1,159 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.errors.db import ServiceUnavailable  # noqa: E402
+from app.services import semantic_index  # noqa: E402
+from app.services.embeddings import HashingEmbedder  # noqa: E402
+from app.services.semantic_index import SemanticIndexRegistry  # noqa: E402
+
+
+TENANT = uuid.uuid4()
+OWNER = str(uuid.uuid4())
+
+
+class _Scan:
+    """
+    Stands in for scan_tenant_note_texts. Each scan waits on `gate`, so a
+    test can write to the registry while a build is running.
+    """
+
+    def __init__(self, notes: dict[str, str]):
+        self.notes = notes
+        self.calls = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, tenant_id, limit, cursor):
+        self.calls += 1
+        rows = [
+            {"id": note_id, "owner_id": OWNER, "content": content, "created_at": "2026-03-01T00:00:00+00:00"}
+            for note_id, content in self.notes.items()
+        ]
+        await self.gate.wait()
+        return SimpleNamespace(data=rows)
+
+
+@pytest.fixture
+def scan(monkeypatch):
+    scan = _Scan({})
+    monkeypatch.setattr(semantic_index, "scan_tenant_note_texts", scan)
+    return scan
+
+
+def _registry(ttl: float = 600) -> SemanticIndexRegistry:
+    return SemanticIndexRegistry(HashingEmbedder(dim=64), max_tenants=4, ttl=ttl)
+
+
+def _ids(index) -> set[str]:
+    return set(index._ids)
+
+
+def test_writes_during_build_are_replayed(scan):
+    async def run():
+        kept, removed, added = (str(uuid.uuid4()) for _ in range(3))
+        scan.notes.update({kept: "alpha", removed: "beta"})
+        scan.gate.clear()
+
+        registry = _registry()
+        build = asyncio.create_task(registry.get_or_build(TENANT))
+        await asyncio.sleep(0)
+
+        await registry.index_notes([(TENANT, uuid.UUID(added), OWNER, "gamma")])
+        registry.remove_note(uuid.UUID(removed))
+        scan.gate.set()
+
+        index = await build
+        assert _ids(index) == {kept, added}
+        assert not registry._builds and not registry._replay
+
+    asyncio.run(run())
+
+
+def test_stale_index_is_served_and_refreshed_in_background(scan):
+    async def run():
+        first, second = str(uuid.uuid4()), str(uuid.uuid4())
+        scan.notes[first] = "alpha"
+
+        registry = _registry(ttl=0)
+        stale = await registry.get_or_build(TENANT)
+        assert scan.calls == 1
+
+        scan.notes[second] = "beta"
+        scan.gate.clear()
+        assert await registry.get_or_build(TENANT) is stale
+        assert await registry.get_or_build(TENANT) is stale
+        assert len(registry._builds) == 1
+
+        scan.gate.set()
+        await registry._builds[str(TENANT)]
+        fresh = registry.peek(TENANT)
+        assert fresh is not stale
+        assert _ids(fresh) == {first, second}
+        assert scan.calls == 2
+
+    asyncio.run(run())
+
+
+def test_concurrent_first_queries_share_one_build(scan):
+    async def run():
+        scan.notes[str(uuid.uuid4())] = "alpha"
+        registry = _registry()
+        indexes = await asyncio.gather(*(registry.get_or_build(TENANT) for _ in range(5)))
+        assert all(index is indexes[0] for index in indexes)
+        assert scan.calls == 1
+
+    asyncio.run(run())
+
+
+def test_search_ranks_only_the_callers_scope():
+    embedder = HashingEmbedder(dim=64)
+    index = semantic_index.TenantVectorIndex(embedder.dim, capacity=2)
+    me, other = str(uuid.uuid4()), str(uuid.uuid4())
+    texts = {f"n{i}": f"quarterly budget report {i}" for i in range(6)}
+    owners = [other, other, me, other, other, other]
+    index.upsert(list(texts), embedder.embed(list(texts.values())), owners)
+    query = embedder.embed(["quarterly budget report"])
+
+    assert len(index.search(query, 10)[0]) == 6
+
+    hits = index.search(query, 10, owner_id=me, shared_note_ids=["n4", "missing"])[0]
+    assert sorted(note_id for note_id, _ in hits) == ["n2", "n4"]
+
+    assert index.search(query, 10, owner_id=str(uuid.uuid4()))[0] == []
+
+    index.remove("n0")
+    hits = index.search(query, 10, owner_id=me)[0]
+    assert [note_id for note_id, _ in hits] == ["n2"]
+
+
+def test_budget_drops_least_recently_used_indexes(scan):
+    async def run():
+        scan.notes[str(uuid.uuid4())] = "alpha"
+        registry = SemanticIndexRegistry(HashingEmbedder(dim=64), max_tenants=4, ttl=600, scan_page_size=10)
+        registry.max_bytes = 2 * (await registry.get_or_build(uuid.uuid4())).nbytes
+
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await registry.get_or_build(first)
+        await registry.get_or_build(second)
+        await registry.get_or_build(third)
+
+        assert registry.peek(first) is None
+        assert registry.peek(second) is not None and registry.peek(third) is not None
+
+    asyncio.run(run())
+
+
+def test_tenant_over_budget_is_refused(scan):
+    async def run():
+        scan.notes[str(uuid.uuid4())] = "alpha"
+        registry = SemanticIndexRegistry(HashingEmbedder(dim=64), max_tenants=4, ttl=600, max_bytes=1)
+        with pytest.raises(ServiceUnavailable):
+            await registry.get_or_build(TENANT)
+        assert registry.peek(TENANT) is None
+
+    asyncio.run(run())
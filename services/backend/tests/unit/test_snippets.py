@@ -0,0 +1,19 @@
+from app.http.snippets import MATCH_END, MATCH_START, render_snippet
+
+
+def test_marks_matches():
+    assert render_snippet(f"a {MATCH_START}quick{MATCH_END} fox") == "a <mark>quick</mark> fox"
+
+
+def test_escapes_content_before_marking():
+    raw = f"<script>alert(1)</script> & {MATCH_START}<b>{MATCH_END}"
+    assert render_snippet(raw) == "&lt;script&gt;alert(1)&lt;/script&gt; &amp; <mark>&lt;b&gt;</mark>"
+
+
+def test_mark_tags_cannot_be_forged_by_content():
+    assert "<mark>" not in render_snippet("<mark>not a match</mark>")
+
+
+def test_empty_snippet():
+    assert render_snippet(None) == ""
+    assert render_snippet("") == ""
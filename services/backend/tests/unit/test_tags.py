@@ -0,0 +1,42 @@
+import pytest
+
+from app.db.tags import MAX_TAG_LENGTH, MAX_TAGS_PER_NOTE, normalize_tags
+from app.errors.db import InvalidArgument
+
+
+"""
+Expected values follow public.normalize_tags() (migration 025):
+lower(btrim(tag)), empty tags dropped, distinct, sorted.
+"""
+
+
+def test_trims_lowercases_deduplicates_and_sorts():
+    assert normalize_tags(["  Work ", "work", "Ideas", "", "   "]) == ["ideas", "work"]
+
+
+def test_keeps_inner_spaces_and_non_ascii():
+    assert normalize_tags(["to read", "Ünïcode", "a b"]) == ["a b", "to read", "ünïcode"]
+
+
+def test_empty_input():
+    assert normalize_tags([]) == []
+
+
+@pytest.mark.parametrize(
+    "tag",
+    ["a,b", "a{b", "a}b", 'a"b', "a\\b", "\tspaced", "line\nbreak", "bell\x07", "x" * (MAX_TAG_LENGTH + 1)],
+)
+def test_rejects_what_the_database_rejects(tag):
+    with pytest.raises(InvalidArgument):
+        normalize_tags([tag])
+
+
+def test_accepts_longest_tag():
+    assert normalize_tags(["X" * MAX_TAG_LENGTH]) == ["x" * MAX_TAG_LENGTH]
+
+
+def test_limit_applies_after_deduplication():
+    tags = [f"tag{i}" for i in range(MAX_TAGS_PER_NOTE)]
+    assert len(normalize_tags(tags + [t.upper() for t in tags])) == MAX_TAGS_PER_NOTE
+    with pytest.raises(InvalidArgument):
+        normalize_tags(tags + ["one-more"])
@@ -79,6 +79,9 @@ export const DB_ERRORS = {
     NOT_FOUND: 'DB0401',
     ONLY_OWNER: 'DB0402',
     TENANT_INACTIVE: 'DB0403',
+    VERSION_MISMATCH: 'DB0404',
+    WRITE_DENIED: 'DB0405',
+    INVALID_PATCH: 'DB0406',
   },
 
   SHARE: {
@@ -89,6 +92,12 @@ export const DB_ERRORS = {
     NOTE_NOT_FOUND: 'DB0505',
     CALLER_NOT_TENANT_MEMBER: 'DB0506',
   },
+
+  TAG: {
+    INVALID_TAG: 'DB0601',
+    WRITE_ACCESS_REQUIRED: 'DB0602',
+    TOO_MANY_TAGS: 'DB0603',
+  },
 } as const;
 
 /* ============================================================
@@ -0,0 +1,23 @@
+/*
+ * Composite /me Contracts
+ */
+
+import type { ErrorPayload } from './base';
+import type { ListTenantNotesResponse } from './note';
+import type { ListMyInvitesResponse, ListMyJoinRequestsResponse } from './request';
+import type { ListTenantMembersResponse, ListTenantsResponse, TenantDetailsResponse } from './tenant';
+
+/*
+ * GET /me/bootstrap
+ * A failed section is null and its error is in errors under the same key.
+ * tenant, members and notes are null unless tenant_id was sent.
+ */
+export interface BootstrapResponse {
+  readonly tenants: ListTenantsResponse | null;
+  readonly invites: ListMyInvitesResponse | null;
+  readonly requests: ListMyJoinRequestsResponse | null;
+  readonly tenant: TenantDetailsResponse | null;
+  readonly members: ListTenantMembersResponse | null;
+  readonly notes: ListTenantNotesResponse | null;
+  readonly errors: Record<string, ErrorPayload>;
+}
@@ -7,12 +7,32 @@ export interface Note {
   readonly tenant_id: string;
   readonly owner_id: string;
   readonly content: string;
+  /* Normalized (lower-case, sorted) tag list */
+  readonly tags: string[];
+  /* Sanitized HTML, only with ?render=html */
+  readonly html?: string | null;
+  /* Incremented on every change; returned on single-note reads (ETag "v<version>") */
+  readonly version?: number;
   readonly created_at: string;
   readonly updated_at: string;
   readonly deleted_at: string | null;
   readonly deleted_by: string | null;
 }
 
+/* List item with ?view=summary: no content */
+export interface NoteSummary {
+  readonly id: string;
+  readonly tenant_id: string;
+  readonly owner_id: string;
+  /* First Markdown heading, else first non-blank line (max 200 chars) */
+  readonly title: string;
+  /* Start of the content, whitespace collapsed (max 280 chars) */
+  readonly preview: string;
+  readonly tags: string[];
+  readonly created_at: string;
+  readonly updated_at: string;
+}
+
 export interface CreateNoteRequest {
   content: string;
 }
@@ -26,8 +46,18 @@ export interface CreateNoteResponse {
   updated_at: string;
 }
 
+/* Offsets count Unicode code points of the base content (not UTF-16 units) */
+export interface NoteSpliceOp {
+  start: number;
+  delete?: number;
+  insert?: string;
+}
+
+/* Either content (full replacement) or ops against base_version */
 export interface UpdateNoteRequest {
-  content: string;
+  content?: string;
+  base_version?: number;
+  ops?: NoteSpliceOp[];
 }
 
 export interface UpdateNoteResponse {
@@ -35,6 +65,18 @@ export interface UpdateNoteResponse {
   tenant_id: string;
   owner_id: string;
   content: string;
+  version: number;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface PatchNoteResponse {
+  id: string;
+  tenant_id: string;
+  owner_id: string;
+  version: number;
+  /* New content length in code points */
+  length: number;
   created_at: string;
   updated_at: string;
 }
@@ -47,5 +89,87 @@ export interface DeleteNoteResponse {
 
 export interface ListTenantNotesResponse {
   readonly notes: Note[];
-  readonly total: number;
+  readonly total: number | null;
+  /* Opaque keyset cursor for the next page; null on the last page */
+  readonly next_cursor: string | null;
+}
+
+/* ?view=summary */
+export interface ListTenantNoteSummariesResponse {
+  readonly notes: NoteSummary[];
+  readonly total: number | null;
+  readonly next_cursor: string | null;
+}
+
+/* GET /me/notes/shared: one share with a summary of its note */
+export interface SharedNote {
+  readonly note_id: string;
+  readonly user_id: string;
+  readonly permission: 'read' | 'write';
+  /* When the share was granted */
+  readonly created_at: string;
+  readonly tenant_id: string;
+  readonly tenant_name: string | null;
+  readonly owner_id: string | null;
+  readonly owner_email: string | null;
+  readonly title: string;
+  readonly preview: string;
+  readonly updated_at: string;
+}
+
+export interface ListSharedWithMeResponse {
+  readonly shares: SharedNote[];
+  readonly total: number | null;
+  readonly next_cursor: string | null;
+}
+
+export interface NoteSearchItem {
+  readonly id: string;
+  readonly tenant_id: string;
+  readonly owner_id: string;
+  readonly rank: number;
+  /* HTML-escaped excerpt; matches are wrapped in <mark> */
+  readonly snippet: string;
+  readonly created_at: string;
+  readonly updated_at: string;
+}
+
+export interface SearchNotesResponse {
+  readonly results: NoteSearchItem[];
+  /* Offset of the next page of results; null when exhausted */
+  readonly next_offset: number | null;
+}
+
+export interface AddNoteTagsRequest {
+  tags: string[];
+}
+
+export interface NoteTagsResponse {
+  readonly note_id: string;
+  readonly tags: string[];
+}
+
+export interface TagFacetItem {
+  readonly tag: string;
+  readonly note_count: number;
+}
+
+export interface ListTenantTagsResponse {
+  readonly tags: TagFacetItem[];
+}
+
+export interface SemanticNoteItem {
+  readonly id: string;
+  readonly tenant_id: string;
+  readonly owner_id: string;
+  readonly content: string;
+  readonly tags: string[];
+  /* Cosine similarity to the query, higher is closer */
+  readonly score: number;
+  readonly created_at: string;
+  readonly updated_at: string;
+}
+
+export interface SemanticSearchResponse {
+  readonly results: SemanticNoteItem[];
 }
@@ -0,0 +1,32 @@
+/*
+ * Join Request / Invite Data Contracts
+ */
+
+export interface MyInvite {
+  readonly id: string;
+  readonly tenant_id: string;
+  readonly initiated_by: string;
+  readonly direction: string;
+  readonly status: string;
+  readonly created_at: string;
+}
+
+export interface ListMyInvitesResponse {
+  readonly invites: MyInvite[];
+  readonly next_cursor: string | null;
+}
+
+export interface MyJoinRequest {
+  readonly id: string;
+  readonly tenant_id: string;
+  readonly direction: string;
+  readonly status: string;
+  readonly decided_by: string | null;
+  readonly decided_at: string | null;
+  readonly created_at: string;
+}
+
+export interface ListMyJoinRequestsResponse {
+  readonly requests: MyJoinRequest[];
+  readonly next_cursor: string | null;
+}
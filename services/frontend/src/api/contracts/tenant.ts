@@ -38,18 +38,60 @@ export interface CreateTenantRequest {
  */
 export interface ListTenantsResponse {
   readonly tenants: Tenant[];
-  readonly total: number;
+  readonly total: number | null;
+  /* Opaque keyset cursor for the next page; null on the last page */
+  readonly next_cursor: string | null;
+}
+
+/**
+ * Response when listing members of a tenant
+ */
+export interface ListTenantMembersResponse {
+  readonly members: TenantMember[];
+  readonly total: number | null;
+  readonly next_cursor: string | null;
 }
 
 /*
  * Response when fetching single tenant details
- * Mirrors backend TenantDetailsResponse (single tenant object)
+ * Mirrors backend TenantDetailsResponse (tenant plus maintained counters)
  */
-export type TenantDetailsResponse = Tenant;
+export interface TenantDetailsResponse extends Tenant {
+  readonly member_count: number;
+  /* Tenant-wide, including notes the caller cannot read */
+  readonly active_note_count: number;
+  readonly last_activity_at: string | null;
+}
 
 /**
  * Payload for changing a member's role
  */
 export interface ChangeMemberRoleRequest {
   role: TenantRole;
-}
\ No newline at end of file
+}
+/**
+ * Event from GET /tenants/{tenant_id}/events (server-sent events)
+ * The SSE event name equals `type`; payloads carry IDs only, refetch
+ * the note for its content. On "resync", refetch everything shown.
+ */
+export type TenantEventType =
+  | 'note.created'
+  | 'note.updated'
+  | 'note.deleted'
+  | 'share.granted'
+  | 'share.changed'
+  | 'share.revoked'
+  | 'member.role_changed'
+  | 'resync';
+
+export interface TenantEvent {
+  readonly type: TenantEventType;
+  readonly tenant_id: string;
+  readonly note_id?: string;
+  readonly owner_id?: string;
+  readonly user_id?: string;
+  readonly version?: number;
+  readonly permission?: string;
+  readonly role?: TenantRole;
+  readonly actor_id?: string | null;
+}
@@ -3,6 +3,7 @@ import { api } from '../client';
 /* Import type only to satisfy verbatimModuleSyntax */
 import type { ApiResponse } from '../contracts/base';
 import type { ListTenantsResponse } from '../contracts/tenant';
+import type { BootstrapResponse } from '../contracts/me';
 
 export const MeService = {
   /**
@@ -20,5 +21,18 @@ export const MeService = {
    */
   listMyTenants: async (): Promise<ApiResponse<ListTenantsResponse>> => {
     return await api.get<ListTenantsResponse>('/me/tenants');
+  },
+
+  /**
+   * Everything needed for the first paint in one request.
+   * 
+   * Endpoint: GET /me/bootstrap?tenant_id=
+   * 
+   * Sections are fetched concurrently on the server and fail independently:
+   * check errors before using a null section.
+   */
+  bootstrap: async (tenantId?: string): Promise<ApiResponse<BootstrapResponse>> => {
+    const query = tenantId ? `?tenant_id=${encodeURIComponent(tenantId)}` : '';
+    return await api.get<BootstrapResponse>(`/me/bootstrap${query}`);
   }
 };
@@ -9,6 +9,7 @@ import type {
   UpdateNoteResponse,
   DeleteNoteResponse,
   ListTenantNotesResponse,
+  SearchNotesResponse,
 } from '../contracts/note';
 
 export const NoteService = {
@@ -21,6 +22,15 @@ export const NoteService = {
     return await api.get<ListTenantNotesResponse>(`/tenants/${tenantId}/notes`);
   },
 
+  /*
+   * Full-text search within a tenant
+   * Ranked by relevance, snippets highlight matches with <mark>
+   */
+  searchInTenant: async (tenantId: string, query: string, offset = 0): Promise<ApiResponse<SearchNotesResponse>> => {
+    const params = new URLSearchParams({ q: query, offset: String(offset) });
+    return await api.get<SearchNotesResponse>(`/tenants/${tenantId}/notes/search?${params}`);
+  },
+
   /*
    * Create new note in a tenant
    * Caller becomes owner automatically